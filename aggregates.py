@@ -0,0 +1,116 @@
+# aggregates.py
+from collections import defaultdict
+from collections.abc import Mapping
+import time
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Iterable, Tuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session
+
+from models.transaction import Transaction, TransactionAggregate, TransactionsVersion, TimeBucket
+
+def month_key(date: datetime) -> str:
+    """Chave do mês usada na tabela de agregados (AAAA-MM)"""
+    return date.strftime("%Y-%m")
+
+def bucket_expression(bucket: TimeBucket, column, dialect_name: str):
+    """Expressão SQL que agrupa a coluna de data no período pedido
+    
+    Dias e meses viram textos AAAA-MM-DD e AAAA-MM; semanas são
+    identificadas pela segunda-feira em que começam (AAAA-MM-DD).
+    """
+    if dialect_name == "postgresql":
+        if bucket == TimeBucket.week:
+            return func.to_char(func.date_trunc("week", column), "YYYY-MM-DD")
+        return func.to_char(column, "YYYY-MM-DD" if bucket == TimeBucket.day else "YYYY-MM")
+    if bucket == TimeBucket.week:
+        return func.date(column, "weekday 0", "-6 days")
+    return func.strftime("%Y-%m-%d" if bucket == TimeBucket.day else "%Y-%m", column)
+
+def _aggregate_fields(item):
+    """Extrai (type, category, date, amount) de uma transação ou de um dict"""
+    if isinstance(item, Mapping):
+        return item["type"], item["category"], item["date"], item["amount"]
+    return item.type, item.category, item.date, item.amount
+
+def _compute_deltas(added: Iterable, removed: Iterable) -> Dict[Tuple, list]:
+    """Soma as variações de total e contagem por (type, category, month)"""
+    deltas = defaultdict(lambda: [Decimal(0), 0])
+    for items, sign in ((added, 1), (removed, -1)):
+        for item in items:
+            type, category, date, amount = _aggregate_fields(item)
+            delta = deltas[(type, category, month_key(date))]
+            delta[0] += sign * amount
+            delta[1] += sign
+    return deltas
+
+def update_aggregates(session: Session, added: Iterable = (), removed: Iterable = ()):
+    """Aplica aos agregados as transações incluídas e removidas
+    
+    Deve ser chamada antes do commit, na mesma sessão da escrita, para que
+    transações e agregados sejam gravados (ou descartados) juntos. Uma
+    alteração é uma remoção do estado antigo mais uma inclusão do novo.
+    Toda chamada incrementa a versão das transações, mesmo sem variação
+    nos totais (ex.: uma data alterada dentro do mesmo mês).
+    """
+    version = TransactionsVersion.__table__
+    session.execute(update(version).values(version=version.c.version + 1))
+    
+    rows = [
+        {
+            "type": type,
+            "category": category,
+            "month": month,
+            "total_amount": total_amount,
+            "transaction_count": transaction_count,
+        }
+        for (type, category, month), (total_amount, transaction_count)
+        in _compute_deltas(added, removed).items()
+        if transaction_count or total_amount
+    ]
+    if not rows:
+        return
+    
+    table = TransactionAggregate.__table__
+    dialect = postgresql if session.get_bind().dialect.name == "postgresql" else sqlite
+    statement = dialect.insert(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.type, table.c.category, table.c.month],
+        set_={
+            "total_amount": table.c.total_amount + statement.excluded.total_amount,
+            "transaction_count": table.c.transaction_count + statement.excluded.transaction_count,
+        },
+    )
+    session.execute(statement, rows)
+
+def setup_transactions_version(connection):
+    """Cria a linha da versão das transações, se ainda não existir
+    
+    A versão parte do instante da criação: um banco recriado não repete
+    as versões (e os ETags dos relatórios) do anterior. O ON CONFLICT
+    permite que vários processos iniciem ao mesmo tempo.
+    """
+    table = TransactionsVersion.__table__
+    dialect = postgresql if connection.dialect.name == "postgresql" else sqlite
+    connection.execute(dialect.insert(table).values(id=1, version=time.time_ns()).on_conflict_do_nothing())
+
+def rebuild_aggregates(connection):
+    """Recalcula todos os agregados a partir da tabela de transações"""
+    table = TransactionAggregate.__table__
+    month = bucket_expression(TimeBucket.month, Transaction.date, connection.dialect.name)
+    connection.execute(table.delete())
+    connection.execute(
+        table.insert().from_select(
+            ["type", "category", "month", "total_amount", "transaction_count"],
+            select(
+                Transaction.type,
+                Transaction.category,
+                month,
+                func.sum(Transaction.amount),
+                func.count(Transaction.id),
+            ).group_by(Transaction.type, Transaction.category, month),
+        )
+    )
@@ -0,0 +1,206 @@
+# async_routes.py
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from database import async_engine, get_async_session
+from models.transaction import (
+    Transaction, TransactionResponse, TransactionSummary, Category,
+    BalanceSummary, TransactionTimeSeries, TimeBucket, TransactionIds
+)
+from models.goal import Goal, GoalResponse, GoalStatus
+import cache
+import queries
+import search
+import serialization
+
+# Versões assíncronas das rotas de leitura, usadas no lugar das síncronas
+# quando DATABASE_ASYNC está ativo. Enquanto esperam o banco, não ocupam
+# uma thread do pool do FastAPI. As escritas continuam síncronas: no
+# SQLite elas são serializadas de qualquer forma.
+router = APIRouter(route_class=serialization.route_class)
+
+@router.get("/transactions/", response_model=List[TransactionResponse], tags=["Transações"])
+async def read_transactions_async(
+    *,
+    session: AsyncSession = Depends(get_async_session),
+    request: Request,
+    response: Response,
+    offset: int = 0,
+    limit: int = Query(default=100, ge=1, le=100),
+    cursor: Optional[str] = Query(default=None, description="Cursor retornado no header X-Next-Cursor"),
+    filters: queries.TransactionFilters = Depends(),
+    fields: Optional[str] = Query(default=None, description="Campos retornados, separados por vírgula (ex.: id,date,amount)")
+):
+    """Listar transações com filtros opcionais, ordenadas por data e id
+
+    Para paginar, envie o valor do header X-Next-Cursor da página anterior
+    no parâmetro cursor: o custo de cada página independe da sua posição.
+    Com fields, só as colunas pedidas são lidas e serializadas.
+    """
+    if fields:
+        names = queries.parse_fields(fields)
+        statement = queries.transactions_statement(limit, offset, cursor, filters, names)
+        rows = queries.paginate((await session.exec(statement)).all(), limit, response)
+        return serialization.rows_response(request, response, rows, names)
+
+    statement = queries.transactions_statement(limit, offset, cursor, filters)
+    transactions = queries.paginate((await session.exec(statement)).all(), limit, response)
+    not_modified = cache.not_modified(request, response, cache.collection_etag(transactions))
+    if not_modified:
+        return not_modified
+    return transactions
+
+@router.get("/transactions/search", response_model=List[TransactionResponse], tags=["Transações"])
+async def search_transactions_async(
+    *,
+    session: AsyncSession = Depends(get_async_session),
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, description="Termos buscados na descrição"),
+    offset: int = 0,
+    limit: int = Query(default=20, ge=1, le=100),
+    filters: queries.TransactionFilters = Depends()
+):
+    """Buscar transações pela descrição, das mais relevantes para as menos
+
+    Encontra as transações com todos os termos (ou palavras que começam com
+    eles), sem diferenciar maiúsculas. Com o índice FTS5 (SQLite) também
+    ignora acentos; sem ele, os acentos precisam coincidir. Para paginar,
+    envie o valor do header X-Next-Offset no parâmetro offset.
+    """
+    statement = search.search_statement(q, limit, offset, filters)
+    transactions = search.paginate((await session.exec(statement)).all(), limit, offset, response)
+    not_modified = cache.not_modified(request, response, cache.collection_etag(transactions))
+    if not_modified:
+        return not_modified
+    return transactions
+
+@router.post("/transactions/batch-get", response_model=List[TransactionResponse], tags=["Transações"])
+async def read_transactions_batch_async(*, session: AsyncSession = Depends(get_async_session), batch: TransactionIds):
+    """Buscar várias transações por id, na ordem pedida (ids inexistentes são ignorados)"""
+    transactions = (await session.exec(queries.transactions_by_ids_statement(batch.ids))).all()
+    return queries.order_by_ids(transactions, batch.ids)
+
+@router.get("/transactions/{transaction_id}", response_model=TransactionResponse, tags=["Transações"])
+async def read_transaction_async(
+    *,
+    session: AsyncSession = Depends(get_async_session),
+    request: Request,
+    response: Response,
+    transaction_id: int
+):
+    """Buscar uma transação específica"""
+    transaction = await session.get(Transaction, transaction_id)
+    if not transaction:
+        raise HTTPException(status_code=404, detail="Transação não encontrada")
+    
+    not_modified = cache.not_modified(request, response, cache.resource_etag(transaction))
+    if not_modified:
+        return not_modified
+    return transaction
+
+@router.get("/transactions/summary/category", response_model=List[TransactionSummary], tags=["Relatórios"])
+async def get_transactions_summary_by_category_async(
+    *,
+    session: AsyncSession = Depends(get_async_session),
+    request: Request,
+    response: Response
+):
+    """Obter resumo de transações agrupadas por categoria"""
+    version = (await session.exec(queries.transactions_version_statement())).one()
+    key = cache.report_key("category", version)
+    not_modified = cache.check_etag(request, response, key)
+    if not_modified:
+        return not_modified
+    
+    summary = cache.lookup(key)
+    if summary is None:
+        results = (await session.exec(queries.category_summary_statement())).all()
+        summary = queries.category_summary_response(results)
+        cache.store(key, summary)
+    return summary
+
+@router.get("/transactions/summary/balance", response_model=BalanceSummary, tags=["Relatórios"])
+async def get_balance_summary_async(
+    *,
+    session: AsyncSession = Depends(get_async_session),
+    date_from: Optional[datetime] = Query(default=None, description="Data inicial (inclusiva)"),
+    date_to: Optional[datetime] = Query(default=None, description="Data final (inclusiva)"),
+    category: Optional[Category] = None,
+    request: Request,
+    response: Response
+):
+    """Obter resumo do saldo (receitas - despesas) com filtros opcionais"""
+    version = (await session.exec(queries.transactions_version_statement())).one()
+    key = cache.report_key("balance", version, date_from=date_from, date_to=date_to, category=category)
+    not_modified = cache.check_etag(request, response, key)
+    if not_modified:
+        return not_modified
+    
+    balance = cache.lookup(key)
+    if balance is None:
+        totals = (await session.exec(queries.balance_statement(date_from, date_to, category))).one()
+        balance = queries.balance_response(totals)
+        cache.store(key, balance)
+    return balance
+
+@router.get("/transactions/summary/timeseries", response_model=TransactionTimeSeries, tags=["Relatórios"])
+async def get_transactions_timeseries_async(
+    *,
+    session: AsyncSession = Depends(get_async_session),
+    bucket: TimeBucket = TimeBucket.month,
+    date_from: Optional[datetime] = Query(default=None, alias="from", description="Data inicial (inclusiva)"),
+    date_to: Optional[datetime] = Query(default=None, alias="to", description="Data final (inclusiva)"),
+    request: Request,
+    response: Response
+):
+    """Obter série temporal de totais por período, tipo e categoria"""
+    version = (await session.exec(queries.transactions_version_statement())).one()
+    key = cache.report_key("timeseries", version, bucket=bucket, date_from=date_from, date_to=date_to)
+    not_modified = cache.check_etag(request, response, key)
+    if not_modified:
+        return not_modified
+    
+    timeseries = cache.lookup(key)
+    if timeseries is None:
+        statement = queries.timeseries_statement(bucket, async_engine.dialect.name, date_from, date_to)
+        results = (await session.exec(statement)).all()
+        timeseries = queries.timeseries_response(bucket, results)
+        cache.store(key, timeseries)
+    return timeseries
+
+@router.get("/goals/", response_model=List[GoalResponse], tags=["Metas"])
+async def read_goals_async(
+    *,
+    session: AsyncSession = Depends(get_async_session),
+    request: Request,
+    response: Response,
+    status: Optional[GoalStatus] = None
+):
+    """Listar metas com filtro opcional por status"""
+    goals = (await session.exec(queries.goals_statement(status))).all()
+    not_modified = cache.not_modified(request, response, cache.collection_etag(goals))
+    if not_modified:
+        return not_modified
+    return goals
+
+@router.get("/goals/{goal_id}", response_model=GoalResponse, tags=["Metas"])
+async def read_goal_async(
+    *,
+    session: AsyncSession = Depends(get_async_session),
+    request: Request,
+    response: Response,
+    goal_id: int
+):
+    """Buscar uma meta específica"""
+    goal = await session.get(Goal, goal_id)
+    if not goal:
+        raise HTTPException(status_code=404, detail="Meta não encontrada")
+    
+    not_modified = cache.not_modified(request, response, cache.resource_etag(goal))
+    if not_modified:
+        return not_modified
+    return goal
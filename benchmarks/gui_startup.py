@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark da carga inicial da interface gráfica
+Faz contra uma API já em execução as quatro consultas da abertura da
+interface: uma após a outra com conexões novas (como antes) e ao mesmo
+tempo pela sessão compartilhada com keep-alive (como agora)
+
+Uso:
+    uvicorn main:app
+    python -m benchmarks.gui_startup [rodadas]
+"""
+
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from interface_gui import WORKER_THREADS, create_session
+
+BASE_URL = os.getenv("BASE_URL", "http://localhost:8000")
+
+# Consultas feitas pelo load_data da interface
+STARTUP_PATHS = [
+    "/transactions/",
+    "/goals/",
+    "/transactions/summary/balance",
+    "/transactions/summary/category",
+]
+
+def timed_get(get, path):
+    """Tempo (s) de um GET"""
+    started = time.perf_counter()
+    response = get(f"{BASE_URL}{path}")
+    assert response.status_code == 200, (path, response.status_code)
+    return time.perf_counter() - started
+
+def sequential_fresh():
+    """Uma consulta após a outra, cada uma abrindo uma conexão"""
+    started = time.perf_counter()
+    slowest = max(timed_get(requests.get, path) for path in STARTUP_PATHS)
+    return time.perf_counter() - started, slowest
+
+def concurrent_pooled(session, executor):
+    """Todas as consultas ao mesmo tempo, reaproveitando as conexões da sessão"""
+    started = time.perf_counter()
+    slowest = max(executor.map(lambda path: timed_get(session.get, path), STARTUP_PATHS))
+    return time.perf_counter() - started, slowest
+
+def report(title, results):
+    """Mediana do tempo total e da consulta mais lenta"""
+    total = statistics.median(result[0] for result in results) * 1000
+    slowest = statistics.median(result[1] for result in results) * 1000
+    print(f"{title:<40}{total:>10.1f} ms{slowest:>16.1f} ms")
+
+def main():
+    """Função principal"""
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    session = create_session()
+    with ThreadPoolExecutor(max_workers=WORKER_THREADS) as executor:
+        # Primeira rodada abre as conexões da sessão
+        concurrent_pooled(session, executor)
+        fresh = [sequential_fresh() for _ in range(rounds)]
+        pooled = [concurrent_pooled(session, executor) for _ in range(rounds)]
+    session.close()
+
+    print(f"📡 {BASE_URL} - {rounds} rodadas, mediana\n")
+    print(f"{'Carga inicial':<40}{'total':>13}{'mais lenta':>19}")
+    report("sequencial, conexões novas", fresh)
+    report("simultânea, sessão com keep-alive", pooled)
+
+if __name__ == "__main__":
+    main()
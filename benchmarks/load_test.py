@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Teste de carga das rotas de leitura da API
+Dispara requisições concorrentes contra uma API já em execução e mostra
+vazão e latência, para comparar o modo síncrono com o assíncrono
+
+Uso:
+    uvicorn main:app                          # modo síncrono
+    DATABASE_ASYNC=true uvicorn main:app      # modo assíncrono
+    python -m benchmarks.load_test [clientes] [requisicoes_por_cliente]
+"""
+
+import os
+import statistics
+import sys
+import threading
+import time
+
+import requests
+
+BASE_URL = os.getenv("BASE_URL", "http://localhost:8000")
+
+ENDPOINTS = [
+    "/transactions/?limit=100",
+    "/transactions/summary/balance",
+    "/transactions/summary/category",
+    "/goals/",
+]
+
+def run_client(path, requests_per_client, latencies, errors, barrier):
+    """Um cliente com conexão persistente fazendo requisições em sequência"""
+    session = requests.Session()
+    barrier.wait()
+    for _ in range(requests_per_client):
+        started = time.perf_counter()
+        response = session.get(f"{BASE_URL}{path}")
+        latencies.append(time.perf_counter() - started)
+        if response.status_code != 200:
+            errors.append(response.status_code)
+
+def run_endpoint(path, clients, requests_per_client):
+    """Mede vazão e latência de um endpoint com N clientes simultâneos"""
+    latencies, errors = [], []
+    barrier = threading.Barrier(clients + 1)
+    threads = [
+        threading.Thread(target=run_client, args=(path, requests_per_client, latencies, errors, barrier))
+        for _ in range(clients)
+    ]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1000
+    p95 = latencies[int(len(latencies) * 0.95) - 1] * 1000
+    print(
+        f"{path:<35} {len(latencies) / elapsed:>8.0f} req/s"
+        f"   p50 {p50:>7.1f} ms   p95 {p95:>7.1f} ms   erros {len(errors)}"
+    )
+
+def main():
+    """Função principal"""
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    requests_per_client = int(sys.argv[2]) if len(sys.argv) > 2 else 40
+
+    print(f"📡 {BASE_URL} - {clients} clientes x {requests_per_client} requisições")
+    for path in ENDPOINTS:
+        run_endpoint(path, clients, requests_per_client)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Benchmark dos índices das tabelas de transações e metas
+Mostra o plano de execução (EXPLAIN QUERY PLAN) e o tempo das consultas da
+API em um banco temporário, antes e depois de criar os índices
+
+Uso: python -m benchmarks.query_plans [quantidade_de_transacoes]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, event, text
+from sqlmodel import SQLModel
+
+from database import migrate_db, register_sqlite_functions
+from models.transaction import Transaction, TransactionType, Category
+from models.goal import Goal, GoalStatus
+
+# Consultas equivalentes às feitas pelos endpoints de listagem e relatórios
+QUERIES = {
+    "GET /transactions/?transaction_type=receita": (
+        "SELECT * FROM transactions WHERE type = 'receita' "
+        "ORDER BY date, id LIMIT 101"
+    ),
+    "GET /transactions/?category=lazer": (
+        "SELECT * FROM transactions WHERE category = 'lazer' "
+        "ORDER BY date, id LIMIT 101"
+    ),
+    "GET /transactions/?cursor=... (página profunda)": (
+        "SELECT * FROM transactions WHERE (date, id) > ('2024-06-01', 0) "
+        "ORDER BY date, id LIMIT 101"
+    ),
+    "GET /transactions/?date_from=2024-03-01&date_to=2024-03-31": (
+        "SELECT * FROM transactions WHERE date >= '2024-03-01' AND date <= '2024-03-31 23:59:59' "
+        "ORDER BY date, id LIMIT 101"
+    ),
+    "GET /transactions/?min_amount=1000": (
+        "SELECT * FROM transactions WHERE amount >= 100000 "
+        "ORDER BY date, id LIMIT 101"
+    ),
+    "GET /transactions/?min_amount=4990": (
+        "SELECT * FROM transactions WHERE amount >= 499000 "
+        "ORDER BY date, id LIMIT 101"
+    ),
+    "GET /transactions/?description_prefix=transação 1234": (
+        "SELECT * FROM transactions WHERE unicode_lower(description) >= 'transação 1234' "
+        "AND unicode_lower(description) < 'transação 1235' ORDER BY date, id LIMIT 101"
+    ),
+    "GET /transactions/summary/category": (
+        "SELECT category, sum(amount), count(id) FROM transactions GROUP BY category"
+    ),
+    "GET /transactions/summary/balance (receitas)": (
+        "SELECT sum(amount) FROM transactions WHERE type = 'receita'"
+    ),
+    "GET /goals/?status=ativa": (
+        "SELECT * FROM goals WHERE status = 'ativa'"
+    ),
+}
+
+def populate(engine, transactions_count):
+    """Cria as tabelas sem índices e insere dados aleatórios"""
+    for table in SQLModel.metadata.sorted_tables:
+        table.create(engine)
+        for index in table.indexes:
+            index.drop(engine)
+
+    start = datetime(2020, 1, 1)
+    types = [t.name for t in TransactionType]
+    categories = [c.name for c in Category]
+    statuses = [s.name for s in GoalStatus]
+    transactions = [
+        {
+            "description": f"Transação {i}",
+            "amount": round(random.uniform(1, 5000), 2),
+            "type": random.choice(types),
+            "category": random.choice(categories),
+            "date": start + timedelta(minutes=random.randint(0, 60 * 24 * 365 * 5)),
+        }
+        for i in range(transactions_count)
+    ]
+    goals = [
+        {
+            "title": f"Meta {i}",
+            "target_amount": 1000.0,
+            "current_amount": 0.0,
+            "status": random.choice(statuses),
+            "created_at": start,
+        }
+        for i in range(transactions_count // 10)
+    ]
+    with engine.begin() as connection:
+        connection.execute(Transaction.__table__.insert(), transactions)
+        connection.execute(Goal.__table__.insert(), goals)
+        connection.execute(text("ANALYZE"))
+
+def run_queries(engine, repetitions=20):
+    """Imprime o plano e o tempo médio de cada consulta"""
+    with engine.connect() as connection:
+        for title, sql in QUERIES.items():
+            plan = connection.execute(text(f"EXPLAIN QUERY PLAN {sql}")).fetchall()
+            started = time.perf_counter()
+            for _ in range(repetitions):
+                connection.execute(text(sql)).fetchall()
+            elapsed = (time.perf_counter() - started) / repetitions * 1000
+            print(f"\n{title}: {elapsed:.2f} ms")
+            for row in plan:
+                print(f"    {row[-1]}")
+
+def main():
+    """Função principal"""
+    transactions_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        event.listen(engine, "connect", register_sqlite_functions)
+        populate(engine, transactions_count)
+
+        print(f"{'='*50}\nSEM ÍNDICES ({transactions_count} transações)\n{'='*50}")
+        run_queries(engine)
+
+        migrate_db(engine)
+        with engine.begin() as connection:
+            connection.execute(text("ANALYZE"))
+
+        print(f"\n{'='*50}\nCOM ÍNDICES ({transactions_count} transações)\n{'='*50}")
+        run_queries(engine)
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark da busca textual nas descrições
+Compara a busca com o índice FTS5 e com o LIKE usado sem ele, e mede o
+custo que os triggers de sincronização acrescentam às inserções
+
+Uso: python -m benchmarks.search [quantidade_de_transacoes]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, event
+from sqlmodel import Session, SQLModel
+
+from database import register_sqlite_functions
+from models.transaction import Transaction, TransactionType, Category
+import search
+
+# Palavras usadas para montar descrições parecidas com as de um extrato
+WORDS = [
+    "mercado", "farmácia", "padaria", "posto", "shell", "ipiranga", "uber", "ifood",
+    "aluguel", "condomínio", "energia", "água", "internet", "academia", "cinema",
+    "restaurante", "salário", "freelance", "pix", "transferência", "boleto", "cartão",
+    "assinatura", "streaming", "livraria", "petshop", "hortifruti", "açougue", "drogaria",
+    "estacionamento", "pedágio", "seguro", "consulta", "dentista", "escola", "curso",
+]
+
+# Buscas comparadas: termos comuns, prefixo, vários termos e um termo raro
+SEARCHES = ["mercado", "farm", "posto shell", "pix transferência", "recibo 123456"]
+
+# Inserções medidas com e sem os triggers do índice
+INSERT_BATCH = 50_000
+
+def random_transactions(count, start_number=0):
+    """Transações aleatórias com descrições de três palavras e um número"""
+    start = datetime(2020, 1, 1)
+    types = [t.name for t in TransactionType]
+    categories = [c.name for c in Category]
+    return [
+        {
+            "description": f"{' '.join(random.sample(WORDS, 3))} recibo {i}",
+            "amount": random.randint(100, 500_000),
+            "type": random.choice(types),
+            "category": random.choice(categories),
+            "date": start + timedelta(minutes=random.randint(0, 60 * 24 * 365 * 5)),
+            "version": 1,
+        }
+        for i in range(start_number, start_number + count)
+    ]
+
+def timed_insert(engine, rows):
+    """Insere as linhas e retorna o tempo em segundos"""
+    started = time.perf_counter()
+    with engine.begin() as connection:
+        connection.execute(Transaction.__table__.insert(), rows)
+    return time.perf_counter() - started
+
+def run_searches(engine, repetitions=5):
+    """Tempo médio de cada busca (primeira página, 20 linhas)"""
+    results = {}
+    with Session(engine) as session:
+        for query in SEARCHES:
+            statement = search.search_statement(query, limit=20)
+            found = len(session.exec(statement).all())
+            started = time.perf_counter()
+            for _ in range(repetitions):
+                session.exec(statement).all()
+            results[query] = ((time.perf_counter() - started) / repetitions * 1000, found)
+    return results
+
+def main():
+    """Função principal"""
+    transactions_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}")
+        event.listen(engine, "connect", register_sqlite_functions)
+        SQLModel.metadata.create_all(engine)
+
+        print(f"Inserindo {transactions_count} transações...")
+        timed_insert(engine, random_transactions(transactions_count))
+        without_triggers = timed_insert(engine, random_transactions(INSERT_BATCH, transactions_count))
+
+        search.fts_enabled = False
+        like = run_searches(engine)
+
+        started = time.perf_counter()
+        with engine.begin() as connection:
+            search.setup_fts(connection)
+        rebuild = time.perf_counter() - started
+        fts = run_searches(engine)
+
+        with_triggers = timed_insert(engine, random_transactions(INSERT_BATCH, transactions_count + INSERT_BATCH))
+
+        print(f"\n{'Busca':<22}{'LIKE (ms)':>12}{'FTS5 (ms)':>12}{'linhas':>8}")
+        for query in SEARCHES:
+            print(f"{query:<22}{like[query][0]:>12.1f}{fts[query][0]:>12.2f}{fts[query][1]:>8}")
+
+        print(f"\nCriação do índice FTS5: {rebuild:.1f} s")
+        print(f"Inserção de {INSERT_BATCH} transações sem triggers: {without_triggers:.2f} s")
+        print(f"Inserção de {INSERT_BATCH} transações com triggers: {with_triggers:.2f} s")
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark da serialização das listagens
+Chama a aplicação diretamente pela interface ASGI (sem rede), passando por
+rotas, validação e serialização, e mostra requisições e linhas por segundo
+das listagens (completa e com o parâmetro fields) e dos relatórios
+
+Uso:
+    python -m benchmarks.serialization [requisicoes_por_rota]
+    FAST_RESPONSES=true python -m benchmarks.serialization [requisicoes_por_rota]
+"""
+
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# O banco temporário precisa estar configurado antes de importar a API
+directory = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory.name, 'bench.db')}"
+
+from database import create_db_and_tables, engine
+from models.transaction import Transaction, TransactionType, Category
+from models.goal import Goal
+from aggregates import rebuild_aggregates
+import main
+import serialization
+
+TRANSACTIONS = 10_000
+GOALS = 100
+
+ROUTES = {
+    "listagem completa": "/transactions/?limit=100",
+    "fields com todos os campos": "/transactions/?limit=100&fields=description,amount,type,category,date,id,version",
+    "fields=id,date,amount": "/transactions/?limit=100&fields=id,date,amount",
+    "metas": "/goals/",
+    "resumo por categoria": "/transactions/summary/category",
+    "resumo de saldo": "/transactions/summary/balance",
+    "série temporal mensal": "/transactions/summary/timeseries?bucket=month",
+}
+
+def populate():
+    """Insere transações e metas aleatórias"""
+    start = datetime(2020, 1, 1)
+    rows = [
+        {
+            "description": f"Transação {i}",
+            "amount": random.randint(100, 500_000),
+            "type": random.choice(list(TransactionType)).name,
+            "category": random.choice(list(Category)).name,
+            "date": start + timedelta(minutes=random.randint(0, 60 * 24 * 365 * 5)),
+        }
+        for i in range(TRANSACTIONS)
+    ]
+    goals = [
+        {"title": f"Meta {i}", "target_amount": 100_000, "current_amount": 0, "status": "ativa", "created_at": start}
+        for i in range(GOALS)
+    ]
+    with engine.begin() as connection:
+        connection.execute(Transaction.__table__.insert(), rows)
+        connection.execute(Goal.__table__.insert(), goals)
+        rebuild_aggregates(connection)
+
+async def get(path: str):
+    """Faz um GET pela interface ASGI e retorna (status, corpo)"""
+    route, _, query = path.partition("?")
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "GET", "scheme": "http", "path": route, "raw_path": route.encode(),
+        "query_string": query.encode(), "headers": [], "client": ("bench", 0), "server": ("bench", 80),
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await main.app(scope, receive, send)
+    body = b"".join(message.get("body", b"") for message in messages if message["type"] == "http.response.body")
+    return messages[0]["status"], body
+
+async def run_route(title: str, path: str, repetitions: int):
+    """Requisições por segundo, linhas por segundo e latência média de uma rota"""
+    status, body = await get(path)
+    assert status == 200, (path, status, body[:200])
+    content = json.loads(body)
+    rows = len(content) if isinstance(content, list) else 1
+    started = time.perf_counter()
+    for _ in range(repetitions):
+        await get(path)
+    elapsed = time.perf_counter() - started
+    print(
+        f"{title:<30}{repetitions / elapsed:>8.0f} req/s"
+        f"{rows * repetitions / elapsed:>10.0f} linhas/s{elapsed / repetitions * 1000:>8.2f} ms"
+    )
+
+async def run(repetitions: int):
+    """Roda todas as rotas"""
+    for title, path in ROUTES.items():
+        await run_route(title, path, repetitions)
+
+def main_benchmark():
+    """Função principal"""
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    create_db_and_tables()
+    populate()
+    mode = "ligado" if serialization.fast_responses else "desligado"
+    print(f"{TRANSACTIONS} transações, {repetitions} requisições por rota, FAST_RESPONSES {mode}\n")
+    asyncio.run(run(repetitions))
+    engine.dispose()
+
+if __name__ == "__main__":
+    main_benchmark()
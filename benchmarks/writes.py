@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark das escritas da API
+Compara criação e atualização de transações com e sem o refresh (SELECT
+extra) depois do commit, contando também os comandos SQL por escrita
+
+Uso: python -m benchmarks.writes [quantidade_de_escritas]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+# O banco temporário precisa estar configurado antes de importar a API
+directory = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory.name, 'bench.db')}"
+
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlmodel import Session
+
+from database import create_db_and_tables, engine
+from aggregates import update_aggregates
+from models.transaction import Transaction, TransactionCreate, TransactionUpdate, TransactionResponse
+import main
+
+statements = []
+event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+def create_with_refresh(transaction: TransactionCreate):
+    """Criação como era feita antes: commit seguido de refresh"""
+    with Session(engine) as session:
+        db_transaction = Transaction.from_orm(transaction)
+        session.add(db_transaction)
+        update_aggregates(session, added=[db_transaction])
+        session.commit()
+        session.refresh(db_transaction)
+        return TransactionResponse.from_orm(db_transaction)
+
+def create_without_refresh(transaction: TransactionCreate):
+    """Criação atual, reaproveitando o estado já conhecido do objeto"""
+    with Session(engine, expire_on_commit=False) as session:
+        return TransactionResponse.from_orm(main.create_transaction(session=session, transaction=transaction))
+
+def update_with_refresh(transaction_id: int, transaction: TransactionUpdate):
+    """Atualização como era feita antes: commit seguido de refresh"""
+    with Session(engine) as session:
+        db_transaction = session.get(Transaction, transaction_id)
+        previous = db_transaction.dict()
+        for key, value in transaction.dict(exclude_unset=True).items():
+            setattr(db_transaction, key, value)
+        session.add(db_transaction)
+        update_aggregates(session, added=[db_transaction], removed=[previous])
+        session.commit()
+        session.refresh(db_transaction)
+        return TransactionResponse.from_orm(db_transaction)
+
+def update_without_refresh(transaction_id: int, transaction: TransactionUpdate):
+    """Atualização atual, reaproveitando o estado já conhecido do objeto"""
+    with Session(engine, expire_on_commit=False) as session:
+        return TransactionResponse.from_orm(main.update_transaction(
+            session=session,
+            request=Request({"type": "http", "headers": []}),
+            response=Response(),
+            transaction_id=transaction_id,
+            transaction=transaction
+        ))
+
+def measure(title, function, arguments):
+    """Executa a função para cada argumento e imprime escritas/s e SQL por escrita"""
+    statements.clear()
+    started = time.perf_counter()
+    for args in arguments:
+        function(*args)
+    elapsed = time.perf_counter() - started
+    selects = sum(1 for sql in statements if sql.lstrip().upper().startswith("SELECT"))
+    print(
+        f"{title:<28} {len(arguments) / elapsed:>8.0f} escritas/s"
+        f"   {len(statements) / len(arguments):.1f} comandos SQL/escrita"
+        f"   ({selects / len(arguments):.1f} SELECT)"
+    )
+
+def main_benchmark():
+    """Função principal"""
+    writes = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    create_db_and_tables()
+
+    new_transaction = TransactionCreate(description="Benchmark", amount=10.0, type="despesa")
+
+    print(f"{'='*50}\nESCRITAS ({writes} por cenário)\n{'='*50}")
+    measure("POST com refresh", create_with_refresh, [(new_transaction,)] * writes)
+    measure("POST sem refresh", create_without_refresh, [(new_transaction,)] * writes)
+    # Valores diferentes em cada cenário para que toda atualização altere a linha
+    ids = range(1, writes + 1)
+    measure("PUT com refresh", update_with_refresh, [(i, TransactionUpdate(amount=20.0)) for i in ids])
+    measure("PUT sem refresh", update_without_refresh, [(i, TransactionUpdate(amount=30.0)) for i in ids])
+
+    engine.dispose()
+    directory.cleanup()
+
+if __name__ == "__main__":
+    main_benchmark()
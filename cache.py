@@ -0,0 +1,139 @@
+# cache.py
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Optional
+
+from fastapi import HTTPException, Request, Response
+
+from models.money import round_cents
+from models.timestamp import strip_timezone
+
+# Cache dos relatórios e ETags das respostas. A chave de cada relatório
+# inclui a versão atual das transações, lida do banco a cada requisição
+# (tabela transactions_version, incrementada na mesma transação de toda
+# escrita): resultados de versões antigas deixam de ser encontrados e saem
+# do cache por LRU, sem precisar de uma invalidação explícita. Como a
+# versão vem do banco, vários processos (--workers) nunca servem um
+# relatório de antes de uma escrita feita por outro processo.
+
+# Quantidade de resultados guardados (0 desativa o armazenamento; o ETag continua valendo)
+report_cache_size = int(os.getenv("REPORT_CACHE_SIZE", "256"))
+
+class MemoryCacheBackend:
+    """Cache LRU em memória, local ao processo
+
+    Outros backends (Redis, memcached...) só precisam oferecer os mesmos
+    métodos get e set; com um backend compartilhado, os processos também
+    reaproveitam os resultados uns dos outros.
+    """
+
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self.entries: "OrderedDict[str, Any]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self.lock:
+            value = self.entries.get(key)
+            if value is not None:
+                self.entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any):
+        if self.max_size <= 0:
+            return
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+backend = MemoryCacheBackend(report_cache_size)
+
+def set_backend(new_backend):
+    """Troca o backend do cache (por exemplo, por um compartilhado entre processos)"""
+    global backend
+    backend = new_backend
+
+def report_key(name: str, version: int, **params) -> str:
+    """Chave de um relatório: nome, versão das transações (lida do banco) e parâmetros da consulta"""
+    query = "&".join(
+        f"{param}={getattr(value, 'value', value)}"
+        for param, value in sorted(params.items())
+        if value is not None
+    )
+    return f"{name}:v{version}:{query}"
+
+def lookup(key: str) -> Optional[Any]:
+    """Resultado guardado para a chave, se houver"""
+    return backend.get(key)
+
+def store(key: str, value: Any):
+    """Guarda o resultado de um relatório"""
+    backend.set(key, value)
+
+def _etag(text: str) -> str:
+    """ETag forte a partir de um texto"""
+    return '"' + hashlib.sha1(text.encode()).hexdigest()[:20] + '"'
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+    """Verifica se o ETag aparece num If-None-Match/If-Match (ou se o header é *)"""
+    if not header:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return "*" in tags or etag in tags
+
+def not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """Envia o ETag e, se o cliente já tem essa versão, devolve um 304
+
+    O 304 leva os headers já definidos na resposta (ex.: X-Next-Cursor).
+    """
+    response.headers.update({"ETag": etag, "Cache-Control": "no-cache"})
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=dict(response.headers))
+    return None
+
+def check_etag(request: Request, response: Response, key: str) -> Optional[Response]:
+    """ETag/304 de um relatório
+
+    O ETag deriva só da chave, que inclui a versão lida do banco: o 304 ainda
+    faz essa leitura, mas dispensa a consulta do relatório.
+    """
+    return not_modified(request, response, _etag(key))
+
+def _stored_value(value):
+    """Valor como o banco o grava: datas sem fuso e valores em centavos"""
+    if isinstance(value, datetime):
+        return strip_timezone(value)
+    if isinstance(value, Decimal):
+        return round_cents(value)
+    return getattr(value, "value", value)
+
+def resource_etag(resource) -> str:
+    """ETag de uma transação ou meta
+
+    Além da versão, entram os valores da linha: no SQLite o id de uma linha
+    apagada pode ser reaproveitado por outra, também na versão 1. Os valores
+    são normalizados como o banco os grava, para que o ETag devolvido por
+    uma escrita seja o mesmo da leitura seguinte.
+    """
+    values = sorted((field, _stored_value(value)) for field, value in resource.dict().items())
+    return _etag(repr(values))
+
+def collection_etag(resources) -> str:
+    """ETag de uma listagem, a partir das linhas retornadas"""
+    return _etag("".join(resource_etag(resource) for resource in resources))
+
+def content_etag(content: bytes) -> str:
+    """ETag de uma resposta já serializada, a partir do corpo"""
+    return '"' + hashlib.sha1(content).hexdigest()[:20] + '"'
+
+def check_if_match(request: Request, etag: str):
+    """Recusa a escrita (412) se o If-Match não corresponder à versão atual"""
+    if_match = request.headers.get("if-match")
+    if if_match and not _etag_matches(if_match, etag):
+        raise HTTPException(status_code=412, detail="O recurso foi alterado por outra requisição")
@@ -0,0 +1,161 @@
+# changes.py
+import secrets
+from typing import List, Tuple
+
+from sqlalchemy import text
+from sqlmodel import Session, select
+
+from models.changes import ChangeFeed
+from models.goal import Goal
+from models.transaction import Transaction
+
+# Feed de alterações para a sincronização incremental dos clientes. Toda
+# inserção, alteração ou exclusão em transactions e goals recebe uma versão
+# global, crescente, gravada por triggers na tabela row_changes (uma linha
+# por registro, com a versão da última alteração e se ele foi apagado). Os
+# triggers cobrem todos os caminhos de escrita (ORM, UPDATE/DELETE em lote,
+# inserção em massa e importação) sem mudar as rotas. Só no SQLite.
+# Cada banco recebe também uma identidade aleatória (epoch), criada junto
+# com as tabelas: se o banco é recriado, ela muda e o cliente sabe que as
+# versões que guardou não valem mais, mesmo que o novo banco já tenha
+# passado delas.
+
+STATE_TABLE = "change_state"
+CHANGES_TABLE = "row_changes"
+TRACKED_TABLES = ("transactions", "goals")
+
+# Alterações enviadas por resposta do feed
+CHANGES_PAGE_SIZE = 1000
+
+# Maior versão que cabe no INTEGER do SQLite (64 bits com sinal)
+MAX_VERSION = 2 ** 63 - 1
+
+# Ativado por setup_changes quando o banco é SQLite
+changes_enabled = False
+
+CHANGES_DDL = [
+    f"""
+    CREATE TABLE {STATE_TABLE} (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        version INTEGER NOT NULL,
+        epoch TEXT NOT NULL
+    )
+    """,
+    f"""
+    CREATE TABLE {CHANGES_TABLE} (
+        table_name TEXT NOT NULL,
+        row_id INTEGER NOT NULL,
+        version INTEGER NOT NULL,
+        deleted BOOLEAN NOT NULL DEFAULT 0,
+        PRIMARY KEY (table_name, row_id)
+    )
+    """,
+    f"CREATE INDEX ix_{CHANGES_TABLE}_version ON {CHANGES_TABLE} (version)",
+]
+
+def _triggers(table_name: str) -> List[str]:
+    """Triggers que registram as alterações de uma tabela
+
+    O INSERT OR REPLACE mantém uma linha por registro: uma exclusão vira
+    a marca de apagado (tombstone) e um id reaproveitado volta a existir.
+    """
+    record = (
+        f"UPDATE {STATE_TABLE} SET version = version + 1; "
+        f"INSERT OR REPLACE INTO {CHANGES_TABLE} (table_name, row_id, version, deleted) "
+        f"VALUES ('{table_name}', {{row}}.id, (SELECT version FROM {STATE_TABLE}), {{deleted}});"
+    )
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {table_name}_changes_{event} AFTER {event.upper()} ON {table_name} BEGIN
+            {record.format(row=row, deleted=deleted)}
+        END
+        """
+        for event, row, deleted in (("insert", "new", 0), ("update", "new", 0), ("delete", "old", 1))
+    ]
+
+def setup_changes(connection) -> bool:
+    """Cria (se preciso) as tabelas do feed e os triggers que o alimentam
+
+    Na criação, os registros que já existem recebem versões em sequência e
+    o banco recebe a sua identidade (epoch). Retorna False se o banco não é
+    SQLite.
+    """
+    global changes_enabled
+    if connection.dialect.name != "sqlite":
+        return False
+
+    exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (CHANGES_TABLE,)
+    ).first()
+    if not exists:
+        for ddl in CHANGES_DDL:
+            connection.exec_driver_sql(ddl)
+        offset = 0
+        for table_name in TRACKED_TABLES:
+            connection.exec_driver_sql(
+                f"INSERT INTO {CHANGES_TABLE} (table_name, row_id, version) "
+                f"SELECT '{table_name}', id, {offset} + ROW_NUMBER() OVER (ORDER BY id) FROM {table_name}"
+            )
+            offset += connection.exec_driver_sql(f"SELECT COUNT(*) FROM {table_name}").scalar()
+        connection.exec_driver_sql(
+            f"INSERT INTO {STATE_TABLE} (id, version, epoch) VALUES (1, ?, ?)", (offset, secrets.token_hex(8))
+        )
+    else:
+        # Feed criado antes da identidade do banco
+        columns = {row[1] for row in connection.exec_driver_sql(f"PRAGMA table_info({STATE_TABLE})")}
+        if "epoch" not in columns:
+            connection.exec_driver_sql(f"ALTER TABLE {STATE_TABLE} ADD COLUMN epoch TEXT")
+            connection.exec_driver_sql(f"UPDATE {STATE_TABLE} SET epoch = ?", (secrets.token_hex(8),))
+
+    for table_name in TRACKED_TABLES:
+        for trigger in _triggers(table_name):
+            connection.exec_driver_sql(trigger)
+    changes_enabled = True
+    return True
+
+def current_state(session: Session) -> Tuple[int, str]:
+    """Versão da última alteração gravada e identidade do banco"""
+    return session.execute(text(f"SELECT version, epoch FROM {STATE_TABLE}")).one()
+
+def _changed_rows(session: Session, since: int, until: int, limit: int) -> List[Tuple[str, int, int, bool]]:
+    """Registros alterados depois de since e até until, em ordem de versão"""
+    statement = text(
+        f"SELECT table_name, row_id, version, deleted FROM {CHANGES_TABLE} "
+        f"WHERE version > :since AND version <= :until ORDER BY version LIMIT :limit"
+    )
+    return session.execute(statement, {"since": since, "until": until, "limit": limit}).all()
+
+def read_changes(session: Session, since: int, limit: int = CHANGES_PAGE_SIZE) -> ChangeFeed:
+    """Alterações posteriores à versão since, em ordem, limitadas a limit
+
+    A versão atual é lida antes das alterações: como as escritas do SQLite
+    são serializadas, tudo até ela já está gravado, e nada entre since e a
+    versão devolvida fica de fora, mesmo com escritas durante a leitura.
+    Registros apagados depois de lidos na lista de alterações ficam para a
+    próxima chamada, que traz a exclusão.
+    """
+    until, epoch = current_state(session)
+    rows = _changed_rows(session, since, until, limit + 1)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    changed = {table_name: [] for table_name in TRACKED_TABLES}
+    deleted = {table_name: [] for table_name in TRACKED_TABLES}
+    for table_name, row_id, _, is_deleted in rows:
+        (deleted if is_deleted else changed)[table_name].append(row_id)
+
+    transactions = goals = []
+    if changed["transactions"]:
+        transactions = session.exec(select(Transaction).where(Transaction.id.in_(changed["transactions"]))).all()
+    if changed["goals"]:
+        goals = session.exec(select(Goal).where(Goal.id.in_(changed["goals"]))).all()
+
+    return ChangeFeed(
+        epoch=epoch,
+        version=rows[-1][2] if has_more else until,
+        has_more=has_more,
+        transactions=transactions,
+        goals=goals,
+        deleted_transactions=deleted["transactions"],
+        deleted_goals=deleted["goals"],
+    )
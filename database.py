@@ -1,22 +1,246 @@
 # database.py
-from sqlmodel import SQLModel, Session, create_engine
+import os
+
+from dotenv import load_dotenv
+from sqlalchemy import Integer, event, inspect
+from sqlalchemy.schema import CreateColumn, CreateIndex
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlmodel import SQLModel, Session, create_engine, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from models.text import lower_text
+
+# Configuração do banco de dados, lida do ambiente (ou de um arquivo .env)
+load_dotenv()
+
+def _env_bool(name: str, default: bool) -> bool:
+    """Lê uma variável de ambiente booleana (1/true/yes/on)"""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
 
-# Configuração do banco de dados SQLite
 sqlite_file_name = "finances.db"
-sqlite_url = f"sqlite:///{sqlite_file_name}"
+database_url = os.getenv("DATABASE_URL", f"sqlite:///{sqlite_file_name}")
+database_echo = _env_bool("DATABASE_ECHO", False)
+database_pool_size = int(os.getenv("DATABASE_POOL_SIZE", "5"))
+database_max_overflow = int(os.getenv("DATABASE_MAX_OVERFLOW", "10"))
+database_pool_timeout = float(os.getenv("DATABASE_POOL_TIMEOUT", "30"))
+# Modo assíncrono: rotas de leitura com motor e sessão assíncronos
+database_async = _env_bool("DATABASE_ASYNC", False)
+
+# Drivers assíncronos usados no modo assíncrono para cada banco
+async_drivers = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+# Ajustes do SQLite aplicados a cada nova conexão
+sqlite_journal_mode = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+sqlite_synchronous = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+sqlite_busy_timeout_ms = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+sqlite_mmap_size = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+
+def _engine_options(url: str, poolclass=QueuePool) -> dict:
+    """Opções do create_engine de acordo com o banco configurado"""
+    options = {"echo": database_echo}
+    pool_options = {
+        "pool_size": database_pool_size,
+        "max_overflow": database_max_overflow,
+        "pool_timeout": database_pool_timeout,
+    }
+    if url.startswith("sqlite"):
+        # As conexões do pool são usadas por várias threads do FastAPI
+        options["connect_args"] = {
+            "check_same_thread": False,
+            "timeout": sqlite_busy_timeout_ms / 1000,
+        }
+        if ":memory:" not in url and url.rstrip("/") != "sqlite:":
+            # O padrão do SQLAlchemy para arquivos SQLite é abrir uma conexão
+            # por sessão (NullPool); o pool evita reabrir e reconfigurar
+            options.update(poolclass=poolclass, **pool_options)
+    else:
+        options.update(pool_pre_ping=True, **pool_options)
+    return options
+
+def register_sqlite_functions(dbapi_connection, connection_record=None):
+    """Registra as funções usadas pelo esquema na conexão SQLite
+    
+    unicode_lower aparece no índice e no filtro da descrição (o lower()
+    nativo só trata ASCII); toda conexão que grava em transactions precisa
+    dela, inclusive as de outros motores (ex.: benchmarks).
+    """
+    dbapi_connection.create_function("unicode_lower", 1, lower_text, deterministic=True)
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Configura WAL, sincronização, mmap e espera por locks na conexão SQLite
+    
+    Com WAL leitores não bloqueiam escritores (e vice-versa), e o
+    busy_timeout faz escritas concorrentes esperarem em vez de falharem
+    com "database is locked". Também registra as funções do esquema.
+    """
+    register_sqlite_functions(dbapi_connection)
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={sqlite_journal_mode}")
+    cursor.execute(f"PRAGMA synchronous={sqlite_synchronous}")
+    cursor.execute(f"PRAGMA busy_timeout={sqlite_busy_timeout_ms}")
+    cursor.execute(f"PRAGMA mmap_size={sqlite_mmap_size}")
+    cursor.close()
+
+def _async_url(url: str) -> str:
+    """Troca o driver da URL pelo driver assíncrono equivalente"""
+    backend, _, rest = url.partition("://")
+    driver = async_drivers.get(backend.split("+")[0])
+    if driver is None:
+        raise ValueError(f"Modo assíncrono não suportado para {backend}")
+    return f"{driver}://{rest}"
 
 # Cria o motor do banco de dados
-engine = create_engine(sqlite_url, echo=True)
+engine = create_engine(database_url, **_engine_options(database_url))
+if engine.dialect.name == "sqlite":
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+
+# Motor assíncrono, criado apenas quando o modo assíncrono está ativo
+async_engine = None
+if database_async:
+    async_database_url = _async_url(database_url)
+    async_engine = create_async_engine(
+        async_database_url, **_engine_options(async_database_url, AsyncAdaptedQueuePool)
+    )
+    if async_engine.dialect.name == "sqlite":
+        event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
 
 # Importa todos os modelos para garantir que sejam criados
-from models.transaction import Transaction
+from models.transaction import Transaction, TransactionAggregate, TransactionsVersion
 from models.goal import Goal
+from models.money import Money
+from aggregates import rebuild_aggregates, setup_transactions_version
+from search import setup_fts
+from changes import setup_changes
 
 def create_db_and_tables():
-    """Cria as tabelas no banco de dados"""
+    """Cria as tabelas no banco de dados e aplica as migrações pendentes"""
     SQLModel.metadata.create_all(engine)
+    migrate_db(engine)
+
+def migrate_db(bind):
+    """Atualiza bancos já existentes (ex.: finances.db antigos)
+    
+    O create_all só cria tabelas novas; as colunas e os índices adicionados
+    depois a tabelas que já existem precisam ser criados aqui, os valores
+    antigos em float convertidos para centavos, e a tabela de agregados
+    recém-criada precisa ser preenchida com as transações antigas; o mesmo
+    vale para o índice de busca textual, o feed de alterações e a linha da
+    versão das transações.
+    """
+    _add_missing_columns(bind)
+    _convert_money_columns(bind)
+    
+    # Índice de busca textual (SQLite com FTS5), preenchido na criação
+    with bind.begin() as connection:
+        setup_fts(connection)
+    
+    # Feed de alterações (SQLite), com as versões dos registros já existentes
+    with bind.begin() as connection:
+        setup_changes(connection)
+    
+    # IF NOT EXISTS em vez de checkfirst: a reflexão do SQLAlchemy 1.4 não
+    # enxerga índices de expressão, como o da descrição em minúsculas. No
+    # SQLite, um índice com a definição antiga (ex.: lower(description),
+    # que só tratava ASCII) é apagado e criado de novo
+    with bind.begin() as connection:
+        for table in SQLModel.metadata.sorted_tables:
+            for index in table.indexes:
+                ddl = str(CreateIndex(index).compile(dialect=bind.dialect))
+                if bind.dialect.name == "sqlite":
+                    stored = connection.exec_driver_sql(
+                        "SELECT sql FROM sqlite_master WHERE type = 'index' AND name = ?", (index.name,)
+                    ).scalar()
+                    if stored and " ".join(stored.split()) != " ".join(ddl.split()):
+                        connection.exec_driver_sql(f"DROP INDEX {index.name}")
+                connection.exec_driver_sql(ddl.replace("CREATE INDEX", "CREATE INDEX IF NOT EXISTS", 1))
+    
+    with bind.begin() as connection:
+        setup_transactions_version(connection)
+        has_transactions = connection.execute(select(Transaction.id).limit(1)).first()
+        has_aggregates = connection.execute(select(TransactionAggregate.month).limit(1)).first()
+        if has_transactions and not has_aggregates:
+            rebuild_aggregates(connection)
+
+def _add_missing_columns(bind):
+    """Adiciona às tabelas existentes as colunas novas do modelo
+    
+    As colunas novas precisam de server_default para preencher as linhas
+    que já existem (ex.: version começa em 1).
+    """
+    inspector = inspect(bind)
+    with bind.begin() as connection:
+        for table in SQLModel.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    definition = CreateColumn(column).compile(dialect=bind.dialect)
+                    connection.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {definition}")
+
+def _convert_money_columns(bind):
+    """Converte para centavos as colunas monetárias ainda gravadas como float
+    
+    No PostgreSQL basta um ALTER COLUMN; o SQLite não muda o tipo de uma
+    coluna, então a tabela é recriada e os dados copiados já convertidos.
+    """
+    inspector = inspect(bind)
+    for table in SQLModel.metadata.sorted_tables:
+        types = {column["name"]: column["type"] for column in inspector.get_columns(table.name)}
+        pending = [
+            column.name for column in table.columns
+            if isinstance(column.type, Money) and not isinstance(types[column.name], Integer)
+        ]
+        if not pending:
+            continue
+        
+        with bind.begin() as connection:
+            if bind.dialect.name == "sqlite":
+                _rebuild_sqlite_table(connection, table, pending)
+            else:
+                for name in pending:
+                    connection.exec_driver_sql(
+                        f"ALTER TABLE {table.name} ALTER COLUMN {name} "
+                        f"TYPE BIGINT USING ROUND({name} * 100)::bigint"
+                    )
+
+def _rebuild_sqlite_table(connection, table, money_columns):
+    """Recria uma tabela do SQLite com o esquema atual, convertendo reais para centavos"""
+    quote = connection.dialect.identifier_preparer.quote
+    old_name = f"{table.name}_old"
+    for index in inspect(connection).get_indexes(table.name):
+        connection.exec_driver_sql(f"DROP INDEX {quote(index['name'])}")
+    connection.exec_driver_sql(f"ALTER TABLE {table.name} RENAME TO {old_name}")
+    table.create(connection)
+    
+    columns = [quote(column.name) for column in table.columns]
+    values = [
+        f"CAST(ROUND({quote(column.name)} * 100) AS INTEGER)" if column.name in money_columns
+        else quote(column.name)
+        for column in table.columns
+    ]
+    connection.exec_driver_sql(
+        f"INSERT INTO {table.name} ({', '.join(columns)}) SELECT {', '.join(values)} FROM {old_name}"
+    )
+    connection.exec_driver_sql(f"DROP TABLE {old_name}")
 
 def get_session():
-    """Função geradora para a dependência de sessão do FastAPI"""
-    with Session(engine) as session:
+    """Função geradora para a dependência de sessão do FastAPI
+    
+    Com expire_on_commit=False os objetos continuam carregados depois do
+    commit: o id vem do próprio INSERT e os demais campos já são conhecidos,
+    então as escritas não precisam de um SELECT extra (refresh) para
+    montar a resposta.
+    """
+    with Session(engine, expire_on_commit=False) as session:
+        yield session
+
+async def get_async_session():
+    """Dependência de sessão assíncrona do FastAPI (modo assíncrono)"""
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
         yield session
@@ -0,0 +1,117 @@
+# events.py
+import asyncio
+import json
+import os
+import threading
+from typing import AsyncIterator, List, Set
+
+# Eventos de alteração enviados aos clientes conectados (Server-Sent
+# Events). As rotas de escrita publicam, depois do commit, um evento por
+# operação (created/updated/deleted, com a entidade e os ids). Os eventos
+# avisam que algo mudou; o estado em si vem do feed /transactions/changes.
+# Cada cliente tem uma fila limitada e um cliente lento nunca atrasa as
+# escritas: se a fila dele enche, os eventos pendentes dão lugar a um único
+# "resync", e o cliente sincroniza tudo pelo feed.
+
+# Eventos guardados por cliente antes de trocá-los por um resync
+event_queue_size = int(os.getenv("EVENT_QUEUE_SIZE", "100"))
+
+# Intervalo (s) dos comentários que mantêm a conexão aberta e revelam
+# clientes desconectados
+EVENT_KEEPALIVE_SECONDS = 15
+
+# Operações com mais registros que isso publicam o evento sem os ids
+EVENT_MAX_IDS = 100
+
+RESYNC = {"type": "resync"}
+
+class Subscriber:
+    """Cliente conectado ao stream, com a sua fila de eventos"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_size: int):
+        self.loop = loop
+        self.queue: "asyncio.Queue[dict]" = asyncio.Queue(maxsize=max_size)
+
+    def offer(self, event: dict):
+        """Enfileira o evento (no loop do cliente); com a fila cheia, troca tudo por um resync"""
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+class EventBroker:
+    """Pub/sub em memória, local ao processo
+
+    publish pode ser chamado de qualquer thread (as rotas síncronas rodam
+    no threadpool); a entrega acontece no loop de cada cliente. Com vários
+    processos, cada um só avisa os próprios clientes das próprias escritas;
+    um broker compartilhado (ex.: Redis pub/sub) só precisa oferecer os
+    mesmos métodos subscribe, unsubscribe e publish.
+    """
+
+    def __init__(self, max_queue_size: int = 100):
+        self.max_queue_size = max_queue_size
+        self.subscribers: Set[Subscriber] = set()
+        self.sequence = 0
+        self.lock = threading.Lock()
+
+    def subscribe(self) -> Subscriber:
+        subscriber = Subscriber(asyncio.get_running_loop(), self.max_queue_size)
+        with self.lock:
+            self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        with self.lock:
+            self.subscribers.discard(subscriber)
+
+    def publish(self, event: dict):
+        with self.lock:
+            self.sequence += 1
+            event = {"id": self.sequence, **event}
+            subscribers = list(self.subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.loop.call_soon_threadsafe(subscriber.offer, event)
+            except RuntimeError:
+                # Loop já encerrado (servidor parando)
+                self.unsubscribe(subscriber)
+
+broker = EventBroker(event_queue_size)
+
+def set_broker(new_broker):
+    """Troca o broker de eventos (por exemplo, por um compartilhado entre processos)"""
+    global broker
+    broker = new_broker
+
+def publish(entity: str, action: str, ids: List[int]):
+    """Publica uma alteração; chamar depois do commit da escrita"""
+    broker.publish({
+        "type": action,
+        "entity": entity,
+        "count": len(ids),
+        "ids": ids if len(ids) <= EVENT_MAX_IDS else None,
+    })
+
+def _format(event: dict) -> str:
+    """Evento no formato text/event-stream"""
+    lines = [f"id: {event['id']}"] if "id" in event else []
+    lines += [f"event: {event['type']}", f"data: {json.dumps(event)}"]
+    return "\n".join(lines) + "\n\n"
+
+async def stream() -> AsyncIterator[str]:
+    """Eventos de um cliente, até ele se desconectar"""
+    subscriber = broker.subscribe()
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(subscriber.queue.get(), EVENT_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield _format(event)
+    finally:
+        broker.unsubscribe(subscriber)
@@ -0,0 +1,170 @@
+# importers.py
+import csv
+import itertools
+import os
+import re
+import tempfile
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import Dict, Iterator, Optional, Tuple
+
+from models.transaction import (
+    TransactionType, Category, StatementFormat, TransactionImportJob, TransactionBulkError
+)
+
+# Importações acompanhadas em memória (as mais antigas são descartadas)
+MAX_JOBS = 100
+# Erros guardados por importação; os demais só entram na contagem
+MAX_JOB_ERRORS = 100
+
+jobs: "OrderedDict[str, TransactionImportJob]" = OrderedDict()
+
+# Nomes de coluna aceitos no CSV para cada campo da transação
+CSV_COLUMNS = {
+    "date": ("date", "data", "data lançamento", "data lancamento"),
+    "description": ("description", "descrição", "descricao", "histórico", "historico", "memo"),
+    "amount": ("amount", "valor", "valor (r$)"),
+    "type": ("type", "tipo"),
+    "category": ("category", "categoria"),
+}
+
+DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S", "%Y%m%d%H%M%S", "%Y%m%d")
+
+OFX_TAG = re.compile(r"<(/?)([A-Za-z0-9.]+)>([^<\r\n]*)")
+
+def create_job(statement_format: StatementFormat) -> TransactionImportJob:
+    """Registra uma nova importação"""
+    job = TransactionImportJob(id=uuid.uuid4().hex, format=statement_format)
+    jobs[job.id] = job
+    while len(jobs) > MAX_JOBS:
+        jobs.popitem(last=False)
+    return job
+
+def get_job(job_id: str) -> Optional[TransactionImportJob]:
+    """Busca uma importação pelo id"""
+    return jobs.get(job_id)
+
+def add_error(job: TransactionImportJob, number: int, errors: list):
+    """Registra o erro de uma linha do extrato"""
+    job.error_count += 1
+    if len(job.errors) < MAX_JOB_ERRORS:
+        job.errors.append(TransactionBulkError(index=number, errors=errors))
+
+async def save_upload(chunks) -> str:
+    """Grava o corpo enviado em um arquivo temporário, bloco a bloco"""
+    with tempfile.NamedTemporaryFile(prefix="extrato-", delete=False) as file:
+        async for chunk in chunks:
+            file.write(chunk)
+        return file.name
+
+def _read_lines(path: str) -> Iterator[str]:
+    """Lê o arquivo linha a linha, em UTF-8 ou, se falhar, Windows-1252"""
+    with open(path, "rb") as file:
+        for line in file:
+            try:
+                yield line.decode("utf-8-sig")
+            except UnicodeDecodeError:
+                yield line.decode("cp1252", errors="replace")
+
+def _parse_amount(text: str):
+    """Converte valores como "1.234,56", "-45.90" ou "R$ 10,00" em Decimal"""
+    value = text.replace("R$", "").replace(" ", "").strip()
+    if "," in value and value.rfind(",") > value.rfind("."):
+        value = value.replace(".", "").replace(",", ".")
+    else:
+        value = value.replace(",", "")
+    try:
+        amount = Decimal(value)
+    except InvalidOperation:
+        return text
+    return amount if amount.is_finite() else text
+
+def _parse_date(text: str):
+    """Converte datas ISO, dd/mm/aaaa ou do OFX (aaaammddhhmmss[-3:BRT])"""
+    value = text.strip().split("[")[0]
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, date_format)
+        except ValueError:
+            continue
+    # OFX pode trazer milissegundos: 20250801120000.000
+    try:
+        return datetime.strptime(value[:14], "%Y%m%d%H%M%S")
+    except ValueError:
+        return text
+
+def _to_transaction(date: str, description: str, amount: str,
+                    type: Optional[str] = None, category: Optional[str] = None) -> Dict:
+    """Mapeia os campos do extrato para os de TransactionCreate
+
+    Sem coluna de tipo, valores negativos são despesas e positivos receitas.
+    Valores que não puderam ser convertidos seguem como texto para que a
+    validação do modelo aponte o erro.
+    """
+    value = _parse_amount(amount or "")
+    if isinstance(value, Decimal):
+        if not type:
+            type = TransactionType.receita if value >= 0 else TransactionType.despesa
+        value = abs(value)
+    return {
+        "description": (description or "").strip(),
+        "amount": value,
+        "type": type.strip().lower() if isinstance(type, str) else type,
+        "category": (category or "").strip().lower() or Category.outros,
+        "date": _parse_date(date or ""),
+    }
+
+def parse_csv(lines: Iterator[str]) -> Iterator[Tuple[int, Dict]]:
+    """Lê um extrato CSV (separado por vírgula ou ponto e vírgula)"""
+    first = next(lines, "")
+    delimiter = ";" if first.count(";") > first.count(",") else ","
+    reader = csv.reader(itertools.chain([first], lines), delimiter=delimiter)
+
+    header = [name.strip().lower() for name in next(reader, [])]
+    positions = {
+        field: next((header.index(name) for name in names if name in header), None)
+        for field, names in CSV_COLUMNS.items()
+    }
+
+    for number, row in enumerate(reader, start=1):
+        if not any(cell.strip() for cell in row):
+            continue
+        fields = {
+            field: row[position] if position is not None and position < len(row) else None
+            for field, position in positions.items()
+        }
+        yield number, _to_transaction(**fields)
+
+def parse_ofx(lines: Iterator[str]) -> Iterator[Tuple[int, Dict]]:
+    """Lê os lançamentos (<STMTTRN>) de um extrato OFX 1.x (SGML) ou 2.x (XML)"""
+    number, current = 0, None
+    for line in lines:
+        for closing, tag, value in OFX_TAG.findall(line):
+            tag = tag.upper()
+            if tag == "STMTTRN":
+                if not closing:
+                    current = {}
+                elif current is not None:
+                    number += 1
+                    yield number, _to_transaction(
+                        date=current.get("DTPOSTED"),
+                        description=current.get("MEMO") or current.get("NAME"),
+                        amount=current.get("TRNAMT"),
+                    )
+                    current = None
+            elif current is not None and not closing:
+                current[tag] = value.strip()
+
+def parse_statement(path: str, statement_format: StatementFormat) -> Iterator[Tuple[int, Dict]]:
+    """Gera (número do lançamento, campos da transação) lendo o arquivo aos poucos"""
+    parser = parse_ofx if statement_format == StatementFormat.ofx else parse_csv
+    return parser(_read_lines(path))
+
+def remove_upload(path: str):
+    """Apaga o arquivo temporário de uma importação"""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
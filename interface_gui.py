@@ -5,11 +5,375 @@ Interface completa usando Tkinter para consumir todos os endpoints
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
+from tkinter import ttk, messagebox, scrolledtext, filedialog
+import os
+import queue
+import sqlite3
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Any
+from typing import Callable, Dict, Any, List, Optional
+
+# Threads que fazem as chamadas à API e intervalo (ms) em que a thread do
+# Tk recolhe os resultados
+WORKER_THREADS = 4
+WORKER_POLL_MS = 50
+
+# Transações buscadas por página e posição da barra de rolagem (fração da
+# lista) a partir da qual a próxima página é carregada
+PAGE_SIZE = 100
+SCROLL_LOAD_AT = 0.9
+
+# Arquivo da cópia local das transações e metas
+CACHE_FILE = "gui_cache.db"
+
+# Eventos de alteração da API: intervalo (ms) em que a thread do Tk os
+# recolhe, espera (s) antes de reconectar e tempo máximo (s) sem receber
+# nada, nem o keep-alive que a API envia a cada 15 s
+EVENTS_POLL_MS = 250
+EVENTS_RETRY_SECONDS = 3
+EVENTS_READ_TIMEOUT = 45
+
+def create_session() -> requests.Session:
+    """Sessão HTTP compartilhada pelas threads do pool
+    
+    As conexões ficam abertas (keep-alive) e são reaproveitadas entre as
+    chamadas; o pool comporta uma conexão por thread, assim chamadas
+    simultâneas não esperam umas pelas outras.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=WORKER_THREADS)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def sync_tree(tree, shown: Dict[str, tuple], rows: List[tuple]):
+    """Atualiza a treeview só onde a lista mudou
+    
+    rows traz (id, valores) na ordem de exibição e shown, os valores hoje
+    exibidos por id (atualizado aqui). Linhas que saíram são removidas, as
+    novas inseridas e as alteradas reescritas; as demais ficam intactas.
+    """
+    wanted = {str(row_id): values for row_id, values in rows}
+    removed = [iid for iid in shown if iid not in wanted]
+    if removed:
+        tree.delete(*removed)
+        for iid in removed:
+            del shown[iid]
+    
+    # Só reordena se a ordem das linhas que ficaram mudou (caso raro: novas
+    # linhas costumam entrar no fim, ao carregar a próxima página)
+    order = list(wanted)
+    current = list(tree.get_children())
+    reorder = current != order[:len(current)]
+    for index, (iid, values) in enumerate(wanted.items()):
+        if iid not in shown:
+            tree.insert('', index if reorder else 'end', iid=iid, values=values)
+        elif shown[iid] != values:
+            tree.item(iid, values=values)
+        if reorder:
+            tree.move(iid, '', index)
+        shown[iid] = values
+
+class BackgroundWorker:
+    """Executa as chamadas HTTP fora da thread do Tk
+    
+    A função roda em uma thread do pool; o resultado (ou a exceção) entra
+    em uma fila que a thread do Tk esvazia com root.after, e só ali os
+    callbacks são chamados, pois o Tk não pode ser usado de outras threads.
+    """
+    
+    def __init__(self, root, on_busy: Optional[Callable[[bool], None]] = None):
+        self.root = root
+        self.on_busy = on_busy
+        self.executor = ThreadPoolExecutor(max_workers=WORKER_THREADS, thread_name_prefix="api")
+        self.results = queue.Queue()
+        self.pending = 0
+        # Última chamada de cada chave: só o resultado dela é entregue
+        self.generations = {}
+        self.futures = {}
+        self.root.after(WORKER_POLL_MS, self._drain)
+    
+    def submit(self, call: Callable, on_success: Callable, on_error: Optional[Callable] = None,
+               key: Optional[str] = None):
+        """Agenda call() em segundo plano; on_success(resultado) roda na thread do Tk
+        
+        Com key, uma nova chamada substitui a anterior de mesma chave (ex.:
+        cliques repetidos em "Aplicar Filtros"): se a anterior ainda não
+        começou, é cancelada; se já começou, o resultado é descartado.
+        """
+        generation = None
+        if key:
+            generation = self.generations.get(key, 0) + 1
+            self.generations[key] = generation
+            previous = self.futures.pop(key, None)
+            if previous and previous.cancel():
+                self._set_pending(-1)
+        
+        future = self.executor.submit(self._run, call, on_success, on_error, key, generation)
+        if key:
+            self.futures[key] = future
+        self._set_pending(1)
+    
+    def _run(self, call, on_success, on_error, key, generation):
+        """Executa a chamada na thread do pool e enfileira o resultado"""
+        if key and self.generations.get(key) != generation:
+            self.results.put((None, None, key, generation))
+            return
+        try:
+            self.results.put((on_success, call(), key, generation))
+        except Exception as e:
+            self.results.put((on_error or self._show_error, e, key, generation))
+    
+    def _drain(self):
+        """Entrega os resultados prontos (na thread do Tk) e agenda a próxima verificação"""
+        try:
+            while True:
+                callback, result, key, generation = self.results.get_nowait()
+                self._set_pending(-1)
+                if key and self.generations.get(key) != generation:
+                    continue
+                if key:
+                    self.futures.pop(key, None)
+                callback(result)
+        except queue.Empty:
+            pass
+        self.root.after(WORKER_POLL_MS, self._drain)
+    
+    def _set_pending(self, delta: int):
+        """Atualiza o número de chamadas em andamento e o indicador de carregamento"""
+        was_busy = self.pending > 0
+        self.pending += delta
+        if self.on_busy and was_busy != (self.pending > 0):
+            self.on_busy(self.pending > 0)
+    
+    def _show_error(self, error: Exception):
+        """Erro padrão das chamadas sem tratamento próprio"""
+        messagebox.showerror("Erro", f"Erro inesperado: {str(error)}")
+    
+    def shutdown(self):
+        """Cancela as chamadas que ainda não começaram"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+class EventListener:
+    """Recebe os eventos de alteração da API (GET /events) em uma thread
+    
+    Os eventos entram em uma fila que a thread do Tk esvazia com root.after,
+    entregando juntos os que chegaram no intervalo. Se a conexão cai, ela é
+    refeita depois de alguns segundos e um evento "connected" avisa que
+    alterações podem ter sido perdidas nesse meio tempo.
+    """
+    
+    def __init__(self, root, url: str, on_events: Callable[[List[Dict[str, Any]]], None]):
+        self.root = root
+        self.url = url
+        self.on_events = on_events
+        self.events = queue.Queue()
+        self.stopped = threading.Event()
+        # Sessão própria: a conexão do stream fica aberta o tempo todo e não
+        # deve ocupar o pool das chamadas comuns
+        self.http = requests.Session()
+        self.thread = threading.Thread(target=self._listen, name="events", daemon=True)
+        self.thread.start()
+        self.root.after(EVENTS_POLL_MS, self._drain)
+    
+    def _listen(self):
+        """Lê o stream e enfileira os eventos, reconectando após falhas"""
+        while not self.stopped.is_set():
+            try:
+                with self.http.get(self.url, stream=True, timeout=(5, EVENTS_READ_TIMEOUT)) as response:
+                    if response.status_code == 404:
+                        # API sem o stream de eventos: atualização só manual
+                        return
+                    response.raise_for_status()
+                    self.events.put({"type": "connected"})
+                    data = []
+                    for line in response.iter_lines(decode_unicode=True):
+                        if self.stopped.is_set():
+                            return
+                        if line.startswith("data:"):
+                            data.append(line[5:].strip())
+                        elif not line and data:
+                            self.events.put(json.loads("\n".join(data)))
+                            data = []
+            except (requests.RequestException, ValueError):
+                pass
+            self.stopped.wait(EVENTS_RETRY_SECONDS)
+    
+    def _drain(self):
+        """Entrega os eventos recebidos (na thread do Tk) e agenda a próxima verificação"""
+        received = []
+        try:
+            while True:
+                received.append(self.events.get_nowait())
+        except queue.Empty:
+            pass
+        if received:
+            self.on_events(received)
+        if not self.stopped.is_set():
+            self.root.after(EVENTS_POLL_MS, self._drain)
+    
+    def stop(self):
+        """Encerra a escuta (a thread termina na próxima linha ou falha)"""
+        self.stopped.set()
+        self.http.close()
+
+class LocalCache:
+    """Cópia local (SQLite) das transações e metas
+    
+    Cada atualização pede à API só as alterações desde a última versão
+    recebida (GET /transactions/changes) e as aplica aqui; listagens, páginas
+    e filtros são lidos do arquivo local. A conexão é compartilhada pelas
+    threads do pool e protegida por um lock.
+    """
+    
+    SCHEMA = [
+        """CREATE TABLE IF NOT EXISTS transactions (
+            id INTEGER PRIMARY KEY, description TEXT, amount REAL, type TEXT,
+            category TEXT, date TEXT, version INTEGER
+        )""",
+        "CREATE INDEX IF NOT EXISTS ix_transactions_date ON transactions (date, id)",
+        "CREATE TABLE IF NOT EXISTS goals (id INTEGER PRIMARY KEY, status TEXT, data TEXT)",
+        "CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value)",
+    ]
+    
+    # Filtros da listagem da API e a condição equivalente na cópia local
+    FILTERS = {
+        "transaction_type": "type = ?",
+        "category": "category = ?",
+        "date_from": "date >= ?",
+        "date_to": "date <= ?",
+        "min_amount": "amount >= ?",
+        "max_amount": "amount <= ?",
+        "description_prefix": "lower_text(description) LIKE ? ESCAPE '\\'",
+    }
+    
+    def __init__(self, path: str, http: requests.Session, base_url: str):
+        self.http = http
+        self.base_url = base_url
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        # lower() do SQLite só trata ASCII; a API compara com acentos
+        self.connection.create_function("lower_text", 1, lambda text: text.lower() if text else text,
+                                        deterministic=True)
+        with self.lock, self.connection:
+            for ddl in self.SCHEMA:
+                self.connection.execute(ddl)
+            # A cópia é de uma API só: outra URL começa do zero
+            if self._get_state("base_url") != base_url:
+                self._reset()
+                self._set_state("base_url", base_url)
+    
+    def _get_state(self, key: str, default=None):
+        row = self.connection.execute("SELECT value FROM state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+    
+    def _set_state(self, key: str, value):
+        self.connection.execute("INSERT OR REPLACE INTO state (key, value) VALUES (?, ?)", (key, value))
+    
+    def _reset(self):
+        """Descarta a cópia local; a próxima sincronização traz tudo de novo"""
+        self.connection.execute("DELETE FROM transactions")
+        self.connection.execute("DELETE FROM goals")
+        self._set_state("version", 0)
+        self._set_state("epoch", None)
+    
+    def sync(self) -> int:
+        """Aplica as alterações feitas na API desde a última sincronização
+        
+        Retorna quantos registros mudaram. Levanta requests.HTTPError se a
+        API recusar o feed (501 quando ela não oferece o feed).
+        """
+        with self.lock:
+            version = self._get_state("version", 0)
+            epoch = self._get_state("epoch")
+            applied = 0
+            while True:
+                response = self.http.get(f"{self.base_url}/transactions/changes", params={"since": version})
+                response.raise_for_status()
+                feed = response.json()
+                
+                with self.connection:
+                    if feed["epoch"] != epoch or feed["version"] < version:
+                        # Banco da API recriado (outra identidade) ou restaurado
+                        # (versões menores): a cópia local recomeça do zero
+                        epoch = feed["epoch"]
+                        if version:
+                            self._reset()
+                            self._set_state("epoch", epoch)
+                            version = 0
+                            continue
+                        self._set_state("epoch", epoch)
+                    self._apply(feed)
+                    self._set_state("version", feed["version"])
+                version = feed["version"]
+                applied += sum(len(feed[name]) for name in
+                               ("transactions", "goals", "deleted_transactions", "deleted_goals"))
+                if not feed["has_more"]:
+                    return applied
+    
+    def _apply(self, feed: Dict[str, Any]):
+        """Grava na cópia local um bloco do feed de alterações"""
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO transactions (id, description, amount, type, category, date, version) "
+            "VALUES (:id, :description, :amount, :type, :category, :date, :version)",
+            feed["transactions"]
+        )
+        self.connection.executemany(
+            "INSERT OR REPLACE INTO goals (id, status, data) VALUES (?, ?, ?)",
+            [(goal["id"], goal["status"], json.dumps(goal)) for goal in feed["goals"]]
+        )
+        self.connection.executemany("DELETE FROM transactions WHERE id = ?",
+                                    [(transaction_id,) for transaction_id in feed["deleted_transactions"]])
+        self.connection.executemany("DELETE FROM goals WHERE id = ?",
+                                    [(goal_id,) for goal_id in feed["deleted_goals"]])
+    
+    def transactions_page(self, params: Dict[str, str], after: Optional[tuple] = None):
+        """Página de transações com os filtros da listagem, ordenada por (date, id)
+        
+        Retorna as linhas e o cursor (date, id) da próxima página, ou None se
+        esta for a última.
+        """
+        conditions, values = [], []
+        for name, value in params.items():
+            conditions.append(self.FILTERS[name])
+            if name in ("min_amount", "max_amount"):
+                value = float(value)
+            elif name == "description_prefix":
+                value = value.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            values.append(value)
+        if after:
+            conditions.append("(date, id) > (?, ?)")
+            values.extend(after)
+        
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self.lock:
+            rows = self.connection.execute(
+                f"SELECT id, description, amount, type, category, date, version FROM transactions "
+                f"{where} ORDER BY date, id LIMIT ?", values + [PAGE_SIZE + 1]
+            ).fetchall()
+        rows = [dict(row) for row in rows]
+        cursor = (rows[PAGE_SIZE - 1]["date"], rows[PAGE_SIZE - 1]["id"]) if len(rows) > PAGE_SIZE else None
+        return rows[:PAGE_SIZE], cursor
+    
+    def goals(self, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Metas da cópia local, com o filtro de status da listagem"""
+        with self.lock:
+            if "status" in params:
+                rows = self.connection.execute(
+                    "SELECT data FROM goals WHERE status = ? ORDER BY id", (params["status"],)
+                ).fetchall()
+            else:
+                rows = self.connection.execute("SELECT data FROM goals ORDER BY id").fetchall()
+        return [json.loads(row[0]) for row in rows]
+    
+    def close(self):
+        with self.lock:
+            self.connection.close()
 
 class FinancesAPIInterface:
     def __init__(self, root):
@@ -23,9 +387,30 @@ class FinancesAPIInterface:
         # Variáveis para armazenar dados
         self.transactions = []
         self.goals = []
+        # Páginas de transações carregadas (linhas, ETag e cursor da próxima),
+        # filtros da listagem e valores exibidos em cada treeview
+        self.transaction_pages = []
+        self.transactions_params = {}
+        self.transactions_generation = 0
+        self.loading_more = False
+        self.shown_transactions = {}
+        self.shown_goals = {}
+        # ETag da lista de metas: se nada mudou, a API responde 304 sem corpo
+        self.goals_etag = None
+        
+        self.http = create_session()
+        # Cópia local atualizada pelo feed de alterações. Sempre criada aqui;
+        # se a API responde 501 ao feed, sync_cache (numa thread do pool) a
+        # troca por None e as listas passam a vir direto da API
+        self.cache = LocalCache(CACHE_FILE, self.http, self.base_url)
         
         self.setup_ui()
+        # Chamadas à API em segundo plano: a janela não trava esperando respostas
+        self.worker = BackgroundWorker(self.root, on_busy=self.set_loading)
         self.load_data()
+        # Atualização automática: a API avisa quando algo muda, sem consultas periódicas
+        self.events_connected = False
+        self.events = EventListener(self.root, f"{self.base_url}/events", self.on_events)
     
     def setup_ui(self):
         """Configura a interface do usuário"""
@@ -48,9 +433,13 @@ class FinancesAPIInterface:
         self.notebook.add(self.reports_frame, text="📈 Relatórios")
         self.setup_reports_tab()
         
-        # Barra de status
-        self.status_bar = ttk.Label(self.root, text="Pronto", relief='sunken')
-        self.status_bar.pack(side='bottom', fill='x')
+        # Barra de status, com indicador de carregamento
+        status_frame = ttk.Frame(self.root)
+        status_frame.pack(side='bottom', fill='x')
+        
+        self.loading = ttk.Progressbar(status_frame, mode='indeterminate', length=120)
+        self.status_bar = ttk.Label(status_frame, text="Pronto", relief='sunken')
+        self.status_bar.pack(side='left', fill='x', expand=True)
     
     def setup_transactions_tab(self):
         """Configura a aba de transações"""
@@ -112,6 +501,30 @@ class FinancesAPIInterface:
         ttk.Button(filter_frame, text="Aplicar Filtros", command=self.filter_transactions).pack(side='left', padx=5)
         ttk.Button(filter_frame, text="Limpar Filtros", command=self.clear_filters).pack(side='left', padx=5)
         
+        # Filtros por período, valor e descrição (aplicados pela API)
+        range_frame = ttk.Frame(right_frame)
+        range_frame.pack(fill='x', padx=5, pady=5)
+        
+        ttk.Label(range_frame, text="De (AAAA-MM-DD):").pack(side='left')
+        self.filter_date_from = ttk.Entry(range_frame, width=12)
+        self.filter_date_from.pack(side='left', padx=5)
+        
+        ttk.Label(range_frame, text="Até:").pack(side='left')
+        self.filter_date_to = ttk.Entry(range_frame, width=12)
+        self.filter_date_to.pack(side='left', padx=5)
+        
+        ttk.Label(range_frame, text="Valor mín.:").pack(side='left')
+        self.filter_min_amount = ttk.Entry(range_frame, width=10)
+        self.filter_min_amount.pack(side='left', padx=5)
+        
+        ttk.Label(range_frame, text="máx.:").pack(side='left')
+        self.filter_max_amount = ttk.Entry(range_frame, width=10)
+        self.filter_max_amount.pack(side='left', padx=5)
+        
+        ttk.Label(range_frame, text="Descrição começa com:").pack(side='left')
+        self.filter_description = ttk.Entry(range_frame, width=15)
+        self.filter_description.pack(side='left', padx=5)
+        
         # Treeview para transações
         columns = ('ID', 'Descrição', 'Valor', 'Tipo', 'Categoria', 'Data')
         self.transactions_tree = ttk.Treeview(right_frame, columns=columns, show='headings', height=15)
@@ -122,10 +535,11 @@ class FinancesAPIInterface:
         
         self.transactions_tree.pack(fill='both', expand=True, padx=5, pady=5)
         
-        # Scrollbar
-        scrollbar = ttk.Scrollbar(right_frame, orient='vertical', command=self.transactions_tree.yview)
-        scrollbar.pack(side='right', fill='y')
-        self.transactions_tree.configure(yscrollcommand=scrollbar.set)
+        # Scrollbar: perto do fim da lista, carrega a próxima página
+        self.transactions_scrollbar = ttk.Scrollbar(right_frame, orient='vertical',
+                                                    command=self.transactions_tree.yview)
+        self.transactions_scrollbar.pack(side='right', fill='y')
+        self.transactions_tree.configure(yscrollcommand=self.on_transactions_scroll)
         
         # Botões de ação
         action_frame = ttk.Frame(right_frame)
@@ -134,6 +548,7 @@ class FinancesAPIInterface:
         ttk.Button(action_frame, text="Atualizar Lista", command=self.load_transactions).pack(side='left', padx=5)
         ttk.Button(action_frame, text="Editar Selecionada", command=self.edit_transaction).pack(side='left', padx=5)
         ttk.Button(action_frame, text="Deletar Selecionada", command=self.delete_transaction).pack(side='left', padx=5)
+        ttk.Button(action_frame, text="Importar Extrato", command=self.import_statement).pack(side='left', padx=5)
     
     def setup_goals_tab(self):
         """Configura a aba de metas"""
@@ -235,12 +650,48 @@ class FinancesAPIInterface:
         ttk.Button(right_frame, text="Atualizar Categorias", command=self.load_category_summary).pack(pady=5)
     
     def load_data(self):
-        """Carrega dados iniciais"""
+        """Carrega dados iniciais
+        
+        As quatro consultas são independentes e vão juntas para o pool: a
+        carga inicial leva o tempo da mais lenta, não a soma de todas.
+        """
         self.load_transactions()
         self.load_goals()
         self.load_balance_summary()
         self.load_category_summary()
     
+    def on_events(self, received):
+        """Recarrega só o que mudou segundo os eventos da API
+        
+        Vários eventos juntos geram uma única atualização de cada lista; com
+        a cópia local, cada atualização traz só as alterações. Um resync, ou
+        uma reconexão, atualiza tudo: eventos podem ter sido perdidos.
+        """
+        types = {event["type"] for event in received}
+        entities = {event.get("entity") for event in received}
+        reconnected = "connected" in types and self.events_connected
+        if "connected" in types:
+            self.events_connected = True
+        
+        if "resync" in types or reconnected:
+            self.load_data()
+            return
+        if "transaction" in entities:
+            self.load_transactions()
+            self.load_balance_summary()
+            self.load_category_summary()
+        if "goal" in entities:
+            self.load_goals()
+    
+    def set_loading(self, busy):
+        """Mostra o indicador de carregamento enquanto houver chamadas em andamento"""
+        if busy:
+            self.loading.pack(side='right', padx=5)
+            self.loading.start(10)
+        else:
+            self.loading.stop()
+            self.loading.pack_forget()
+    
     def create_transaction(self):
         """Cria uma nova transação"""
         try:
@@ -250,20 +701,19 @@ class FinancesAPIInterface:
                 "type": self.transaction_type.get(),
                 "category": self.transaction_category.get()
             }
-            
-            response = requests.post(f"{self.base_url}/transactions/", json=data)
-            
+        except ValueError:
+            messagebox.showerror("Erro", "Valor deve ser um número válido!")
+            return
+        
+        def created(response):
             if response.status_code == 200:
                 messagebox.showinfo("Sucesso", "Transação criada com sucesso!")
                 self.clear_transaction_form()
                 self.load_transactions()
             else:
                 messagebox.showerror("Erro", f"Erro ao criar transação: {response.text}")
-                
-        except ValueError:
-            messagebox.showerror("Erro", "Valor deve ser um número válido!")
-        except Exception as e:
-            messagebox.showerror("Erro", f"Erro inesperado: {str(e)}")
+        
+        self.worker.submit(lambda: self.http.post(f"{self.base_url}/transactions/", json=data), created)
     
     def create_goal(self):
         """Cria uma nova meta"""
@@ -274,80 +724,235 @@ class FinancesAPIInterface:
                 "target_amount": float(self.goal_target_amount.get()),
                 "deadline": f"{self.goal_deadline.get()}T23:59:59"
             }
-            
-            response = requests.post(f"{self.base_url}/goals/", json=data)
-            
+        except ValueError:
+            messagebox.showerror("Erro", "Valor alvo deve ser um número válido!")
+            return
+        
+        def created(response):
             if response.status_code == 200:
                 messagebox.showinfo("Sucesso", "Meta criada com sucesso!")
                 self.clear_goal_form()
                 self.load_goals()
             else:
                 messagebox.showerror("Erro", f"Erro ao criar meta: {response.text}")
-                
-        except ValueError:
-            messagebox.showerror("Erro", "Valor alvo deve ser um número válido!")
-        except Exception as e:
-            messagebox.showerror("Erro", f"Erro inesperado: {str(e)}")
+        
+        self.worker.submit(lambda: self.http.post(f"{self.base_url}/goals/", json=data), created)
     
     def load_transactions(self):
-        """Carrega lista de transações"""
+        """Recarrega as transações já exibidas
+        
+        Busca de novo as páginas carregadas até aqui, com os filtros atuais;
+        a treeview recebe só as diferenças e a rolagem é mantida.
+        """
+        self.query_transactions(self.transactions_params, len(self.transaction_pages) or 1, "carregadas")
+    
+    def query_transactions(self, params, page_count, action):
+        """Agenda a busca das primeiras page_count páginas com os filtros informados"""
+        cached_pages = list(self.transaction_pages) if params == self.transactions_params else []
+        self.transactions_params = params
+        self.transactions_generation += 1
+        self.worker.submit(
+            lambda: self.fetch_transaction_pages(params, cached_pages, page_count),
+            lambda result: self.show_transactions(result, action), key="transactions"
+        )
+    
+    def sync_cache(self) -> bool:
+        """Traz para a cópia local as alterações da API (na thread do pool)
+        
+        Retorna False se não há cópia local; quando a API não oferece o feed
+        de alterações (501), a cópia é desativada e as listas vêm da API.
+        """
+        if not self.cache:
+            return False
         try:
-            response = requests.get(f"{self.base_url}/transactions/")
+            self.cache.sync()
+        except requests.HTTPError as error:
+            if error.response.status_code != 501:
+                raise
+            self.cache = None
+            return False
+        return True
+    
+    def fetch_transaction_pages(self, params, cached_pages, page_count):
+        """Busca páginas de transações (na thread do pool)
+        
+        Com a cópia local, sincroniza as alterações e lê as páginas dela.
+        Sem ela, segue o X-Next-Cursor da API: cada página vai com o ETag da
+        versão já carregada e, se a API responde 304, as linhas dessa página
+        são reaproveitadas. Retorna as páginas e a última resposta da API
+        (None com a cópia local), para o tratamento de erro.
+        """
+        if self.sync_cache():
+            return self.local_transaction_pages(params, cached_pages, page_count), None
+        
+        pages = []
+        cursor = None
+        response = None
+        for index in range(page_count):
+            page_params = dict(params, limit=PAGE_SIZE)
+            if cursor:
+                page_params["cursor"] = cursor
+            cached = cached_pages[index] if index < len(cached_pages) else None
+            headers = {"If-None-Match": cached["etag"]} if cached and cached["etag"] else {}
             
-            if response.status_code == 200:
-                self.transactions = response.json()
-                self.update_transactions_tree()
-                self.status_bar.config(text=f"Transações carregadas: {len(self.transactions)}")
+            response = self.http.get(f"{self.base_url}/transactions/", params=page_params, headers=headers)
+            if response.status_code == 304:
+                rows = cached["rows"]
+            elif response.status_code == 200:
+                rows = response.json()
             else:
+                break
+            
+            cursor = response.headers.get("X-Next-Cursor")
+            pages.append({"rows": rows, "etag": response.headers.get("ETag"), "cursor": cursor,
+                          "changed": response.status_code == 200})
+            if not cursor:
+                break
+        return pages, response
+    
+    def local_transaction_pages(self, params, cached_pages, page_count):
+        """Lê da cópia local as primeiras page_count páginas de transações"""
+        pages = []
+        cursor = None
+        for index in range(page_count):
+            rows, cursor = self.cache.transactions_page(params, cursor)
+            cached = cached_pages[index] if index < len(cached_pages) else None
+            pages.append({"rows": rows, "etag": None, "cursor": cursor,
+                          "changed": cached is None or cached["rows"] != rows})
+            if not cursor:
+                break
+        return pages
+    
+    def show_transactions(self, result, action="carregadas"):
+        """Exibe as páginas de transações recebidas"""
+        pages, response = result
+        if response is not None and response.status_code not in (200, 304):
+            messagebox.showerror("Erro", f"Erro ao carregar transações: {response.text}")
+            return
+        
+        changed = any(page["changed"] for page in pages) or len(pages) != len(self.transaction_pages)
+        self.transaction_pages = pages
+        if changed:
+            self.update_transactions_tree()
+            self.status_bar.config(text=f"Transações {action}: {self.transactions_status()}")
+        else:
+            self.status_bar.config(text=f"Transações sem alterações: {self.transactions_status()}")
+    
+    def load_more_transactions(self):
+        """Carrega a próxima página de transações (ao rolar até o fim da lista)"""
+        if self.loading_more or not self.transaction_pages or not self.transaction_pages[-1]["cursor"]:
+            return
+        
+        self.loading_more = True
+        params = self.transactions_params
+        cursor = self.transaction_pages[-1]["cursor"]
+        generation = self.transactions_generation
+        
+        def fetch():
+            if self.cache:
+                rows, next_cursor = self.cache.transactions_page(params, cursor)
+                return {"rows": rows, "etag": None, "cursor": next_cursor, "changed": True}, None
+            response = self.http.get(f"{self.base_url}/transactions/",
+                                     params=dict(params, limit=PAGE_SIZE, cursor=cursor))
+            if response.status_code != 200:
+                return None, response
+            return {"rows": response.json(), "etag": response.headers.get("ETag"),
+                    "cursor": response.headers.get("X-Next-Cursor"), "changed": True}, response
+        
+        def loaded(result):
+            self.loading_more = False
+            page, response = result
+            # Descarta a página se a lista foi recarregada ou filtrada nesse meio tempo
+            if generation != self.transactions_generation or self.transaction_pages[-1]["cursor"] != cursor:
+                return
+            if page is None:
                 messagebox.showerror("Erro", f"Erro ao carregar transações: {response.text}")
-                
-        except Exception as e:
-            messagebox.showerror("Erro", f"Erro inesperado: {str(e)}")
+                return
+            self.transaction_pages.append(page)
+            self.update_transactions_tree()
+            self.status_bar.config(text=f"Transações carregadas: {self.transactions_status()}")
+        
+        def failed(error):
+            self.loading_more = False
+            messagebox.showerror("Erro", f"Erro inesperado: {str(error)}")
+        
+        self.worker.submit(fetch, loaded, failed)
+    
+    def on_transactions_scroll(self, first, last):
+        """Atualiza a barra de rolagem e, perto do fim da lista, busca mais transações"""
+        self.transactions_scrollbar.set(first, last)
+        if float(last) >= SCROLL_LOAD_AT:
+            self.load_more_transactions()
+    
+    def transactions_status(self):
+        """Quantidade exibida e se ainda há páginas a carregar"""
+        more = self.transaction_pages and self.transaction_pages[-1]["cursor"]
+        return f"{len(self.transactions)}" + (" (role para carregar mais)" if more else "")
     
     def load_goals(self):
         """Carrega lista de metas"""
-        try:
-            response = requests.get(f"{self.base_url}/goals/")
-            
-            if response.status_code == 200:
-                self.goals = response.json()
-                self.update_goals_tree()
-                self.status_bar.config(text=f"Metas carregadas: {len(self.goals)}")
-            else:
-                messagebox.showerror("Erro", f"Erro ao carregar metas: {response.text}")
-                
-        except Exception as e:
-            messagebox.showerror("Erro", f"Erro inesperado: {str(e)}")
+        self.query_goals({}, "carregadas")
     
-    def update_transactions_tree(self):
-        """Atualiza a treeview de transações"""
-        # Limpa a treeview
-        for item in self.transactions_tree.get_children():
-            self.transactions_tree.delete(item)
+    def query_goals(self, params, action):
+        """Agenda a busca das metas com o filtro informado"""
+        etag = self.goals_etag if not params else None
+        self.worker.submit(
+            lambda: self.fetch_goals(params, etag),
+            lambda result: self.show_goals(result, action), key="goals"
+        )
+    
+    def fetch_goals(self, params, etag):
+        """Metas da cópia local ou, sem ela, da API (na thread do pool)
+        
+        Retorna as metas (None se a API respondeu 304) e a resposta da API
+        (None com a cópia local).
+        """
+        if self.sync_cache():
+            return self.cache.goals(params), None
         
-        # Adiciona os dados
+        headers = {"If-None-Match": etag} if etag else {}
+        response = self.http.get(f"{self.base_url}/goals/", params=params, headers=headers)
+        return (response.json() if response.status_code == 200 else None), response
+    
+    def show_goals(self, result, action="carregadas"):
+        """Exibe a lista de metas recebida"""
+        goals, response = result
+        if response is not None and response.status_code not in (200, 304):
+            messagebox.showerror("Erro", f"Erro ao carregar metas: {response.text}")
+            return
+        if response is not None:
+            self.goals_etag = response.headers.get("ETag")
+        
+        if goals is None or goals == self.goals:
+            self.status_bar.config(text=f"Metas sem alterações: {len(self.goals)}")
+            return
+        self.goals = goals
+        self.update_goals_tree()
+        self.status_bar.config(text=f"Metas {action}: {len(self.goals)}")
+    
+    def update_transactions_tree(self):
+        """Atualiza a treeview de transações com as páginas carregadas"""
+        self.transactions = [transaction for page in self.transaction_pages for transaction in page["rows"]]
+        rows = []
         for transaction in self.transactions:
             date = transaction['date'][:10] if transaction['date'] else "N/A"
-            self.transactions_tree.insert('', 'end', values=(
+            rows.append((transaction['id'], (
                 transaction['id'],
                 transaction['description'],
                 f"R$ {transaction['amount']:.2f}",
                 transaction['type'],
                 transaction['category'],
                 date
-            ))
+            )))
+        sync_tree(self.transactions_tree, self.shown_transactions, rows)
     
     def update_goals_tree(self):
         """Atualiza a treeview de metas"""
-        # Limpa a treeview
-        for item in self.goals_tree.get_children():
-            self.goals_tree.delete(item)
-        
-        # Adiciona os dados
+        rows = []
         for goal in self.goals:
             progress = (goal['current_amount'] / goal['target_amount']) * 100 if goal['target_amount'] > 0 else 0
             deadline = goal['deadline'][:10] if goal['deadline'] else "N/A"
-            self.goals_tree.insert('', 'end', values=(
+            rows.append((goal['id'], (
                 goal['id'],
                 goal['title'],
                 f"R$ {goal['target_amount']:.2f}",
@@ -355,53 +960,57 @@ class FinancesAPIInterface:
                 f"{progress:.1f}%",
                 goal['status'],
                 deadline
-            ))
+            )))
+        sync_tree(self.goals_tree, self.shown_goals, rows)
     
     def filter_transactions(self):
-        """Filtra transações"""
+        """Filtra transações
+        
+        Usa a mesma chave da listagem: cliques repetidos substituem a busca
+        anterior e só o resultado do último filtro é exibido.
+        """
+        params = {}
+        if self.filter_type.get() != "Todos":
+            params['transaction_type'] = self.filter_type.get()
+        if self.filter_category.get() != "Todas":
+            params['category'] = self.filter_category.get()
+        if self.filter_date_from.get().strip():
+            params['date_from'] = f"{self.filter_date_from.get().strip()}T00:00:00"
+        if self.filter_date_to.get().strip():
+            params['date_to'] = f"{self.filter_date_to.get().strip()}T23:59:59"
+        if self.filter_min_amount.get().strip():
+            params['min_amount'] = self.filter_min_amount.get().strip().replace(",", ".")
+        if self.filter_max_amount.get().strip():
+            params['max_amount'] = self.filter_max_amount.get().strip().replace(",", ".")
+        if self.filter_description.get().strip():
+            params['description_prefix'] = self.filter_description.get().strip()
+        
         try:
-            params = {}
-            if self.filter_type.get() != "Todos":
-                params['transaction_type'] = self.filter_type.get()
-            if self.filter_category.get() != "Todas":
-                params['category'] = self.filter_category.get()
-            
-            response = requests.get(f"{self.base_url}/transactions/", params=params)
-            
-            if response.status_code == 200:
-                self.transactions = response.json()
-                self.update_transactions_tree()
-                self.status_bar.config(text=f"Transações filtradas: {len(self.transactions)}")
-            else:
-                messagebox.showerror("Erro", f"Erro ao filtrar transações: {response.text}")
-                
-        except Exception as e:
-            messagebox.showerror("Erro", f"Erro inesperado: {str(e)}")
+            for name in ('min_amount', 'max_amount'):
+                if name in params:
+                    float(params[name])
+        except ValueError:
+            messagebox.showerror("Erro", "Valor deve ser um número válido!")
+            return
+        
+        self.query_transactions(params, 1, "filtradas")
     
     def filter_goals(self):
         """Filtra metas"""
-        try:
-            params = {}
-            if self.filter_status.get() != "Todas":
-                params['status'] = self.filter_status.get()
-            
-            response = requests.get(f"{self.base_url}/goals/", params=params)
-            
-            if response.status_code == 200:
-                self.goals = response.json()
-                self.update_goals_tree()
-                self.status_bar.config(text=f"Metas filtradas: {len(self.goals)}")
-            else:
-                messagebox.showerror("Erro", f"Erro ao filtrar metas: {response.text}")
-                
-        except Exception as e:
-            messagebox.showerror("Erro", f"Erro inesperado: {str(e)}")
+        params = {}
+        if self.filter_status.get() != "Todas":
+            params['status'] = self.filter_status.get()
+        
+        self.query_goals(params, "filtradas")
     
     def clear_filters(self):
         """Limpa filtros de transações"""
         self.filter_type.set("Todos")
         self.filter_category.set("Todas")
-        self.load_transactions()
+        for entry in (self.filter_date_from, self.filter_date_to, self.filter_min_amount,
+                      self.filter_max_amount, self.filter_description):
+            entry.delete(0, tk.END)
+        self.query_transactions({}, 1, "carregadas")
     
     def clear_goal_filters(self):
         """Limpa filtros de metas"""
@@ -434,27 +1043,82 @@ class FinancesAPIInterface:
         messagebox.showinfo("Info", "Funcionalidade de edição será implementada!")
     
     def delete_transaction(self):
-        """Deleta transação selecionada"""
+        """Deleta as transações selecionadas em uma única requisição"""
         selection = self.transactions_tree.selection()
         if not selection:
             messagebox.showwarning("Aviso", "Selecione uma transação para deletar!")
             return
         
-        item = self.transactions_tree.item(selection[0])
-        transaction_id = item['values'][0]
+        transaction_ids = [self.transactions_tree.item(item)['values'][0] for item in selection]
+        if len(transaction_ids) == 1:
+            question = f"Deletar transação ID {transaction_ids[0]}?"
+        else:
+            question = f"Deletar {len(transaction_ids)} transações selecionadas?"
         
-        if messagebox.askyesno("Confirmar", f"Deletar transação ID {transaction_id}?"):
-            try:
-                response = requests.delete(f"{self.base_url}/transactions/{transaction_id}")
-                
-                if response.status_code == 200:
-                    messagebox.showinfo("Sucesso", "Transação deletada com sucesso!")
-                    self.load_transactions()
-                else:
-                    messagebox.showerror("Erro", f"Erro ao deletar transação: {response.text}")
-                    
-            except Exception as e:
-                messagebox.showerror("Erro", f"Erro inesperado: {str(e)}")
+        if not messagebox.askyesno("Confirmar", question):
+            return
+        
+        def deleted(response):
+            if response.status_code == 200:
+                messagebox.showinfo("Sucesso", response.json()["message"])
+                self.load_transactions()
+            else:
+                messagebox.showerror("Erro", f"Erro ao deletar transação: {response.text}")
+        
+        params = {"ids": ",".join(map(str, transaction_ids))}
+        self.worker.submit(lambda: self.http.delete(f"{self.base_url}/transactions", params=params), deleted)
+    
+    def import_statement(self):
+        """Envia um extrato CSV/OFX para importação em segundo plano"""
+        path = filedialog.askopenfilename(
+            title="Importar Extrato",
+            filetypes=[("Extratos", "*.csv *.ofx"), ("CSV", "*.csv"), ("OFX", "*.ofx")]
+        )
+        if not path:
+            return
+        
+        statement_format = "ofx" if path.lower().endswith(".ofx") else "csv"
+        
+        def upload():
+            with open(path, "rb") as file:
+                return self.http.post(
+                    f"{self.base_url}/transactions/import", params={"format": statement_format}, data=file
+                )
+        
+        def uploaded(response):
+            if response.status_code == 202:
+                self.status_bar.config(text=f"Importando {os.path.basename(path)}...")
+                self.root.after(500, self.check_import_job, response.json()["id"])
+            else:
+                messagebox.showerror("Erro", f"Erro ao importar extrato: {response.text}")
+        
+        self.status_bar.config(text=f"Enviando {os.path.basename(path)}...")
+        self.worker.submit(upload, uploaded)
+    
+    def check_import_job(self, job_id):
+        """Acompanha a importação sem travar a interface"""
+        self.worker.submit(
+            lambda: self.http.get(f"{self.base_url}/transactions/import/{job_id}").json(),
+            lambda job: self.show_import_job(job_id, job)
+        )
+    
+    def show_import_job(self, job_id, job):
+        """Mostra o andamento da importação e, ao terminar, o resultado"""
+        if job["status"] in ("pendente", "processando"):
+            self.status_bar.config(text=f"Importando extrato... {job['rows_read']} lançamentos lidos")
+            self.root.after(500, self.check_import_job, job_id)
+            return
+        
+        summary = (
+            f"Importadas: {job['imported']}\n"
+            f"Já existentes: {job['duplicates']}\n"
+            f"Com erro: {job['error_count']}"
+        )
+        if job["status"] == "erro":
+            messagebox.showerror("Erro", f"Erro ao importar extrato: {job['message']}\n\n{summary}")
+        else:
+            messagebox.showinfo("Sucesso", f"Extrato importado!\n\n{summary}")
+        self.load_transactions()
     
     def edit_goal(self):
         """Edita meta selecionada"""
@@ -476,18 +1140,17 @@ class FinancesAPIInterface:
         item = self.goals_tree.item(selection[0])
         goal_id = item['values'][0]
         
-        if messagebox.askyesno("Confirmar", f"Deletar meta ID {goal_id}?"):
-            try:
-                response = requests.delete(f"{self.base_url}/goals/{goal_id}")
-                
-                if response.status_code == 200:
-                    messagebox.showinfo("Sucesso", "Meta deletada com sucesso!")
-                    self.load_goals()
-                else:
-                    messagebox.showerror("Erro", f"Erro ao deletar meta: {response.text}")
-                    
-            except Exception as e:
-                messagebox.showerror("Erro", f"Erro inesperado: {str(e)}")
+        if not messagebox.askyesno("Confirmar", f"Deletar meta ID {goal_id}?"):
+            return
+        
+        def deleted(response):
+            if response.status_code == 200:
+                messagebox.showinfo("Sucesso", "Meta deletada com sucesso!")
+                self.load_goals()
+            else:
+                messagebox.showerror("Erro", f"Erro ao deletar meta: {response.text}")
+        
+        self.worker.submit(lambda: self.http.delete(f"{self.base_url}/goals/{goal_id}"), deleted)
     
     def add_goal_progress(self):
         """Adiciona progresso à meta selecionada"""
@@ -508,37 +1171,42 @@ class FinancesAPIInterface:
         amount_entry.pack(pady=5)
         amount_entry.focus()
         
+        def added(response):
+            if response.status_code == 200:
+                messagebox.showinfo("Sucesso", "Progresso adicionado com sucesso!")
+                self.load_goals()
+                dialog.destroy()
+            else:
+                messagebox.showerror("Erro", f"Erro ao adicionar progresso: {response.text}")
+        
         def confirm():
             try:
                 amount = float(amount_entry.get())
-                item = self.goals_tree.item(selection[0])
-                goal_id = item['values'][0]
-                
-                response = requests.put(f"{self.base_url}/goals/{goal_id}/progress?amount={amount}")
-                
-                if response.status_code == 200:
-                    messagebox.showinfo("Sucesso", "Progresso adicionado com sucesso!")
-                    self.load_goals()
-                    dialog.destroy()
-                else:
-                    messagebox.showerror("Erro", f"Erro ao adicionar progresso: {response.text}")
-                    
             except ValueError:
                 messagebox.showerror("Erro", "Valor deve ser um número válido!")
-            except Exception as e:
-                messagebox.showerror("Erro", f"Erro inesperado: {str(e)}")
+                return
+            
+            item = self.goals_tree.item(selection[0])
+            goal_id = item['values'][0]
+            self.worker.submit(
+                lambda: self.http.put(f"{self.base_url}/goals/{goal_id}/progress", params={"amount": amount}), added
+            )
         
         ttk.Button(dialog, text="Confirmar", command=confirm).pack(pady=10)
         ttk.Button(dialog, text="Cancelar", command=dialog.destroy).pack(pady=5)
     
     def load_balance_summary(self):
         """Carrega resumo de saldo"""
-        try:
-            response = requests.get(f"{self.base_url}/transactions/summary/balance")
-            
-            if response.status_code == 200:
-                data = response.json()
-                summary = f"""RESUMO DE SALDO
+        self.worker.submit(
+            lambda: self.http.get(f"{self.base_url}/transactions/summary/balance"),
+            self.show_balance_summary, self.show_balance_error, key="balance"
+        )
+    
+    def show_balance_summary(self, response):
+        """Exibe o resumo de saldo recebido da API"""
+        if response.status_code == 200:
+            data = response.json()
+            summary = f"""RESUMO DE SALDO
 
 Total de Receitas: R$ {data['total_receitas']:.2f}
 Total de Despesas: R$ {data['total_despesas']:.2f}
@@ -546,54 +1214,67 @@ Saldo: R$ {data['saldo']:.2f}
 
 Status: {'✅ Positivo' if data['saldo'] >= 0 else '❌ Negativo'}
 """
-                self.balance_text.delete(1.0, tk.END)
-                self.balance_text.insert(1.0, summary)
-            else:
-                self.balance_text.delete(1.0, tk.END)
-                self.balance_text.insert(1.0, f"Erro ao carregar resumo: {response.text}")
-                
-        except Exception as e:
             self.balance_text.delete(1.0, tk.END)
-            self.balance_text.insert(1.0, f"Erro inesperado: {str(e)}")
+            self.balance_text.insert(1.0, summary)
+        else:
+            self.balance_text.delete(1.0, tk.END)
+            self.balance_text.insert(1.0, f"Erro ao carregar resumo: {response.text}")
+    
+    def show_balance_error(self, error):
+        """Mostra no quadro de saldo a falha na chamada"""
+        self.balance_text.delete(1.0, tk.END)
+        self.balance_text.insert(1.0, f"Erro inesperado: {str(error)}")
     
     def load_category_summary(self):
         """Carrega resumo por categoria"""
-        try:
-            response = requests.get(f"{self.base_url}/transactions/summary/category")
+        self.worker.submit(
+            lambda: self.http.get(f"{self.base_url}/transactions/summary/category"),
+            self.show_category_summary, self.show_category_error, key="categories"
+        )
+    
+    def show_category_summary(self, response):
+        """Exibe o resumo por categoria recebido da API"""
+        if response.status_code == 200:
+            data = response.json()
+            summary = "RESUMO POR CATEGORIA\n\n"
             
-            if response.status_code == 200:
-                data = response.json()
-                summary = "RESUMO POR CATEGORIA\n\n"
-                
-                for category in data:
-                    summary += f"{category['category'].upper()}:\n"
-                    summary += f"  Total: R$ {category['total_amount']:.2f}\n"
-                    summary += f"  Transações: {category['transaction_count']}\n\n"
-                
-                self.category_text.delete(1.0, tk.END)
-                self.category_text.insert(1.0, summary)
-            else:
-                self.category_text.delete(1.0, tk.END)
-                self.category_text.insert(1.0, f"Erro ao carregar categorias: {response.text}")
-                
-        except Exception as e:
+            for category in data:
+                summary += f"{category['category'].upper()}:\n"
+                summary += f"  Total: R$ {category['total_amount']:.2f}\n"
+                summary += f"  Transações: {category['transaction_count']}\n\n"
+            
+            self.category_text.delete(1.0, tk.END)
+            self.category_text.insert(1.0, summary)
+        else:
             self.category_text.delete(1.0, tk.END)
-            self.category_text.insert(1.0, f"Erro inesperado: {str(e)}")
+            self.category_text.insert(1.0, f"Erro ao carregar categorias: {response.text}")
+    
+    def show_category_error(self, error):
+        """Mostra no quadro de categorias a falha na chamada"""
+        self.category_text.delete(1.0, tk.END)
+        self.category_text.insert(1.0, f"Erro inesperado: {str(error)}")
 
 def main():
     """Função principal"""
     root = tk.Tk()
     app = FinancesAPIInterface(root)
     
-    # Verificar se a API está rodando
-    try:
-        response = requests.get("http://localhost:8000/")
+    # Verificar se a API está rodando (também em segundo plano)
+    def checked(response):
         if response.status_code != 200:
             messagebox.showwarning("Aviso", "API não está respondendo!\nCertifique-se de que o servidor está rodando.")
-    except:
+    
+    def unreachable(error):
         messagebox.showwarning("Aviso", "Não foi possível conectar à API!\nCertifique-se de que o servidor está rodando em http://localhost:8000")
     
+    app.worker.submit(lambda: app.http.get(f"{app.base_url}/"), checked, unreachable)
+    
     root.mainloop()
+    app.events.stop()
+    app.worker.shutdown()
+    if app.cache:
+        app.cache.close()
+    app.http.close()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
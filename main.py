@@ -1,18 +1,43 @@
 # main.py
-from fastapi import FastAPI, Depends, HTTPException, Query
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response, BackgroundTasks
 from typing import List, Optional
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import func
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.routing import APIRoute
+from collections import Counter
+from contextlib import contextmanager
+from sqlalchemy import Integer, bindparam, func, text, tuple_
+from sqlalchemy.orm.exc import StaleDataError
 from sqlmodel import select, Session
 from datetime import datetime
-from pydantic import parse_obj_as
+from decimal import Decimal
+from enum import Enum
+from pydantic import parse_obj_as, ValidationError
+import csv
+import io
+import json
 
-from database import create_db_and_tables, get_session
+from database import create_db_and_tables, get_session, database_async, engine
 from models.transaction import (
     Transaction, TransactionCreate, TransactionUpdate, TransactionResponse, 
-    TransactionSummary, TransactionType, Category
+    TransactionSummary, Category, BalanceSummary,
+    TransactionTimeSeries, TimeBucket, ExportFormat,
+    TransactionBulkError, TransactionBulkResult,
+    StatementFormat, ImportStatus, TransactionImportJob,
+    TransactionIds, TransactionBatchUpdate
 )
 from models.goal import Goal, GoalCreate, GoalUpdate, GoalResponse, GoalStatus
+from models.changes import ChangeFeed
+from models.money import Amount, Money
+from aggregates import update_aggregates
+import cache
+import changes
+import events
+import importers
+import queries
+import search
+import serialization
 
 # Configuração da aplicação
 app = FastAPI(
@@ -20,6 +45,8 @@ app = FastAPI(
     description="Sistema de gestão financeira pessoal com controle de transações e metas",
     version="1.0.0"
 )
+# No modo de respostas rápidas (FAST_RESPONSES), as rotas serializam com orjson
+app.router.route_class = serialization.route_class
 
 # Configuração CORS
 app.add_middleware(
@@ -28,8 +55,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Next-Offset", "ETag"],
 )
 
+# Tamanho dos lotes usados na importação em massa (linhas por executemany)
+BULK_INSERT_CHUNK_SIZE = 5000
+
+# Linhas lidas do cursor e enviadas por bloco na exportação
+EXPORT_CHUNK_SIZE = 1000
+EXPORT_COLUMNS = ["id", "date", "description", "amount", "type", "category"]
+
+# Lançamentos do extrato validados e inseridos por lote na importação
+IMPORT_BATCH_SIZE = 1000
+
 # Evento de inicialização
 @app.on_event("startup")
 def on_startup():
@@ -57,128 +95,566 @@ def create_transaction(
     """Criar uma nova transação"""
     db_transaction = Transaction.from_orm(transaction)
     session.add(db_transaction)
+    update_aggregates(session, added=[db_transaction])
     session.commit()
-    session.refresh(db_transaction)
+    events.publish("transaction", "created", [db_transaction.id])
     return db_transaction
 
+async def _iter_ndjson_lines(request: Request):
+    """Lê o corpo da requisição de forma incremental, uma linha por vez"""
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line
+    yield buffer
+
+def _validate_bulk_item(item, index, rows, errors):
+    """Valida uma linha da importação, acumulando a linha válida ou o erro"""
+    try:
+        rows.append(TransactionCreate.parse_obj(item).dict())
+    except ValidationError as e:
+        errors.append(TransactionBulkError(index=index, errors=e.errors()))
+
+def _bulk_insert_transactions(session: Session, rows: List[dict]) -> List[int]:
+    """Insere as linhas em lotes (executemany) numa única transação e retorna os ids"""
+    table = Transaction.__table__
+    dialect = session.get_bind().dialect
+    ids = []
+    for start in range(0, len(rows), BULK_INSERT_CHUNK_SIZE):
+        chunk = rows[start:start + BULK_INSERT_CHUNK_SIZE]
+        if dialect.insert_executemany_returning:
+            # PostgreSQL (psycopg2): o próprio INSERT em lote devolve os ids
+            ids.extend(session.execute(table.insert().returning(table.c.id), chunk).scalars())
+        elif dialect.name == "sqlite":
+            session.execute(table.insert(), chunk)
+            # No SQLite as escritas são serializadas e os ids são alocados a partir
+            # do maior id existente, então as linhas do lote têm ids consecutivos
+            last_id = session.exec(select(func.max(Transaction.id))).one()
+            ids.extend(range(last_id - len(chunk) + 1, last_id + 1))
+        else:
+            # Outros bancos: sequências com cache e inserções simultâneas não
+            # garantem ids consecutivos, então cada linha informa o seu
+            ids.extend(session.execute(table.insert(), row).inserted_primary_key[0] for row in chunk)
+    update_aggregates(session, added=rows)
+    session.commit()
+    events.publish("transaction", "created", ids)
+    return ids
+
+@app.post(
+    "/transactions/bulk",
+    response_model=TransactionBulkResult,
+    tags=["Transações"],
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {"type": "array", "items": {"$ref": "#/components/schemas/TransactionCreate"}}
+                },
+                "application/x-ndjson": {
+                    "schema": {"$ref": "#/components/schemas/TransactionCreate"}
+                },
+            },
+        }
+    },
+)
+async def create_transactions_bulk(
+    *,
+    session: Session = Depends(get_session),
+    request: Request
+):
+    """Criar transações em lote a partir de uma lista JSON ou de um fluxo NDJSON"""
+    rows, errors = [], []
+    
+    if "ndjson" in request.headers.get("content-type", ""):
+        index = 0
+        async for line in _iter_ndjson_lines(request):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+            except ValueError:
+                errors.append(TransactionBulkError(
+                    index=index, errors=[{"loc": [], "msg": "JSON inválido", "type": "value_error.json"}]
+                ))
+            else:
+                _validate_bulk_item(item, index, rows, errors)
+            index += 1
+    else:
+        try:
+            items = await request.json()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Corpo da requisição deve ser JSON válido")
+        if not isinstance(items, list):
+            raise HTTPException(status_code=422, detail="O corpo deve ser uma lista de transações")
+        for index, item in enumerate(items):
+            _validate_bulk_item(item, index, rows, errors)
+    
+    ids = await run_in_threadpool(_bulk_insert_transactions, session, rows) if rows else []
+    return TransactionBulkResult(inserted=len(ids), ids=ids, errors=errors)
+
 @app.get("/transactions/", response_model=List[TransactionResponse], tags=["Transações"])
 def read_transactions(
     *, 
     session: Session = Depends(get_session), 
+    request: Request,
+    response: Response,
     offset: int = 0, 
-    limit: int = Query(default=100, le=100),
-    transaction_type: Optional[TransactionType] = None,
-    category: Optional[Category] = None
+    limit: int = Query(default=100, ge=1, le=100),
+    cursor: Optional[str] = Query(default=None, description="Cursor retornado no header X-Next-Cursor"),
+    filters: queries.TransactionFilters = Depends(),
+    fields: Optional[str] = Query(default=None, description="Campos retornados, separados por vírgula (ex.: id,date,amount)")
 ):
-    """Listar transações com filtros opcionais"""
-    statement = select(Transaction).offset(offset).limit(limit)
+    """Listar transações com filtros opcionais, ordenadas por data e id
     
-    if transaction_type:
-        statement = statement.where(Transaction.type == transaction_type)
+    Para paginar, envie o valor do header X-Next-Cursor da página anterior
+    no parâmetro cursor: o custo de cada página independe da sua posição.
+    Com fields, só as colunas pedidas são lidas e serializadas.
+    """
+    if fields:
+        names = queries.parse_fields(fields)
+        statement = queries.transactions_statement(limit, offset, cursor, filters, names)
+        rows = queries.paginate(session.exec(statement).all(), limit, response)
+        return serialization.rows_response(request, response, rows, names)
     
-    if category:
-        statement = statement.where(Transaction.category == category)
+    statement = queries.transactions_statement(limit, offset, cursor, filters)
+    transactions = queries.paginate(session.exec(statement).all(), limit, response)
+    not_modified = cache.not_modified(request, response, cache.collection_etag(transactions))
+    if not_modified:
+        return not_modified
+    return transactions
+
+def _export_value(value):
+    """Converte um valor da linha para texto/JSON na exportação"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+def _export_chunks(statement, export_format: ExportFormat):
+    """Gera o arquivo exportado em blocos, lendo as linhas por um cursor no servidor
+    
+    Só um bloco de linhas fica em memória por vez, qualquer que seja o
+    tamanho da tabela. A conexão é aberta aqui porque o gerador continua
+    rodando depois que a função do endpoint retorna.
+    """
+    with engine.connect() as connection:
+        result = connection.execution_options(stream_results=True).execute(statement)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        
+        if export_format == ExportFormat.csv:
+            writer.writerow(EXPORT_COLUMNS)
+        
+        for rows in result.partitions(EXPORT_CHUNK_SIZE):
+            for row in rows:
+                values = [_export_value(value) for value in row]
+                if export_format == ExportFormat.csv:
+                    writer.writerow(values)
+                else:
+                    buffer.write(json.dumps(dict(zip(EXPORT_COLUMNS, values)), ensure_ascii=False))
+                    buffer.write("\n")
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
         
-    transactions = session.exec(statement).all()
+        if buffer.tell():
+            yield buffer.getvalue()
+
+@app.get("/transactions/export", tags=["Transações"])
+def export_transactions(
+    *,
+    export_format: ExportFormat = Query(default=ExportFormat.csv, alias="format"),
+    filters: queries.TransactionFilters = Depends()
+):
+    """Exportar todas as transações em CSV ou NDJSON, em fluxo contínuo"""
+    statement = queries.export_statement(EXPORT_COLUMNS, filters)
+    media_types = {
+        ExportFormat.csv: "text/csv; charset=utf-8",
+        ExportFormat.ndjson: "application/x-ndjson",
+    }
+    return StreamingResponse(
+        _export_chunks(statement, export_format),
+        media_type=media_types[export_format],
+        headers={"Content-Disposition": f'attachment; filename="transactions.{export_format.value}"'}
+    )
+
+@app.get("/transactions/search", response_model=List[TransactionResponse], tags=["Transações"])
+def search_transactions(
+    *,
+    session: Session = Depends(get_session),
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, description="Termos buscados na descrição"),
+    offset: int = 0,
+    limit: int = Query(default=20, ge=1, le=100),
+    filters: queries.TransactionFilters = Depends()
+):
+    """Buscar transações pela descrição, das mais relevantes para as menos
+    
+    Encontra as transações com todos os termos (ou palavras que começam com
+    eles), sem diferenciar maiúsculas. Com o índice FTS5 (SQLite) também
+    ignora acentos; sem ele, os acentos precisam coincidir. Para paginar,
+    envie o valor do header X-Next-Offset no parâmetro offset.
+    """
+    statement = search.search_statement(q, limit, offset, filters)
+    transactions = search.paginate(session.exec(statement).all(), limit, offset, response)
+    not_modified = cache.not_modified(request, response, cache.collection_etag(transactions))
+    if not_modified:
+        return not_modified
     return transactions
 
+@app.get("/transactions/changes", response_model=ChangeFeed, tags=["Transações"])
+def read_changes(
+    *,
+    session: Session = Depends(get_session),
+    since: int = Query(default=0, ge=0, le=changes.MAX_VERSION, description="Versão recebida na chamada anterior (0 na primeira)"),
+    limit: int = Query(default=changes.CHANGES_PAGE_SIZE, ge=1, le=changes.CHANGES_PAGE_SIZE)
+):
+    """Alterações em transações e metas desde uma versão (sincronização incremental)
+    
+    Traz os registros criados ou alterados e os ids dos apagados depois de
+    since. Envie o version da resposta no since da próxima chamada; com
+    has_more, chame de novo logo em seguida. Um version menor que o since
+    enviado indica que o banco foi recriado: o cliente deve descartar a sua
+    cópia e sincronizar de novo a partir de 0.
+    """
+    if not changes.changes_enabled:
+        raise HTTPException(status_code=501, detail="Feed de alterações disponível apenas com SQLite")
+    return changes.read_changes(session, since, limit)
+
+def _import_key(row: dict):
+    """Chave usada para reconhecer um lançamento já existente"""
+    return (row["date"], row["amount"], row["description"])
+
+def _existing_counts(session: Session, keys) -> Counter:
+    """Quantas transações já existem no banco para cada chave do lote"""
+    statement = (
+        select(Transaction.date, Transaction.amount, Transaction.description, func.count())
+        .where(tuple_(Transaction.date, Transaction.amount, Transaction.description).in_(list(keys)))
+        .group_by(Transaction.date, Transaction.amount, Transaction.description)
+    )
+    return Counter({
+        (date, amount, description): count
+        for date, amount, description, count in session.exec(statement)
+    })
+
+def _import_batch(session: Session, job: TransactionImportJob, batch: List[tuple], seen: Counter, existing: Counter):
+    """Descarta os lançamentos já existentes e insere o restante do lote
+
+    Um mesmo lançamento pode aparecer legitimamente mais de uma vez no
+    extrato, então a comparação é por contagem: a n-ésima ocorrência só é
+    duplicada se o banco já tinha n ocorrências antes da importação.
+    """
+    new_keys = {key for key, _ in batch if key not in existing}
+    if new_keys:
+        existing.update(_existing_counts(session, new_keys))
+        for key in new_keys:
+            existing.setdefault(key, 0)
+
+    rows = []
+    for key, row in batch:
+        seen[key] += 1
+        if seen[key] > existing[key]:
+            rows.append(row)
+        else:
+            job.duplicates += 1
+
+    if rows:
+        _bulk_insert_transactions(session, rows)
+        job.imported += len(rows)
+
+def _run_import_job(job: TransactionImportJob, path: str):
+    """Processa um extrato em segundo plano, lote a lote
+
+    Cada lote é gravado em sua própria transação: se a importação falhar no
+    meio, os lotes anteriores continuam no banco e o status informa o erro.
+    """
+    job.status = ImportStatus.processando
+    seen, existing = Counter(), {}
+    try:
+        with Session(engine, expire_on_commit=False) as session:
+            batch = []
+            for number, item in importers.parse_statement(path, job.format):
+                job.rows_read += 1
+                try:
+                    row = TransactionCreate.parse_obj(item).dict()
+                except ValidationError as e:
+                    importers.add_error(job, number, e.errors())
+                    continue
+                batch.append((_import_key(row), row))
+                if len(batch) >= IMPORT_BATCH_SIZE:
+                    _import_batch(session, job, batch, seen, existing)
+                    batch = []
+            if batch:
+                _import_batch(session, job, batch, seen, existing)
+        job.status = ImportStatus.concluida
+    except Exception as e:
+        job.status = ImportStatus.erro
+        job.message = str(e)
+    finally:
+        job.finished_at = datetime.now()
+        importers.remove_upload(path)
+
+@app.post("/transactions/import", response_model=TransactionImportJob, status_code=202, tags=["Transações"])
+async def import_transactions(
+    *,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    statement_format: StatementFormat = Query(default=StatementFormat.csv, alias="format")
+):
+    """Importar um extrato bancário (CSV ou OFX) em segundo plano
+
+    O arquivo vai no corpo da requisição e é gravado em disco à medida que
+    chega; a leitura, a remoção de lançamentos já existentes e a gravação
+    em lotes acontecem depois da resposta. Acompanhe o andamento em
+    GET /transactions/import/{job_id}.
+    """
+    path = await importers.save_upload(request.stream())
+    job = importers.create_job(statement_format)
+    background_tasks.add_task(_run_import_job, job, path)
+    return job
+
+@app.get("/transactions/import/{job_id}", response_model=TransactionImportJob, tags=["Transações"])
+def read_import_job(job_id: str):
+    """Consultar o andamento de uma importação de extrato"""
+    job = importers.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Importação não encontrada")
+    return job
+
 @app.get("/transactions/{transaction_id}", response_model=TransactionResponse, tags=["Transações"])
 def read_transaction(
     *, 
     session: Session = Depends(get_session), 
+    request: Request,
+    response: Response,
     transaction_id: int
 ):
     """Buscar uma transação específica"""
     transaction = session.get(Transaction, transaction_id)
     if not transaction:
         raise HTTPException(status_code=404, detail="Transação não encontrada")
+    
+    not_modified = cache.not_modified(request, response, cache.resource_etag(transaction))
+    if not_modified:
+        return not_modified
     return transaction
 
+@contextmanager
+def _versioned_write(session: Session):
+    """Converte o conflito de versão do ORM em 412
+    
+    O UPDATE/DELETE só afeta a linha se a versão ainda for a lida; se outra
+    requisição alterou a linha nesse meio-tempo, nada é gravado.
+    """
+    try:
+        yield
+    except StaleDataError:
+        session.rollback()
+        raise HTTPException(status_code=412, detail="O recurso foi alterado por outra requisição")
+
 @app.put("/transactions/{transaction_id}", response_model=TransactionResponse, tags=["Transações"])
 def update_transaction(
     *, 
     session: Session = Depends(get_session), 
+    request: Request,
+    response: Response,
     transaction_id: int, 
     transaction: TransactionUpdate
 ):
-    """Atualizar uma transação"""
+    """Atualizar uma transação (aceita If-Match com o ETag da versão lida)"""
     db_transaction = session.get(Transaction, transaction_id)
     if not db_transaction:
         raise HTTPException(status_code=404, detail="Transação não encontrada")
+    cache.check_if_match(request, cache.resource_etag(db_transaction))
     
+    previous = db_transaction.dict()
     transaction_data = transaction.dict(exclude_unset=True)
     for key, value in transaction_data.items():
         setattr(db_transaction, key, value)
     
-    session.add(db_transaction)
-    session.commit()
-    session.refresh(db_transaction)
+    with _versioned_write(session):
+        session.add(db_transaction)
+        session.flush()
+        update_aggregates(session, added=[db_transaction], removed=[previous])
+        session.commit()
+    events.publish("transaction", "updated", [transaction_id])
+    response.headers["ETag"] = cache.resource_etag(db_transaction)
     return db_transaction
 
 @app.delete("/transactions/{transaction_id}", tags=["Transações"])
 def delete_transaction(
     *, 
     session: Session = Depends(get_session), 
+    request: Request,
     transaction_id: int
 ):
-    """Deletar uma transação"""
+    """Deletar uma transação (aceita If-Match com o ETag da versão lida)"""
     transaction = session.get(Transaction, transaction_id)
     if not transaction:
         raise HTTPException(status_code=404, detail="Transação não encontrada")
+    cache.check_if_match(request, cache.resource_etag(transaction))
     
-    session.delete(transaction)
-    session.commit()
+    with _versioned_write(session):
+        session.delete(transaction)
+        session.flush()
+        update_aggregates(session, removed=[transaction])
+        session.commit()
+    events.publish("transaction", "deleted", [transaction_id])
     return {"message": "Transação deletada com sucesso"}
 
+def _load_batch(session: Session, ids: List[int]) -> List[Transaction]:
+    """Carrega as transações do lote; se faltar alguma, nada é alterado (404)"""
+    transactions = session.exec(queries.transactions_by_ids_statement(ids)).all()
+    missing = sorted(set(ids) - {transaction.id for transaction in transactions})
+    if missing:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Transações não encontradas: {', '.join(str(transaction_id) for transaction_id in missing)}"
+        )
+    return transactions
+
+def _batch_keys(transactions: List[Transaction]):
+    """Condição (id, version) IN (...) das linhas lidas
+    
+    O UPDATE/DELETE em lote só afeta as linhas que continuam na versão
+    lida; se alguma mudou nesse meio-tempo, o lote inteiro é desfeito.
+    """
+    table = Transaction.__table__
+    return tuple_(table.c.id, table.c.version).in_(
+        [(transaction.id, transaction.version) for transaction in transactions]
+    )
+
+def _check_batch_count(session: Session, affected: int, expected: int):
+    """Desfaz o lote (412) se alguma linha mudou de versão desde a leitura"""
+    if affected != expected:
+        session.rollback()
+        raise HTTPException(status_code=412, detail="O recurso foi alterado por outra requisição")
+
+@app.post("/transactions/batch-get", response_model=List[TransactionResponse], tags=["Transações"])
+def read_transactions_batch(*, session: Session = Depends(get_session), batch: TransactionIds):
+    """Buscar várias transações por id, na ordem pedida (ids inexistentes são ignorados)"""
+    transactions = session.exec(queries.transactions_by_ids_statement(batch.ids)).all()
+    return queries.order_by_ids(transactions, batch.ids)
+
+@app.patch("/transactions/batch", response_model=List[TransactionResponse], tags=["Transações"])
+def update_transactions_batch(*, session: Session = Depends(get_session), batch: TransactionBatchUpdate):
+    """Aplicar as mesmas alterações a várias transações em um único UPDATE
+    
+    Tudo ou nada: se algum id não existir (404) ou alguma transação for
+    alterada por outra requisição durante o lote (412), nada é gravado.
+    """
+    changes = batch.changes.dict(exclude_unset=True)
+    transactions = _load_batch(session, batch.ids)
+    previous = [transaction.dict() for transaction in transactions]
+    updated = [{**values, **changes, "version": values["version"] + 1} for values in previous]
+    
+    if changes:
+        table = Transaction.__table__
+        statement = table.update().where(_batch_keys(transactions)).values(**changes, version=table.c.version + 1)
+        _check_batch_count(session, session.execute(statement).rowcount, len(transactions))
+        update_aggregates(session, added=updated, removed=previous)
+        session.commit()
+        events.publish("transaction", "updated", batch.ids)
+    else:
+        updated = previous
+    return queries.order_by_ids([TransactionResponse(**values) for values in updated], batch.ids)
+
+@app.delete("/transactions", tags=["Transações"])
+def delete_transactions_batch(
+    *,
+    session: Session = Depends(get_session),
+    ids: List[str] = Query(..., description="Ids separados por vírgula (ex.: ids=1,2,3)")
+):
+    """Deletar várias transações em um único DELETE (tudo ou nada, como no PATCH em lote)"""
+    transactions = _load_batch(session, queries.parse_ids(ids))
+    
+    statement = Transaction.__table__.delete().where(_batch_keys(transactions))
+    _check_batch_count(session, session.execute(statement).rowcount, len(transactions))
+    update_aggregates(session, removed=transactions)
+    session.commit()
+    events.publish("transaction", "deleted", [transaction.id for transaction in transactions])
+    deleted = len(transactions)
+    message = "Transação deletada com sucesso" if deleted == 1 else f"{deleted} transações deletadas com sucesso"
+    return {"message": message, "deleted": deleted}
+
 @app.get("/transactions/summary/category", response_model=List[TransactionSummary], tags=["Relatórios"])
 def get_transactions_summary_by_category(
     *, 
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_session),
+    request: Request,
+    response: Response
 ):
     """Obter resumo de transações agrupadas por categoria"""
-    statement = (
-        select(
-            Transaction.category,
-            func.sum(Transaction.amount).label("total_amount"),
-            func.count(Transaction.id).label("transaction_count")
-        )
-        .group_by(Transaction.category)
-    )
-    results = session.exec(statement).all()
+    version = session.exec(queries.transactions_version_statement()).one()
+    key = cache.report_key("category", version)
+    not_modified = cache.check_etag(request, response, key)
+    if not_modified:
+        return not_modified
     
-    return [
-        TransactionSummary(
-            category=r.category, 
-            total_amount=r.total_amount,
-            transaction_count=r.transaction_count
-        ) 
-        for r in results
-    ]
+    summary = cache.lookup(key)
+    if summary is None:
+        # Lê os totais materializados (por tipo, categoria e mês) em vez de
+        # reagregar a tabela de transações
+        results = session.exec(queries.category_summary_statement()).all()
+        summary = queries.category_summary_response(results)
+        cache.store(key, summary)
+    return summary
 
-@app.get("/transactions/summary/balance", tags=["Relatórios"])
-def get_balance_summary(*, session: Session = Depends(get_session)):
-    """Obter resumo do saldo (receitas - despesas)"""
-    # Total de receitas
-    receitas_statement = (
-        select(func.sum(Transaction.amount))
-        .where(Transaction.type == TransactionType.receita)
-    )
-    total_receitas = session.exec(receitas_statement).first() or 0
-    
-    # Total de despesas
-    despesas_statement = (
-        select(func.sum(Transaction.amount))
-        .where(Transaction.type == TransactionType.despesa)
-    )
-    total_despesas = session.exec(despesas_statement).first() or 0
+@app.get("/transactions/summary/balance", response_model=BalanceSummary, tags=["Relatórios"])
+def get_balance_summary(
+    *, 
+    session: Session = Depends(get_session),
+    date_from: Optional[datetime] = Query(default=None, description="Data inicial (inclusiva)"),
+    date_to: Optional[datetime] = Query(default=None, description="Data final (inclusiva)"),
+    category: Optional[Category] = None,
+    request: Request,
+    response: Response
+):
+    """Obter resumo do saldo (receitas - despesas) com filtros opcionais"""
+    version = session.exec(queries.transactions_version_statement()).one()
+    key = cache.report_key("balance", version, date_from=date_from, date_to=date_to, category=category)
+    not_modified = cache.check_etag(request, response, key)
+    if not_modified:
+        return not_modified
     
-    saldo = total_receitas - total_despesas
+    balance = cache.lookup(key)
+    if balance is None:
+        totals = session.exec(queries.balance_statement(date_from, date_to, category)).one()
+        balance = queries.balance_response(totals)
+        cache.store(key, balance)
+    return balance
+
+@app.get("/transactions/summary/timeseries", response_model=TransactionTimeSeries, tags=["Relatórios"])
+def get_transactions_timeseries(
+    *, 
+    session: Session = Depends(get_session),
+    bucket: TimeBucket = TimeBucket.month,
+    date_from: Optional[datetime] = Query(default=None, alias="from", description="Data inicial (inclusiva)"),
+    date_to: Optional[datetime] = Query(default=None, alias="to", description="Data final (inclusiva)"),
+    request: Request,
+    response: Response
+):
+    """Obter série temporal de totais por período, tipo e categoria"""
+    version = session.exec(queries.transactions_version_statement()).one()
+    key = cache.report_key("timeseries", version, bucket=bucket, date_from=date_from, date_to=date_to)
+    not_modified = cache.check_etag(request, response, key)
+    if not_modified:
+        return not_modified
     
-    return {
-        "total_receitas": total_receitas,
-        "total_despesas": total_despesas,
-        "saldo": saldo
-    }
+    timeseries = cache.lookup(key)
+    if timeseries is None:
+        dialect_name = session.get_bind().dialect.name
+        results = session.exec(queries.timeseries_statement(bucket, dialect_name, date_from, date_to)).all()
+        timeseries = queries.timeseries_response(bucket, results)
+        cache.store(key, timeseries)
+    return timeseries
 
 # ============================================================================
 # ENDPOINTS DE METAS
@@ -190,86 +666,198 @@ def create_goal(*, session: Session = Depends(get_session), goal: GoalCreate):
     db_goal = Goal.from_orm(goal)
     session.add(db_goal)
     session.commit()
-    session.refresh(db_goal)
+    events.publish("goal", "created", [db_goal.id])
     return db_goal
 
 @app.get("/goals/", response_model=List[GoalResponse], tags=["Metas"])
 def read_goals(
     *, 
     session: Session = Depends(get_session),
+    request: Request,
+    response: Response,
     status: Optional[GoalStatus] = None
 ):
     """Listar metas com filtro opcional por status"""
-    statement = select(Goal)
-    
-    if status:
-        statement = statement.where(Goal.status == status)
-        
-    goals = session.exec(statement).all()
+    goals = session.exec(queries.goals_statement(status)).all()
+    not_modified = cache.not_modified(request, response, cache.collection_etag(goals))
+    if not_modified:
+        return not_modified
     return goals
 
 @app.get("/goals/{goal_id}", response_model=GoalResponse, tags=["Metas"])
-def read_goal(*, session: Session = Depends(get_session), goal_id: int):
+def read_goal(*, session: Session = Depends(get_session), request: Request, response: Response, goal_id: int):
     """Buscar uma meta específica"""
     goal = session.get(Goal, goal_id)
     if not goal:
         raise HTTPException(status_code=404, detail="Meta não encontrada")
+    
+    not_modified = cache.not_modified(request, response, cache.resource_etag(goal))
+    if not_modified:
+        return not_modified
     return goal
 
 @app.put("/goals/{goal_id}", response_model=GoalResponse, tags=["Metas"])
 def update_goal(
     *, 
     session: Session = Depends(get_session), 
+    request: Request,
+    response: Response,
     goal_id: int, 
     goal: GoalUpdate
 ):
-    """Atualizar uma meta"""
+    """Atualizar uma meta (aceita If-Match com o ETag da versão lida)"""
     db_goal = session.get(Goal, goal_id)
     if not db_goal:
         raise HTTPException(status_code=404, detail="Meta não encontrada")
+    cache.check_if_match(request, cache.resource_etag(db_goal))
     
     goal_data = goal.dict(exclude_unset=True)
     for key, value in goal_data.items():
         setattr(db_goal, key, value)
     
-    session.add(db_goal)
-    session.commit()
-    session.refresh(db_goal)
+    with _versioned_write(session):
+        session.add(db_goal)
+        session.commit()
+    events.publish("goal", "updated", [goal_id])
+    response.headers["ETag"] = cache.resource_etag(db_goal)
     return db_goal
 
 @app.delete("/goals/{goal_id}", tags=["Metas"])
-def delete_goal(*, session: Session = Depends(get_session), goal_id: int):
-    """Deletar uma meta"""
+def delete_goal(*, session: Session = Depends(get_session), request: Request, goal_id: int):
+    """Deletar uma meta (aceita If-Match com o ETag da versão lida)"""
     goal = session.get(Goal, goal_id)
     if not goal:
         raise HTTPException(status_code=404, detail="Meta não encontrada")
+    cache.check_if_match(request, cache.resource_etag(goal))
     
-    session.delete(goal)
-    session.commit()
+    with _versioned_write(session):
+        session.delete(goal)
+        session.commit()
+    events.publish("goal", "deleted", [goal_id])
     return {"message": "Meta deletada com sucesso"}
 
+# Soma o valor ao progresso e conclui a meta ao atingir o alvo, só para
+# metas ativas (e, com If-Match, só na versão lida). Escrito em SQL porque
+# o SQLAlchemy 1.4 não gera RETURNING para o SQLite, embora o banco aceite
+# a partir da versão 3.35.
+GOAL_PROGRESS_SQL = """
+    UPDATE goals
+    SET current_amount = current_amount + :amount,
+        status = CASE WHEN current_amount + :amount >= target_amount
+                      THEN :concluida ELSE status END,
+        version = version + 1
+    WHERE id = :goal_id AND status = :ativa
+      AND (:version IS NULL OR version = :version)
+"""
+
+def _supports_returning(session: Session) -> bool:
+    """Indica se o banco aceita UPDATE ... RETURNING"""
+    dialect = session.get_bind().dialect
+    if dialect.name == "sqlite":
+        return dialect.dbapi.sqlite_version_info >= (3, 35, 0)
+    return dialect.name == "postgresql"
+
 @app.put("/goals/{goal_id}/progress", response_model=GoalResponse, tags=["Metas"])
 def update_goal_progress(
     *, 
     session: Session = Depends(get_session), 
+    request: Request,
+    response: Response,
     goal_id: int, 
-    amount: float = Query(..., description="Valor a ser adicionado ao progresso")
+    amount: Amount = Query(..., description="Valor a ser adicionado ao progresso")
 ):
-    """Atualizar o progresso de uma meta"""
-    db_goal = session.get(Goal, goal_id)
-    if not db_goal:
-        raise HTTPException(status_code=404, detail="Meta não encontrada")
+    """Atualizar o progresso de uma meta
     
-    if db_goal.status != GoalStatus.ativa:
-        raise HTTPException(status_code=400, detail="Só é possível atualizar metas ativas")
-    
-    db_goal.current_amount += amount
+    A soma e a conclusão da meta são feitas por um único UPDATE
+    condicional no banco, então contribuições simultâneas não se perdem.
+    Com If-Match, a contribuição só vale se a meta não mudou desde a leitura.
+    """
+    version = None
+    if request.headers.get("if-match"):
+        current = session.get(Goal, goal_id)
+        if not current:
+            raise HTTPException(status_code=404, detail="Meta não encontrada")
+        cache.check_if_match(request, cache.resource_etag(current))
+        version = current.version
     
-    # Verificar se a meta foi atingida
-    if db_goal.current_amount >= db_goal.target_amount:
-        db_goal.status = GoalStatus.concluida
+    params = {
+        "goal_id": goal_id,
+        "amount": amount,
+        "ativa": GoalStatus.ativa.name,
+        "concluida": GoalStatus.concluida.name,
+        "version": version,
+    }
+    # Valores em centavos, como nas colunas da tabela
+    bind_types = (bindparam("amount", type_=Money), bindparam("version", type_=Integer))
     
-    session.add(db_goal)
+    if _supports_returning(session):
+        # Uma ida ao banco: o UPDATE já devolve a linha atualizada. As colunas
+        # são listadas pelo nome (não RETURNING *), porque a ordem física da
+        # tabela pode ser outra num banco migrado
+        columns = Goal.__table__.columns
+        returning = ", ".join(column.name for column in columns)
+        statement = (
+            text(f"{GOAL_PROGRESS_SQL} RETURNING {returning}")
+            .bindparams(*bind_types)
+            .columns(*columns)
+        )
+        row = session.execute(statement, params).mappings().first()
+        db_goal = Goal(**row) if row else None
+    else:
+        statement = text(GOAL_PROGRESS_SQL).bindparams(*bind_types)
+        updated = session.execute(statement, params).rowcount
+        db_goal = session.get(Goal, goal_id, populate_existing=True) if updated else None
     session.commit()
-    session.refresh(db_goal)
+    
+    if not db_goal:
+        # Nenhuma linha atualizada: a meta não existe, não está ativa ou
+        # (com If-Match) mudou de versão
+        current = session.get(Goal, goal_id, populate_existing=True)
+        if not current:
+            raise HTTPException(status_code=404, detail="Meta não encontrada")
+        if version is not None and current.version != version:
+            raise HTTPException(status_code=412, detail="O recurso foi alterado por outra requisição")
+        raise HTTPException(status_code=400, detail="Só é possível atualizar metas ativas")
+    events.publish("goal", "updated", [goal_id])
+    response.headers["ETag"] = cache.resource_etag(db_goal)
     return db_goal
+
+# ============================================================================
+# EVENTOS
+# ============================================================================
+
+@app.get("/events", tags=["Eventos"])
+def stream_events():
+    """Stream (Server-Sent Events) das alterações em transações e metas
+    
+    Cada criação, alteração ou exclusão gera um evento created, updated ou
+    deleted com a entidade (transaction/goal) e os ids (null em operações
+    com mais de 100 registros). Um evento resync indica que eventos foram
+    descartados porque o cliente não os leu a tempo. Os eventos só avisam
+    da mudança: o estado atualizado vem de /transactions/changes.
+    """
+    return StreamingResponse(
+        events.stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# ============================================================================
+# MODO ASSÍNCRONO
+# ============================================================================
+
+if database_async:
+    # Substitui as rotas de leitura síncronas pelas versões assíncronas
+    from async_routes import router as async_router
+    
+    replaced = {
+        (route.path, method)
+        for route in async_router.routes
+        for method in route.methods
+    }
+    app.router.routes = [
+        route for route in app.router.routes
+        if not isinstance(route, APIRoute)
+        or not any((route.path, method) in replaced for method in route.methods)
+    ]
+    app.include_router(async_router)
@@ -0,0 +1,22 @@
+from sqlmodel import SQLModel, Field
+from typing import List
+
+from models.transaction import TransactionResponse
+from models.goal import GoalResponse
+
+class ChangeFeed(SQLModel):
+    """Modelo para resposta do feed de alterações
+    
+    Traz o estado atual dos registros criados ou alterados depois da versão
+    pedida e os ids dos apagados. O cliente guarda version e a envia em
+    since na próxima chamada; com has_more, ainda há alterações a buscar.
+    Se epoch muda, o banco foi recriado e a cópia do cliente deve recomeçar
+    da versão 0.
+    """
+    epoch: str = Field(..., description="Identidade do banco; muda quando ele é recriado")
+    version: int = Field(..., description="Versão até a qual as alterações foram enviadas")
+    has_more: bool = Field(..., description="Se ainda há alterações depois de version")
+    transactions: List[TransactionResponse] = Field(default_factory=list)
+    goals: List[GoalResponse] = Field(default_factory=list)
+    deleted_transactions: List[int] = Field(default_factory=list, description="Ids de transações apagadas")
+    deleted_goals: List[int] = Field(default_factory=list, description="Ids de metas apagadas")
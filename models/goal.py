@@ -1,8 +1,14 @@
+from sqlalchemy import Column, Index, text
+from sqlalchemy.orm import declared_attr
 from sqlmodel import SQLModel, Field
 from typing import Optional
 from datetime import datetime
+from decimal import Decimal
 from enum import Enum
 
+from models.money import Amount, Money
+from models.timestamp import Timestamp
+
 class GoalStatus(str, Enum):
     """Status das metas"""
     ativa = "ativa"
@@ -13,16 +19,28 @@ class GoalBase(SQLModel):
     """Modelo base para metas financeiras"""
     title: str = Field(..., description="Título da meta")
     description: Optional[str] = Field(default=None, description="Descrição da meta")
-    target_amount: float = Field(..., description="Valor alvo da meta")
-    current_amount: float = Field(default=0.0, description="Valor atual acumulado")
-    deadline: Optional[datetime] = Field(default=None, description="Data limite para atingir a meta")
+    target_amount: Amount = Field(..., description="Valor alvo da meta")
+    current_amount: Amount = Field(default=Decimal(0), description="Valor atual acumulado")
+    deadline: Optional[Timestamp] = Field(default=None, description="Data limite para atingir a meta")
     status: GoalStatus = Field(default=GoalStatus.ativa, description="Status da meta")
 
 class Goal(GoalBase, table=True):
     """Modelo da tabela de metas"""
     __tablename__ = "goals"
+    __table_args__ = (
+        Index("ix_goals_status", "status"),
+    )
     id: Optional[int] = Field(default=None, primary_key=True)
+    # Valores gravados em centavos (inteiros); ver models/money.py
+    target_amount: Decimal = Field(sa_column=Column(Money, nullable=False))
+    current_amount: Decimal = Field(default=Decimal(0), sa_column=Column(Money, nullable=False))
     created_at: datetime = Field(default_factory=datetime.now, description="Data de criação")
+    version: int = Field(default=1, sa_column_kwargs={"server_default": text("1")}, description="Versão da linha")
+    
+    @declared_attr
+    def __mapper_args__(cls):
+        # Mesmo controle de concorrência otimista das transações
+        return {"version_id_col": cls.__table__.c.version}
 
 class GoalCreate(GoalBase):
     """Modelo para criação de meta"""
@@ -32,12 +50,13 @@ class GoalUpdate(SQLModel):
     """Modelo para atualização de meta"""
     title: Optional[str] = None
     description: Optional[str] = None
-    target_amount: Optional[float] = None
-    current_amount: Optional[float] = None
-    deadline: Optional[datetime] = None
+    target_amount: Optional[Amount] = None
+    current_amount: Optional[Amount] = None
+    deadline: Optional[Timestamp] = None
     status: Optional[GoalStatus] = None
 
 class GoalResponse(GoalBase):
     """Modelo para resposta de meta"""
     id: int
-    created_at: datetime 
\ No newline at end of file
+    created_at: datetime
+    version: int 
\ No newline at end of file
@@ -0,0 +1,65 @@
+# models/money.py
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+from pydantic.validators import decimal_validator
+from sqlalchemy import BigInteger
+from sqlalchemy.types import TypeDecorator
+
+CENT = Decimal("0.01")
+
+# Maior valor aceito, em módulo (10 trilhões). Em centavos cabe com folga
+# num BIGINT com sinal (até ~9,2 * 10^18), deixando espaço para as somas
+# dos relatórios, dos agregados e do progresso das metas
+MAX_AMOUNT = Decimal(10) ** 13
+
+def round_cents(value) -> Decimal:
+    """Arredonda um valor para centavos (metade para cima)
+
+    Valores fora de ±MAX_AMOUNT (ou grandes demais para o arredondamento)
+    geram ValueError, que a validação transforma em erro 422.
+    """
+    if isinstance(value, float):
+        # str() evita levar para o Decimal o erro binário do float (0.1 -> 0.1000000000000000055...)
+        value = str(value)
+    try:
+        value = Decimal(value).quantize(CENT, rounding=ROUND_HALF_UP)
+    except InvalidOperation:
+        raise ValueError(f"o valor deve estar entre -{MAX_AMOUNT} e {MAX_AMOUNT}")
+    if abs(value) > MAX_AMOUNT:
+        raise ValueError(f"o valor deve estar entre -{MAX_AMOUNT} e {MAX_AMOUNT}")
+    return value
+
+def to_cents(value) -> int:
+    """Converte um valor em reais para centavos"""
+    return int(round_cents(value).scaleb(2))
+
+def from_cents(cents) -> Decimal:
+    """Converte centavos para um Decimal em reais com duas casas"""
+    return Decimal(int(cents)).scaleb(-2)
+
+class Amount(Decimal):
+    """Valor monetário da API: aceita números ou textos e arredonda para centavos"""
+
+    @classmethod
+    def __get_validators__(cls):
+        yield decimal_validator
+        yield round_cents
+
+    @classmethod
+    def __modify_schema__(cls, field_schema):
+        field_schema.update(type="number")
+
+class Money(TypeDecorator):
+    """Coluna monetária gravada como inteiro de centavos
+
+    No Python (e na API) o valor é um Decimal em reais; no banco, somas e
+    comparações são feitas em aritmética inteira, sem erro de arredondamento.
+    """
+    impl = BigInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else to_cents(value)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else from_cents(value)
@@ -0,0 +1,29 @@
+# models/text.py
+from typing import Optional
+
+from sqlalchemy import String
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+def lower_text(value: Optional[str]) -> Optional[str]:
+    """Minúsculas de todo o Unicode (Água -> água), como o str.lower()"""
+    return value.lower() if value is not None else None
+
+class unicode_lower(FunctionElement):
+    """lower() que trata todo o Unicode, usado no filtro e no índice de descrição
+
+    O lower() nativo do SQLite só converte letras ASCII; lá a expressão vira
+    a função unicode_lower, registrada em cada conexão (database.py) com
+    lower_text. Nos outros bancos é o lower() nativo.
+    """
+    type = String()
+    name = "unicode_lower"
+    inherit_cache = True
+
+@compiles(unicode_lower)
+def _compile_lower(element, compiler, **kw):
+    return f"lower({compiler.process(element.clauses, **kw)})"
+
+@compiles(unicode_lower, "sqlite")
+def _compile_unicode_lower(element, compiler, **kw):
+    return f"unicode_lower({compiler.process(element.clauses, **kw)})"
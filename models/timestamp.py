@@ -0,0 +1,21 @@
+# models/timestamp.py
+from datetime import datetime
+
+from pydantic.datetime_parse import parse_datetime
+
+def strip_timezone(value: datetime) -> datetime:
+    """Remove o fuso mantendo o horário informado, como a coluna DateTime grava"""
+    return value.replace(tzinfo=None)
+
+class Timestamp(datetime):
+    """Data e hora da API, sem fuso
+
+    As colunas DateTime (SQLite e TIMESTAMP WITHOUT TIME ZONE) descartam o
+    offset e guardam o horário local informado; normalizar já na validação
+    faz a resposta de uma escrita ser igual à leitura seguinte.
+    """
+
+    @classmethod
+    def __get_validators__(cls):
+        yield parse_datetime
+        yield strip_timezone
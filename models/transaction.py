@@ -1,9 +1,17 @@
 # models/transaction.py
+from sqlalchemy import BigInteger, Column, Index, column, text
+from sqlalchemy.orm import declared_attr
+from pydantic import validator
 from sqlmodel import SQLModel, Field
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime
+from decimal import Decimal
 from enum import Enum
 
+from models.money import Amount, Money
+from models.text import unicode_lower
+from models.timestamp import Timestamp
+
 class TransactionType(str, Enum):
     """Tipos de transação"""
     receita = "receita"
@@ -17,18 +25,63 @@ class Category(str, Enum):
     contas = "contas"
     outros = "outros"
 
+class TimeBucket(str, Enum):
+    """Períodos de agrupamento das séries temporais"""
+    day = "day"
+    week = "week"
+    month = "month"
+
+class ExportFormat(str, Enum):
+    """Formatos de exportação de transações"""
+    csv = "csv"
+    ndjson = "ndjson"
+
+class StatementFormat(str, Enum):
+    """Formatos de extrato bancário aceitos na importação"""
+    csv = "csv"
+    ofx = "ofx"
+
+class ImportStatus(str, Enum):
+    """Status de uma importação de extrato"""
+    pendente = "pendente"
+    processando = "processando"
+    concluida = "concluida"
+    erro = "erro"
+
 class TransactionBase(SQLModel):
     """Modelo base para transações"""
     description: str = Field(..., description="Descrição da transação")
-    amount: float = Field(..., description="Valor da transação")
+    amount: Amount = Field(..., description="Valor da transação")
     type: TransactionType = Field(..., description="Tipo: receita ou despesa")
     category: Category = Field(default=Category.outros, description="Categoria da transação")
-    date: datetime = Field(default_factory=datetime.now, description="Data da transação")
+    date: Timestamp = Field(default_factory=datetime.now, description="Data da transação")
 
 class Transaction(TransactionBase, table=True):
     """Modelo da tabela de transações"""
     __tablename__ = "transactions"
+    # O id (rowid) faz parte implícita de cada índice no SQLite, então o
+    # índice de data atende a ordenação (date, id) da paginação por cursor.
+    # O amount no fim dos índices compostos permite que as somas por tipo e
+    # por categoria sejam feitas só com o índice, sem ler a tabela. Os
+    # índices de amount e da descrição em minúsculas (unicode_lower, que
+    # trata acentos também no SQLite) atendem os filtros por faixa de valor
+    # e por início da descrição.
+    __table_args__ = (
+        Index("ix_transactions_date", "date"),
+        Index("ix_transactions_type_date", "type", "date", "amount"),
+        Index("ix_transactions_category_date", "category", "date", "amount"),
+        Index("ix_transactions_amount", "amount"),
+        Index("ix_transactions_description", unicode_lower(column("description"))),
+    )
     id: Optional[int] = Field(default=None, primary_key=True)
+    amount: Decimal = Field(sa_column=Column(Money, nullable=False))
+    version: int = Field(default=1, sa_column_kwargs={"server_default": text("1")}, description="Versão da linha")
+    
+    @declared_attr
+    def __mapper_args__(cls):
+        # Cada UPDATE/DELETE do ORM incrementa a versão e só afeta a linha se
+        # ela ainda estiver na versão lida (controle de concorrência otimista)
+        return {"version_id_col": cls.__table__.c.version}
 
 class TransactionCreate(TransactionBase):
     """Modelo para criação de transação"""
@@ -37,17 +90,106 @@ class TransactionCreate(TransactionBase):
 class TransactionUpdate(SQLModel):
     """Modelo para atualização de transação"""
     description: Optional[str] = None
-    amount: Optional[float] = None
+    amount: Optional[Amount] = None
     type: Optional[TransactionType] = None
     category: Optional[Category] = None
-    date: Optional[datetime] = None
+    date: Optional[Timestamp] = None
+
+    @validator("description", "amount", "type", "category", "date", pre=True)
+    def reject_null(cls, value):
+        """Campos omitidos ficam como estão; null não é aceito (as colunas são NOT NULL)"""
+        if value is None:
+            raise ValueError("não pode ser nulo")
+        return value
 
 class TransactionResponse(TransactionBase):
     """Modelo para resposta de transação"""
     id: int
+    version: int
 
 class TransactionSummary(SQLModel):
     """Modelo para resumo de transações por categoria"""
     category: Category
-    total_amount: float
+    total_amount: Decimal
     transaction_count: int
+
+class BalanceSummary(SQLModel):
+    """Modelo para resumo de saldo"""
+    total_receitas: Decimal
+    total_despesas: Decimal
+    saldo: Decimal
+    quantidade_receitas: int
+    quantidade_despesas: int
+
+class TransactionTimeSeries(SQLModel):
+    """Modelo para série temporal de transações em formato colunar
+    
+    Cada posição i das listas forma uma linha: período, tipo, categoria,
+    total e quantidade de transações.
+    """
+    bucket: TimeBucket
+    periods: List[str]
+    types: List[TransactionType]
+    categories: List[Category]
+    total_amounts: List[Decimal]
+    transaction_counts: List[int]
+
+class TransactionAggregate(SQLModel, table=True):
+    """Totais materializados de transações por tipo, categoria e mês
+    
+    Mantidos na mesma transação do banco que cria, altera ou remove
+    transações, para que os relatórios não precisem varrer a tabela toda.
+    """
+    __tablename__ = "transaction_aggregates"
+    type: TransactionType = Field(primary_key=True)
+    category: Category = Field(primary_key=True)
+    month: str = Field(primary_key=True, description="Mês no formato AAAA-MM")
+    total_amount: Decimal = Field(default=Decimal(0), sa_column=Column(Money, nullable=False))
+    transaction_count: int = Field(default=0)
+
+class TransactionsVersion(SQLModel, table=True):
+    """Versão do conjunto das transações (uma única linha)
+    
+    Incrementada na mesma transação do banco de toda escrita de transações,
+    junto com os agregados. Entra na chave do cache e no ETag dos
+    relatórios, e vale para todos os processos que usam o banco.
+    """
+    __tablename__ = "transactions_version"
+    id: int = Field(default=1, primary_key=True)
+    version: int = Field(default=0, sa_column=Column(BigInteger, nullable=False))
+
+class TransactionBulkError(SQLModel):
+    """Erro de validação de uma linha da importação em lote"""
+    index: int
+    errors: List[Dict[str, Any]]
+
+class TransactionBulkResult(SQLModel):
+    """Modelo para resposta da importação em lote de transações"""
+    inserted: int
+    ids: List[int]
+    errors: List[TransactionBulkError]
+
+# Máximo de ids por operação em lote
+BATCH_MAX_IDS = 1000
+
+class TransactionIds(SQLModel):
+    """Modelo com a lista de ids das operações em lote"""
+    ids: List[int] = Field(..., min_items=1, max_items=BATCH_MAX_IDS, description="Ids das transações")
+
+class TransactionBatchUpdate(TransactionIds):
+    """Modelo para atualização em lote: as mesmas alterações em todas as transações"""
+    changes: TransactionUpdate = Field(..., description="Campos alterados em todas as transações")
+
+class TransactionImportJob(SQLModel):
+    """Modelo para o acompanhamento de uma importação de extrato"""
+    id: str
+    format: StatementFormat
+    status: ImportStatus = ImportStatus.pendente
+    rows_read: int = 0
+    imported: int = 0
+    duplicates: int = 0
+    error_count: int = 0
+    errors: List[TransactionBulkError] = Field(default_factory=list)
+    message: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.now)
+    finished_at: Optional[datetime] = None
@@ -0,0 +1,315 @@
+# queries.py
+import base64
+import json
+from datetime import datetime
+from typing import Annotated, List, Optional
+
+from fastapi import HTTPException, Query, Response
+from sqlalchemy import case, func, literal, tuple_
+from sqlmodel import select
+
+from models.transaction import (
+    Transaction, TransactionResponse, TransactionSummary, TransactionType, Category, TransactionAggregate,
+    BalanceSummary, TransactionTimeSeries, TimeBucket, TransactionsVersion, BATCH_MAX_IDS
+)
+from models.goal import Goal, GoalStatus
+from models.money import Amount
+from models.text import unicode_lower
+from aggregates import bucket_expression
+
+# Consultas de leitura compartilhadas pelas rotas síncronas (main.py) e
+# assíncronas (async_routes.py): aqui só se montam os comandos SQL e as
+# respostas, sem executar nada no banco.
+
+def encode_cursor(transaction: Transaction) -> str:
+    """Gera o cursor opaco de paginação a partir da chave (date, id)"""
+    payload = json.dumps([transaction.date.isoformat(), transaction.id])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+def decode_cursor(cursor: str):
+    """Decodifica o cursor de paginação para a chave (date, id)"""
+    try:
+        date, transaction_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(date), int(transaction_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Cursor de paginação inválido")
+
+class TransactionFilters:
+    """Filtros de transações da listagem e da exportação (dependência do FastAPI)
+
+    Todos são aplicados no SQL: os de data usam o índice de date, os de
+    valor o de amount e o de descrição o índice de lower(description).
+    """
+
+    def __init__(
+        self,
+        transaction_type: Optional[TransactionType] = None,
+        category: Optional[Category] = None,
+        date_from: Annotated[Optional[datetime], Query(description="Data inicial (inclusiva)")] = None,
+        date_to: Annotated[Optional[datetime], Query(description="Data final (inclusiva)")] = None,
+        min_amount: Annotated[Optional[Amount], Query(description="Valor mínimo (inclusivo)")] = None,
+        max_amount: Annotated[Optional[Amount], Query(description="Valor máximo (inclusivo)")] = None,
+        description_prefix: Annotated[
+            Optional[str], Query(min_length=1, description="Início da descrição, sem diferenciar maiúsculas")
+        ] = None
+    ):
+        self.transaction_type = transaction_type
+        self.category = category
+        self.date_from = date_from
+        self.date_to = date_to
+        self.min_amount = min_amount
+        self.max_amount = max_amount
+        self.description_prefix = description_prefix
+
+# Campos que podem ser pedidos no parâmetro fields da listagem
+TRANSACTION_FIELDS = list(TransactionResponse.__fields__)
+
+def parse_fields(fields: str) -> List[str]:
+    """Campos pedidos no parâmetro fields (ex.: "id,date,amount"), sem repetição"""
+    names = list(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    invalid = [name for name in names if name not in TRANSACTION_FIELDS]
+    if invalid or not names:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Campos inválidos: {', '.join(invalid) or fields}. Disponíveis: {', '.join(TRANSACTION_FIELDS)}"
+        )
+    return names
+
+def parse_ids(values: List[str]) -> List[int]:
+    """Ids de um parâmetro repetido (?ids=1&ids=2) ou separado por vírgulas (?ids=1,2)"""
+    try:
+        ids = list(dict.fromkeys(int(value) for item in values for value in item.split(",") if value.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Ids inválidos: informe números inteiros")
+    if not ids or len(ids) > BATCH_MAX_IDS:
+        raise HTTPException(status_code=400, detail=f"Informe de 1 a {BATCH_MAX_IDS} ids")
+    return ids
+
+def _prefix_range(prefix: str):
+    """Limites [início, fim) das descrições (em minúsculas) que começam com o prefixo
+
+    A comparação por faixa usa o índice; um LIKE 'prefixo%' em geral não usa.
+    """
+    start = prefix.lower()
+    last = ord(start[-1])
+    end = start[:-1] + chr(last + 1) if last < 0x10FFFF else None
+    return start, end
+
+def transactions_statement(
+    limit: int,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+    filters: Optional[TransactionFilters] = None,
+    fields: Optional[List[str]] = None
+):
+    """Listagem de transações ordenada por (date, id)
+
+    Busca uma linha a mais que o limite para saber se existe próxima página.
+    Com fields, seleciona só essas colunas (mais date e id, no fim, para o
+    cursor) e retorna linhas em vez de objetos Transaction.
+    """
+    if fields:
+        keys = [name for name in ("date", "id") if name not in fields]
+        statement = select(*[getattr(Transaction, name) for name in fields + keys])
+    else:
+        statement = select(Transaction)
+    statement = statement.order_by(Transaction.date, Transaction.id)
+
+    if cursor:
+        statement = statement.where(tuple_(Transaction.date, Transaction.id) > decode_cursor(cursor))
+    elif offset:
+        statement = statement.offset(offset)
+
+    statement = filter_transactions(statement, filters)
+    return statement.limit(limit + 1)
+
+def transactions_by_ids_statement(ids: List[int]):
+    """Transações com os ids informados, em um único IN (...)"""
+    return select(Transaction).where(Transaction.id.in_(ids))
+
+def order_by_ids(items: List, ids: List[int]) -> List:
+    """Ordena os itens (com atributo id) na ordem dos ids pedidos"""
+    position = {item_id: index for index, item_id in enumerate(ids)}
+    return sorted(items, key=lambda item: position[item.id])
+
+def filter_transactions(statement, filters: Optional[TransactionFilters] = None):
+    """Aplica à consulta os filtros de transações informados"""
+    if filters is None:
+        return statement
+
+    if filters.transaction_type:
+        statement = statement.where(Transaction.type == filters.transaction_type)
+
+    if filters.category:
+        statement = statement.where(Transaction.category == filters.category)
+
+    if filters.date_from:
+        statement = statement.where(Transaction.date >= filters.date_from)
+
+    if filters.date_to:
+        statement = statement.where(Transaction.date <= filters.date_to)
+
+    if filters.min_amount is not None:
+        statement = statement.where(Transaction.amount >= filters.min_amount)
+
+    if filters.max_amount is not None:
+        statement = statement.where(Transaction.amount <= filters.max_amount)
+
+    if filters.description_prefix:
+        start, end = _prefix_range(filters.description_prefix)
+        description = unicode_lower(Transaction.description)
+        statement = statement.where(description >= start)
+        if end is not None:
+            statement = statement.where(description < end)
+
+    return statement
+
+def export_statement(columns: List[str], filters: Optional[TransactionFilters] = None):
+    """Todas as transações (filtradas) com as colunas pedidas, ordenadas por (date, id)"""
+    statement = (
+        select(*(getattr(Transaction, column) for column in columns))
+        .order_by(Transaction.date, Transaction.id)
+    )
+    return filter_transactions(statement, filters)
+
+def paginate(transactions: List[Transaction], limit: int, response: Response) -> List[Transaction]:
+    """Corta a linha extra e, se houver próxima página, envia o header X-Next-Cursor"""
+    if len(transactions) > limit:
+        transactions = transactions[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(transactions[-1])
+    return transactions
+
+def goals_statement(status: Optional[GoalStatus] = None):
+    """Listagem de metas com filtro opcional por status"""
+    statement = select(Goal)
+
+    if status:
+        statement = statement.where(Goal.status == status)
+
+    return statement
+
+def transactions_version_statement():
+    """Versão atual das transações, usada na chave do cache dos relatórios"""
+    return select(TransactionsVersion.version).where(TransactionsVersion.id == 1)
+
+def category_summary_statement():
+    """Totais por categoria lidos dos agregados materializados"""
+    return (
+        select(
+            TransactionAggregate.category,
+            func.sum(TransactionAggregate.total_amount).label("total_amount"),
+            func.sum(TransactionAggregate.transaction_count).label("transaction_count")
+        )
+        .group_by(TransactionAggregate.category)
+        .having(func.sum(TransactionAggregate.transaction_count) > 0)
+    )
+
+def category_summary_response(results) -> List[TransactionSummary]:
+    """Monta a resposta do resumo por categoria"""
+    return [
+        TransactionSummary(
+            category=r.category,
+            total_amount=r.total_amount,
+            transaction_count=r.transaction_count
+        )
+        for r in results
+    ]
+
+def _balance_columns(type_column, amount_column, count_column):
+    """Colunas de agregação condicional: totais e contagens por tipo numa só passada"""
+    is_receita = type_column == TransactionType.receita
+    is_despesa = type_column == TransactionType.despesa
+    return (
+        func.coalesce(func.sum(case((is_receita, amount_column), else_=0)), 0).label("total_receitas"),
+        func.coalesce(func.sum(case((is_despesa, amount_column), else_=0)), 0).label("total_despesas"),
+        func.coalesce(func.sum(case((is_receita, count_column), else_=0)), 0).label("quantidade_receitas"),
+        func.coalesce(func.sum(case((is_despesa, count_column), else_=0)), 0).label("quantidade_despesas"),
+    )
+
+def balance_statement(
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    category: Optional[Category] = None
+):
+    """Resumo de saldo em uma única consulta"""
+    if date_from or date_to:
+        # Período arbitrário: uma única varredura das transações do intervalo
+        statement = select(*_balance_columns(Transaction.type, Transaction.amount, literal(1)))
+        if date_from:
+            statement = statement.where(Transaction.date >= date_from)
+        if date_to:
+            statement = statement.where(Transaction.date <= date_to)
+        if category:
+            statement = statement.where(Transaction.category == category)
+    else:
+        # Sem período: basta somar os agregados materializados
+        statement = select(*_balance_columns(
+            TransactionAggregate.type,
+            TransactionAggregate.total_amount,
+            TransactionAggregate.transaction_count
+        ))
+        if category:
+            statement = statement.where(TransactionAggregate.category == category)
+
+    return statement
+
+def balance_response(totals) -> BalanceSummary:
+    """Monta a resposta do resumo de saldo"""
+    return BalanceSummary(
+        total_receitas=totals.total_receitas,
+        total_despesas=totals.total_despesas,
+        saldo=totals.total_receitas - totals.total_despesas,
+        quantidade_receitas=totals.quantidade_receitas,
+        quantidade_despesas=totals.quantidade_despesas
+    )
+
+def timeseries_statement(
+    bucket: TimeBucket,
+    dialect_name: str,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None
+):
+    """Série temporal de totais por período, tipo e categoria"""
+    if bucket == TimeBucket.month and not (date_from or date_to):
+        # Série mensal completa: os agregados materializados já estão no formato
+        period = TransactionAggregate.month
+        statement = (
+            select(
+                period.label("period"),
+                TransactionAggregate.type,
+                TransactionAggregate.category,
+                func.sum(TransactionAggregate.total_amount).label("total_amount"),
+                func.sum(TransactionAggregate.transaction_count).label("transaction_count")
+            )
+            .group_by(period, TransactionAggregate.type, TransactionAggregate.category)
+            .having(func.sum(TransactionAggregate.transaction_count) > 0)
+        )
+    else:
+        period = bucket_expression(bucket, Transaction.date, dialect_name)
+        statement = (
+            select(
+                period.label("period"),
+                Transaction.type,
+                Transaction.category,
+                func.sum(Transaction.amount).label("total_amount"),
+                func.count(Transaction.id).label("transaction_count")
+            )
+            .group_by(period, Transaction.type, Transaction.category)
+        )
+        if date_from:
+            statement = statement.where(Transaction.date >= date_from)
+        if date_to:
+            statement = statement.where(Transaction.date <= date_to)
+
+    return statement.order_by(period)
+
+def timeseries_response(bucket: TimeBucket, results) -> TransactionTimeSeries:
+    """Monta a resposta colunar da série temporal"""
+    return TransactionTimeSeries(
+        bucket=bucket,
+        periods=[r.period for r in results],
+        types=[r.type for r in results],
+        categories=[r.category for r in results],
+        total_amounts=[r.total_amount for r in results],
+        transaction_counts=[r.transaction_count for r in results]
+    )
@@ -0,0 +1,142 @@
+# search.py
+import re
+from typing import List, Optional
+
+from fastapi import Response
+from sqlalchemy import and_, column, false, table, text
+from sqlalchemy.exc import OperationalError
+from sqlmodel import select
+
+from models.text import unicode_lower
+from models.transaction import Transaction
+import queries
+
+# Busca textual nas descrições das transações. No SQLite a busca usa uma
+# tabela FTS5 de conteúdo externo (o texto fica só em transactions) mantida
+# por triggers; sem FTS5, ou em outros bancos, cai para um LIKE por termo.
+# Só o FTS5 ignora acentos (remove_diacritics); o LIKE ignora maiúsculas,
+# mas "farmacia" não encontra "Farmácia".
+
+FTS_TABLE = "transactions_fts"
+
+# Ativada por setup_fts quando o banco tem FTS5
+fts_enabled = False
+
+_fts = table(FTS_TABLE, column("rowid"), column("rank"))
+
+FTS_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        description, content='transactions', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+]
+
+FTS_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON transactions BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, description) VALUES (new.id, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON transactions BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, description) VALUES ('delete', old.id, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update AFTER UPDATE OF description ON transactions BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, description) VALUES ('delete', old.id, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, description) VALUES (new.id, new.description);
+    END
+    """,
+]
+
+def setup_fts(connection) -> bool:
+    """Cria (se preciso) o índice FTS5 e os triggers que o mantêm atualizado
+
+    Na criação, o índice é preenchido com as transações que já existem.
+    Retorna False se o banco não é SQLite ou não tem FTS5.
+    """
+    global fts_enabled
+    if connection.dialect.name != "sqlite":
+        return False
+
+    exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,)
+    ).first()
+    if not exists:
+        try:
+            for ddl in FTS_DDL:
+                connection.exec_driver_sql(ddl)
+        except OperationalError:
+            # SQLite compilado sem FTS5
+            return False
+        connection.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+    for trigger in FTS_TRIGGERS:
+        connection.exec_driver_sql(trigger)
+    fts_enabled = True
+    return True
+
+def search_terms(query: str) -> List[str]:
+    """Separa a busca em termos (palavras e números)"""
+    return re.findall(r"\w+", query)
+
+def match_expression(terms: List[str]) -> str:
+    """Expressão MATCH do FTS5: todos os termos, cada um também como prefixo
+
+    Os termos vão entre aspas para que a sintaxe do FTS5 (AND, OR, NEAR,
+    *, ^...) digitada pelo usuário seja tratada como texto comum.
+    """
+    return " ".join(f'"{term}"*' for term in terms)
+
+def search_statement(
+    query: str,
+    limit: int,
+    offset: int = 0,
+    filters: Optional[queries.TransactionFilters] = None
+):
+    """Transações cuja descrição contém todos os termos da busca
+
+    Com FTS5 o resultado vem ordenado por relevância (bm25) e sem diferenciar
+    acentos; no LIKE, das mais recentes para as mais antigas, e os acentos
+    precisam coincidir. Assim como na listagem, busca uma linha a mais que
+    o limite para saber se existe próxima página.
+    """
+    terms = search_terms(query)
+    if not terms:
+        statement = select(Transaction).where(false())
+    elif fts_enabled:
+        statement = (
+            select(Transaction)
+            .join(_fts, _fts.c.rowid == Transaction.id)
+            .where(text(f"{FTS_TABLE} MATCH :match").bindparams(match=match_expression(terms)))
+            .order_by(_fts.c.rank, Transaction.id)
+        )
+    else:
+        description = unicode_lower(Transaction.description)
+        conditions = [description.like(f"%{_escape_like(term.lower())}%", escape="\\") for term in terms]
+        statement = (
+            select(Transaction)
+            .where(and_(*conditions))
+            .order_by(Transaction.date.desc(), Transaction.id.desc())
+        )
+
+    statement = queries.filter_transactions(statement, filters)
+    return statement.offset(offset).limit(limit + 1)
+
+def paginate(transactions: List[Transaction], limit: int, offset: int, response: Response) -> List[Transaction]:
+    """Corta a linha extra e, se houver próxima página, envia o header X-Next-Offset
+
+    A ordem por relevância não tem uma chave estável para cursor, por isso a
+    busca pagina por offset.
+    """
+    if len(transactions) > limit:
+        transactions = transactions[:limit]
+        response.headers["X-Next-Offset"] = str(offset + limit)
+    return transactions
+
+def _escape_like(term: str) -> str:
+    """Escapa os curingas do LIKE"""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
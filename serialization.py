@@ -0,0 +1,100 @@
+# serialization.py
+import asyncio
+import functools
+import os
+from decimal import Decimal
+from typing import List, Sequence
+
+import orjson
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.routing import APIRoute, request_response
+from pydantic import BaseModel
+
+import cache
+
+# Serialização rápida das respostas. As listagens com fields mandam as
+# linhas do banco direto para o orjson, sem criar um objeto do ORM e um
+# modelo Pydantic por linha; no modo de respostas rápidas (opcional), todas
+# as rotas serializam o retorno com orjson. O JSON gerado é igual ao do
+# caminho normal (datas ISO 8601, enums pelo valor e valores monetários
+# como número).
+
+# Modo de respostas rápidas: desligado por padrão
+fast_responses = os.getenv("FAST_RESPONSES", "false").strip().lower() in ("1", "true", "yes", "on")
+
+def _default(value):
+    """Tipos que o orjson não serializa sozinho"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, BaseModel):
+        return value.dict()
+    raise TypeError
+
+def dumps(content) -> bytes:
+    """Serializa o conteúdo em JSON com orjson"""
+    return orjson.dumps(content, default=_default)
+
+def rows_response(request: Request, response: Response, rows: Sequence, fields: List[str]) -> Response:
+    """Resposta JSON das linhas com os campos pedidos, na ordem pedida
+
+    As linhas podem trazer colunas extras depois dos campos (ex.: as da
+    chave do cursor), que ficam fora do JSON. O ETag vem do próprio corpo.
+    """
+    content = dumps([dict(zip(fields, row)) for row in rows])
+    not_modified = cache.not_modified(request, response, cache.content_etag(content))
+    if not_modified:
+        return not_modified
+    return Response(content=content, media_type="application/json", headers=dict(response.headers))
+
+class RenderedJSON(str):
+    """Corpo já serializado, que o FastAPI repassa sem codificar de novo"""
+
+class FastJSONResponse(JSONResponse):
+    """Resposta JSON gerada com orjson"""
+
+    def render(self, content) -> bytes:
+        if isinstance(content, RenderedJSON):
+            return content.encode()
+        return dumps(content)
+
+def _render_result(result):
+    """Serializa o retorno da rota, exceto quando ela já devolve uma Response
+
+    Um retorno já serializado passa direto: no include_router a rota é
+    recriada a partir da função já envolvida.
+    """
+    if isinstance(result, (Response, RenderedJSON)):
+        return result
+    return RenderedJSON(dumps(result).decode())
+
+class TrustedJSONRoute(APIRoute):
+    """Rota que serializa o retorno direto com orjson
+
+    O retorno não é revalidado pelo response_model: as rotas devolvem
+    linhas do banco (ou modelos) que já têm os campos do modelo de
+    resposta. O response_model continua valendo para a documentação. Os
+    headers e o status definidos na rota são mantidos.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        if asyncio.iscoroutinefunction(endpoint):
+            @functools.wraps(endpoint)
+            async def wrapper(*args, **values):
+                return _render_result(await endpoint(*args, **values))
+        else:
+            @functools.wraps(endpoint)
+            def wrapper(*args, **values):
+                return _render_result(endpoint(*args, **values))
+
+        if isinstance(kwargs.get("response_class"), DefaultPlaceholder):
+            kwargs["response_class"] = FastJSONResponse
+        super().__init__(path, wrapper, **kwargs)
+
+        # Só o handler deixa de validar; o response_field segue para o OpenAPI
+        self.secure_cloned_response_field = None
+        self.app = request_response(self.get_route_handler())
+
+# Classe das rotas da API, conforme o modo de respostas
+route_class = TrustedJSONRoute if fast_responses else APIRoute
@@ -6,6 +6,8 @@ Testa TODOS os endpoints e métodos disponíveis
 
 import requests
 import json
+import threading
+import time
 from datetime import datetime, timedelta
 
 # Configuração
@@ -78,34 +80,513 @@ def test_transactions():
     response = requests.get(f"{BASE_URL}/transactions/?category=alimentacao")
     print_response(response, "GET /transactions/?category=alimentacao - Filtrando por categoria alimentação")
     
-    # 5. GET /transactions/{id} - Buscar transação específica
+    # 5. GET /transactions/ com cursor - Paginação por cursor
+    response = requests.get(f"{BASE_URL}/transactions/?limit=2")
+    next_cursor = response.headers.get("X-Next-Cursor")
+    if next_cursor:
+        first_page_ids = [t["id"] for t in response.json()]
+        response = requests.get(f"{BASE_URL}/transactions/", params={"limit": 2, "cursor": next_cursor})
+        print_response(response, "GET /transactions/?limit=2&cursor=... - Segunda página por cursor")
+        if set(first_page_ids) & {t["id"] for t in response.json()}:
+            print("❌ Páginas por cursor retornaram transações repetidas")
+    
+    # 6. GET /transactions/{id} - Buscar transação específica
     if created_ids:
         response = requests.get(f"{BASE_URL}/transactions/{created_ids[0]}")
         print_response(response, f"GET /transactions/{created_ids[0]} - Buscando transação específica")
     
-    # 6. PUT /transactions/{id} - Atualizar transação
+    # 7. PUT /transactions/{id} - Atualizar transação
     if created_ids:
         update_data = {"amount": 1300.00, "description": "Aluguel atualizado"}
         response = requests.put(f"{BASE_URL}/transactions/{created_ids[1]}", json=update_data)
         print_response(response, f"PUT /transactions/{created_ids[1]} - Atualizando transação")
     
-    # 7. DELETE /transactions/{id} - Deletar transação
+    # 8. DELETE /transactions/{id} - Deletar transação
     if created_ids:
         response = requests.delete(f"{BASE_URL}/transactions/{created_ids[-1]}")
         print_response(response, f"DELETE /transactions/{created_ids[-1]} - Deletando transação")
         # Remove o ID deletado da lista
         created_ids.pop()
     
-    # 8. GET /transactions/summary/category - Resumo por categoria
+    # 9. GET /transactions/summary/category - Resumo por categoria
     response = requests.get(f"{BASE_URL}/transactions/summary/category")
     print_response(response, "GET /transactions/summary/category - Resumo por categoria")
     
-    # 9. GET /transactions/summary/balance - Resumo de saldo
+    # 10. GET /transactions/summary/balance - Resumo de saldo
     response = requests.get(f"{BASE_URL}/transactions/summary/balance")
     print_response(response, "GET /transactions/summary/balance - Resumo de saldo")
     
+    # 11. GET /transactions/summary/balance com filtros - Período e categoria
+    params = {"date_from": datetime.now().replace(hour=0, minute=0, second=0, microsecond=0).isoformat(), "category": "contas"}
+    response = requests.get(f"{BASE_URL}/transactions/summary/balance", params=params)
+    print_response(response, "GET /transactions/summary/balance?date_from=...&category=contas - Saldo filtrado")
+    
+    # 12. GET /transactions/summary/timeseries - Série temporal
+    response = requests.get(f"{BASE_URL}/transactions/summary/timeseries?bucket=month")
+    print_response(response, "GET /transactions/summary/timeseries?bucket=month - Série mensal")
+    response = requests.get(f"{BASE_URL}/transactions/summary/timeseries", params={"bucket": "week", **{"from": params["date_from"]}})
+    print_response(response, "GET /transactions/summary/timeseries?bucket=week&from=... - Série semanal")
+    
     return created_ids
 
+def test_bulk_transactions():
+    """Testa a importação de transações em lote"""
+    print("\n📦 Testando importação em lote de transações...")
+    
+    # 1. POST /transactions/bulk - Lista JSON com uma linha inválida
+    transactions = [
+        {"description": "Freelance", "amount": 800.00, "type": "receita", "category": "outros"},
+        {"description": "Farmácia", "amount": 45.90, "type": "despesa", "category": "saude"},
+        {"description": "Linha inválida", "amount": "abc", "type": "despesa"}
+    ]
+    response = requests.post(f"{BASE_URL}/transactions/bulk", json=transactions)
+    print_response(response, "POST /transactions/bulk - Lista JSON (1 linha inválida)")
+    result = response.json()
+    ok = response.status_code == 200 and result["inserted"] == 2 and result["errors"][0]["index"] == 2
+    
+    # 2. POST /transactions/bulk - Fluxo NDJSON
+    ndjson = "\n".join(json.dumps(t) for t in transactions[:2])
+    response = requests.post(
+        f"{BASE_URL}/transactions/bulk",
+        data=ndjson.encode("utf-8"),
+        headers={"Content-Type": "application/x-ndjson"}
+    )
+    print_response(response, "POST /transactions/bulk - Fluxo NDJSON")
+    ok = ok and response.status_code == 200 and response.json()["inserted"] == 2
+    
+    return ok
+
+def test_export_transactions():
+    """Testa a exportação de transações em CSV e NDJSON"""
+    print("\n📤 Testando exportação de transações...")
+    
+    # 1. GET /transactions/export?format=csv
+    response = requests.get(f"{BASE_URL}/transactions/export?format=csv", stream=True)
+    lines = list(response.iter_lines(decode_unicode=True))
+    print(f"\n📋 GET /transactions/export?format=csv - Status: {response.status_code}, linhas: {len(lines)}")
+    print(f"   Cabeçalho: {lines[0] if lines else ''}")
+    ok = response.status_code == 200 and lines[0] == "id,date,description,amount,type,category"
+    
+    # 2. GET /transactions/export?format=ndjson
+    response = requests.get(f"{BASE_URL}/transactions/export?format=ndjson&transaction_type=receita", stream=True)
+    rows = [json.loads(line) for line in response.iter_lines() if line]
+    print(f"\n📋 GET /transactions/export?format=ndjson&transaction_type=receita - Status: {response.status_code}, linhas: {len(rows)}")
+    ok = ok and response.status_code == 200 and all(row["type"] == "receita" for row in rows)
+    
+    return ok
+
+def test_report_cache():
+    """Testa o ETag dos relatórios e a invalidação após escritas"""
+    print("\n🗃️ Testando cache dos relatórios...")
+    
+    # 1. Primeira leitura devolve o ETag
+    response = requests.get(f"{BASE_URL}/transactions/summary/balance")
+    etag = response.headers.get("ETag")
+    print(f"\n📋 GET /transactions/summary/balance - Status: {response.status_code}, ETag: {etag}")
+    ok = response.status_code == 200 and etag is not None
+    
+    # 2. Com If-None-Match e nada alterado, a resposta é 304
+    response = requests.get(f"{BASE_URL}/transactions/summary/balance", headers={"If-None-Match": etag})
+    print(f"\n📋 GET /transactions/summary/balance (If-None-Match) - Status: {response.status_code}")
+    ok = ok and response.status_code == 304
+    
+    # 3. Depois de uma escrita o relatório é recalculado
+    created = requests.post(f"{BASE_URL}/transactions/", json={
+        "description": "Teste cache", "amount": 10.0, "type": "receita", "category": "outros"
+    }).json()
+    response = requests.get(f"{BASE_URL}/transactions/summary/balance", headers={"If-None-Match": etag})
+    print(f"\n📋 GET /transactions/summary/balance após escrita - Status: {response.status_code}")
+    ok = ok and response.status_code == 200 and response.headers.get("ETag") != etag
+    requests.delete(f"{BASE_URL}/transactions/{created['id']}")
+    
+    return ok
+
+def test_conditional_requests():
+    """Testa ETag/If-None-Match nas leituras e If-Match nas escritas"""
+    print("\n🔖 Testando requisições condicionais...")
+    
+    created = requests.post(f"{BASE_URL}/transactions/", json={
+        "description": "Teste ETag", "amount": 20.0, "type": "despesa", "category": "outros"
+    }).json()
+    url = f"{BASE_URL}/transactions/{created['id']}"
+    
+    # 1. GET com If-None-Match da versão atual devolve 304
+    etag = requests.get(url).headers.get("ETag")
+    response = requests.get(url, headers={"If-None-Match": etag})
+    print(f"\n📋 GET /transactions/{{id}} (If-None-Match) - Status: {response.status_code}")
+    ok = etag is not None and response.status_code == 304
+    
+    # 2. PUT com If-Match da versão atual é aceito e muda o ETag
+    response = requests.put(url, json={"amount": 25.0}, headers={"If-Match": etag})
+    print(f"\n📋 PUT /transactions/{{id}} (If-Match atual) - Status: {response.status_code}, versão: {response.json().get('version')}")
+    ok = ok and response.status_code == 200 and response.headers.get("ETag") != etag
+    
+    # 3. PUT/DELETE com If-Match de uma versão antiga são recusados (412)
+    response = requests.put(url, json={"amount": 30.0}, headers={"If-Match": etag})
+    print(f"\n📋 PUT /transactions/{{id}} (If-Match antigo) - Status: {response.status_code}")
+    ok = ok and response.status_code == 412
+    response = requests.delete(url, headers={"If-Match": etag})
+    print(f"\n📋 DELETE /transactions/{{id}} (If-Match antigo) - Status: {response.status_code}")
+    ok = ok and response.status_code == 412
+    
+    # 4. O ETag de um PUT é o mesmo da leitura seguinte e vale no próximo If-Match,
+    # mesmo com valores que o banco normaliza (data com fuso, mais de duas casas)
+    etag = requests.get(url).headers.get("ETag")
+    response = requests.put(url, json={"date": "2024-03-02T10:00:00+02:00", "amount": "26.005"}, headers={"If-Match": etag})
+    etag = response.headers.get("ETag")
+    ok = ok and etag == requests.get(url).headers.get("ETag")
+    response = requests.put(url, json={"amount": 27.0}, headers={"If-Match": etag})
+    print(f"\n📋 PUT /transactions/{{id}} (If-Match do PUT anterior) - Status: {response.status_code}")
+    ok = ok and response.status_code == 200
+    
+    # 5. Listagem de metas com If-None-Match
+    response = requests.get(f"{BASE_URL}/goals/")
+    response = requests.get(f"{BASE_URL}/goals/", headers={"If-None-Match": response.headers.get("ETag")})
+    print(f"\n📋 GET /goals/ (If-None-Match) - Status: {response.status_code}")
+    ok = ok and response.status_code == 304
+    
+    requests.delete(url)
+    return ok
+
+def test_write_responses():
+    """Testa se a resposta das escritas é igual à leitura seguinte"""
+    print("\n🪞 Testando respostas das escritas...")
+    
+    # Data com fuso e valor com mais de duas casas: o banco grava o horário
+    # sem o offset e o valor em centavos
+    created = requests.post(f"{BASE_URL}/transactions/", json={
+        "description": "Resposta da escrita", "amount": 10.005, "type": "despesa",
+        "date": "2024-03-02T10:00:00+02:00"
+    }).json()
+    url = f"{BASE_URL}/transactions/{created['id']}"
+    ok = created == requests.get(url).json()
+    print(f"\n📋 POST /transactions/ (data com fuso) - data: {created['date']}, valor: {created['amount']}")
+    
+    updated = requests.put(url, json={"date": "2024-03-05T08:30:00-03:00", "amount": "7.777"}).json()
+    ok = ok and updated == requests.get(url).json()
+    print(f"\n📋 PUT /transactions/{{id}} (data com fuso) - data: {updated['date']}, valor: {updated['amount']}")
+    
+    goal = requests.post(f"{BASE_URL}/goals/", json={
+        "title": "Resposta da escrita", "target_amount": 100.004, "deadline": "2025-01-01T00:00:00Z"
+    }).json()
+    goal_url = f"{BASE_URL}/goals/{goal['id']}"
+    ok = ok and goal == requests.get(goal_url).json()
+    goal = requests.put(goal_url, json={"deadline": "2025-06-01T12:00:00+05:30"}).json()
+    ok = ok and goal == requests.get(goal_url).json()
+    
+    requests.delete(url)
+    requests.delete(goal_url)
+    return ok
+
+def test_transaction_filters():
+    """Testa os filtros de período, valor e início da descrição"""
+    print("\n🔎 Testando filtros de transações...")
+    
+    run = datetime.now().strftime("%Y%m%d%H%M%S%f")
+    samples = [
+        ("2023-01-10T12:00:00", 50.0, f"Filtro {run} Mercado"),
+        ("2023-01-20T12:00:00", 500.0, f"Filtro {run} Aluguel"),
+        ("2023-02-05T12:00:00", 80.0, f"filtro {run} mercado"),
+        ("2023-03-01T12:00:00", 200.0, f"Água {run} e luz"),
+    ]
+    ids = [
+        requests.post(f"{BASE_URL}/transactions/", json={
+            "description": description, "amount": amount, "type": "despesa", "date": date
+        }).json()["id"]
+        for date, amount, description in samples
+    ]
+    
+    def found(params):
+        response = requests.get(f"{BASE_URL}/transactions/", params=params)
+        return {t["id"] for t in response.json()} & set(ids)
+    
+    # 1. Período (mês de janeiro de 2023)
+    january = found({"date_from": "2023-01-01T00:00:00", "date_to": "2023-01-31T23:59:59"})
+    print(f"\n📋 GET /transactions/?date_from=2023-01-01&date_to=2023-01-31 - encontradas: {len(january)}")
+    ok = january == set(ids[:2])
+    
+    # 2. Faixa de valor
+    cheap = found({"min_amount": 10, "max_amount": 100, "description_prefix": f"filtro {run}"})
+    print(f"\n📋 GET /transactions/?min_amount=10&max_amount=100 - encontradas: {len(cheap)}")
+    ok = ok and cheap == {ids[0], ids[2]}
+    
+    # 3. Início da descrição, sem diferenciar maiúsculas
+    market = found({"description_prefix": f"FILTRO {run} MERC"})
+    print(f"\n📋 GET /transactions/?description_prefix=... - encontradas: {len(market)}")
+    ok = ok and market == {ids[0], ids[2]}
+    
+    # 4. Início da descrição com maiúscula acentuada
+    water = [found({"description_prefix": f"{prefix} {run}"}) for prefix in ("Água", "água", "ÁGUA")]
+    print(f"\n📋 GET /transactions/?description_prefix=água... - encontradas: {[len(w) for w in water]}")
+    ok = ok and all(w == {ids[3]} for w in water)
+    
+    for transaction_id in ids:
+        requests.delete(f"{BASE_URL}/transactions/{transaction_id}")
+    return ok
+
+def test_transaction_fields():
+    """Testa a listagem com o parâmetro fields"""
+    print("\n🧩 Testando listagem com campos selecionados...")
+    
+    url = f"{BASE_URL}/transactions/"
+    full = requests.get(url, params={"limit": 20})
+    
+    # 1. Com todos os campos, o JSON é o mesmo da listagem normal
+    all_fields = ",".join(full.json()[0]) if full.json() else "id"
+    response = requests.get(url, params={"limit": 20, "fields": all_fields})
+    print(f"\n📋 GET /transactions/?fields=(todos) - Status: {response.status_code}")
+    ok = response.json() == full.json() and response.headers.get("X-Next-Cursor") == full.headers.get("X-Next-Cursor")
+    
+    # 2. Só os campos pedidos
+    response = requests.get(url, params={"limit": 20, "fields": "id,amount"})
+    print(f"\n📋 GET /transactions/?fields=id,amount - Status: {response.status_code}")
+    ok = ok and all(set(t) == {"id", "amount"} for t in response.json())
+    ok = ok and [t["id"] for t in response.json()] == [t["id"] for t in full.json()]
+    
+    # 3. Campo inexistente
+    response = requests.get(url, params={"fields": "id,senha"})
+    print(f"\n📋 GET /transactions/?fields=id,senha - Status: {response.status_code}")
+    ok = ok and response.status_code == 400
+    return ok
+
+def test_transaction_batch():
+    """Testa busca, alteração e exclusão de transações em lote"""
+    print("\n📦 Testando operações em lote...")
+    
+    ids = [
+        requests.post(f"{BASE_URL}/transactions/", json={
+            "description": f"Lote {i}", "amount": 10.0 + i, "type": "despesa", "category": "outros"
+        }).json()["id"]
+        for i in range(3)
+    ]
+    balance_before = requests.get(f"{BASE_URL}/transactions/summary/balance").json()
+    
+    # 1. Busca em lote, na ordem pedida
+    response = requests.post(f"{BASE_URL}/transactions/batch-get", json={"ids": ids[::-1] + [999999]})
+    print(f"\n📋 POST /transactions/batch-get - Status: {response.status_code}")
+    ok = [t["id"] for t in response.json()] == ids[::-1]
+    
+    # 2. Alteração em lote: mesmas mudanças, nova versão
+    response = requests.patch(f"{BASE_URL}/transactions/batch", json={"ids": ids, "changes": {"category": "lazer", "amount": 5.0}})
+    print(f"\n📋 PATCH /transactions/batch - Status: {response.status_code}")
+    ok = ok and all(t["category"] == "lazer" and t["amount"] == 5.0 and t["version"] == 2 for t in response.json())
+    balance = requests.get(f"{BASE_URL}/transactions/summary/balance").json()
+    ok = ok and round(balance["total_despesas"] - balance_before["total_despesas"], 2) == -18.0
+    
+    # 2b. null em campo obrigatório é recusado (422) e nada muda
+    for field in ("amount", "date"):
+        response = requests.patch(f"{BASE_URL}/transactions/batch", json={"ids": ids, "changes": {field: None}})
+        print(f"\n📋 PATCH /transactions/batch ({field}=null) - Status: {response.status_code}")
+        ok = ok and response.status_code == 422
+    response = requests.put(f"{BASE_URL}/transactions/{ids[0]}", json={"amount": None})
+    print(f"\n📋 PUT /transactions/{{id}} (amount=null) - Status: {response.status_code}")
+    ok = ok and response.status_code == 422
+    response = requests.post(f"{BASE_URL}/transactions/batch-get", json={"ids": ids})
+    ok = ok and all(t["amount"] == 5.0 and t["version"] == 2 for t in response.json())
+    
+    # 3. Lote com id inexistente não altera nada
+    response = requests.delete(f"{BASE_URL}/transactions", params={"ids": f"{ids[0]},999999"})
+    print(f"\n📋 DELETE /transactions?ids=...,999999 - Status: {response.status_code}")
+    ok = ok and response.status_code == 404 and requests.get(f"{BASE_URL}/transactions/{ids[0]}").status_code == 200
+    
+    # 4. Exclusão em lote
+    response = requests.delete(f"{BASE_URL}/transactions", params={"ids": ",".join(map(str, ids))})
+    print(f"\n📋 DELETE /transactions?ids=... - Status: {response.status_code}, deletadas: {response.json().get('deleted')}")
+    ok = ok and response.json().get("deleted") == 3
+    response = requests.post(f"{BASE_URL}/transactions/batch-get", json={"ids": ids})
+    ok = ok and response.json() == []
+    return ok
+
+def test_transaction_search():
+    """Testa a busca textual nas descrições"""
+    print("\n🔍 Testando busca de transações...")
+    
+    run = datetime.now().strftime("%Y%m%d%H%M%S%f")
+    descriptions = [f"Busca {run} Farmácia Popular", f"Busca {run} farmacia central", f"Busca {run} Padaria"]
+    ids = [
+        requests.post(f"{BASE_URL}/transactions/", json={
+            "description": description, "amount": 10.0, "type": "despesa"
+        }).json()["id"]
+        for description in descriptions
+    ]
+    
+    def found(q, **params):
+        response = requests.get(f"{BASE_URL}/transactions/search", params={"q": q, **params})
+        return response, [t["id"] for t in response.json()]
+    
+    # 1. Sem diferenciar acentos nem maiúsculas
+    _, pharmacy = found(f"FARMACIA {run}")
+    print(f"\n📋 GET /transactions/search?q=FARMACIA - encontradas: {len(pharmacy)}")
+    ok = set(pharmacy) == set(ids[:2])
+    
+    # 2. Prefixo das palavras e paginação por offset
+    response, page = found(f"farm {run}", limit=1)
+    print(f"\n📋 GET /transactions/search?q=farm&limit=1 - X-Next-Offset: {response.headers.get('X-Next-Offset')}")
+    ok = ok and len(page) == 1 and response.headers.get("X-Next-Offset") == "1"
+    
+    # 3. O índice acompanha alterações e exclusões
+    requests.put(f"{BASE_URL}/transactions/{ids[2]}", json={"description": f"Busca {run} Farmácia nova"})
+    requests.delete(f"{BASE_URL}/transactions/{ids[0]}")
+    _, updated = found(f"farmácia {run}")
+    print(f"\n📋 GET /transactions/search após alterar e excluir - encontradas: {len(updated)}")
+    ok = ok and set(updated) == {ids[1], ids[2]}
+    
+    for transaction_id in ids[1:]:
+        requests.delete(f"{BASE_URL}/transactions/{transaction_id}")
+    return ok
+
+def read_all_changes(since):
+    """Segue o feed de alterações a partir de since até não haver mais"""
+    feed = {"transactions": [], "goals": [], "deleted_transactions": [], "deleted_goals": []}
+    while True:
+        response = requests.get(f"{BASE_URL}/transactions/changes", params={"since": since})
+        page = response.json()
+        for name in feed:
+            feed[name] += page[name]
+        since = page["version"]
+        if not page["has_more"]:
+            return response, feed, since
+
+def test_transaction_changes():
+    """Testa o feed de alterações usado na sincronização incremental"""
+    print("\n🔄 Testando feed de alterações...")
+    
+    response, _, version = read_all_changes(0)
+    print(f"\n📋 GET /transactions/changes - Status: {response.status_code}, versão: {version}")
+    if response.status_code == 501:
+        # Banco sem suporte ao feed (não SQLite)
+        return True
+    first_epoch = response.json()["epoch"]
+    
+    # 1. Criação, alteração e exclusão aparecem na próxima chamada
+    created = requests.post(f"{BASE_URL}/transactions/", json={
+        "description": "Sincronização", "amount": 10.0, "type": "despesa"
+    }).json()
+    removed = requests.post(f"{BASE_URL}/transactions/", json={
+        "description": "Sincronização apagada", "amount": 1.0, "type": "despesa"
+    }).json()
+    requests.put(f"{BASE_URL}/transactions/{created['id']}", json={"amount": 12.0})
+    requests.delete(f"{BASE_URL}/transactions/{removed['id']}")
+    goal = requests.post(f"{BASE_URL}/goals/", json={"title": "Sincronização", "target_amount": 100.0}).json()
+    
+    response, feed, new_version = read_all_changes(version)
+    print(f"\n📋 GET /transactions/changes?since={version} - Status: {response.status_code}, "
+          f"alteradas: {len(feed['transactions'])}, apagadas: {len(feed['deleted_transactions'])}")
+    ok = new_version > version
+    ok = ok and [(t["id"], t["amount"]) for t in feed["transactions"]] == [(created["id"], 12.0)]
+    ok = ok and feed["deleted_transactions"] == [removed["id"]]
+    ok = ok and [g["id"] for g in feed["goals"]] == [goal["id"]]
+    
+    # 2. Nada mudou desde a última versão; a identidade do banco não muda
+    response, feed, same_version = read_all_changes(new_version)
+    ok = ok and same_version == new_version and not any(feed.values())
+    ok = ok and bool(response.json()["epoch"]) and response.json()["epoch"] == first_epoch
+    
+    # 3. Paginação com limit
+    response = requests.get(f"{BASE_URL}/transactions/changes", params={"since": version, "limit": 1})
+    ok = ok and response.json()["has_more"] is True
+    
+    # 4. since além do INTEGER de 64 bits é recusado (422, não 500)
+    response = requests.get(f"{BASE_URL}/transactions/changes", params={"since": 2 ** 63})
+    print(f"\n📋 GET /transactions/changes?since=2**63 - Status: {response.status_code}")
+    ok = ok and response.status_code == 422
+    
+    requests.delete(f"{BASE_URL}/transactions/{created['id']}")
+    requests.delete(f"{BASE_URL}/goals/{goal['id']}")
+    return ok
+
+def test_event_stream():
+    """Testa o stream de eventos de alteração (Server-Sent Events)"""
+    print("\n📡 Testando stream de eventos...")
+    
+    received = []
+    connected = threading.Event()
+    response = requests.get(f"{BASE_URL}/events", stream=True, timeout=10)
+    print(f"\n📋 GET /events - Status: {response.status_code}, "
+          f"tipo: {response.headers.get('content-type')}")
+    if response.status_code != 200:
+        return False
+    
+    def listen():
+        try:
+            connected.set()
+            for line in response.iter_lines(decode_unicode=True):
+                if line.startswith("data:"):
+                    received.append(json.loads(line[5:]))
+        except (requests.RequestException, AttributeError, ValueError):
+            # Stream fechado pelo teste
+            pass
+    
+    thread = threading.Thread(target=listen, daemon=True)
+    thread.start()
+    connected.wait(5)
+    
+    # A criação e a exclusão chegam como eventos com a entidade e o id
+    created = requests.post(f"{BASE_URL}/transactions/", json={
+        "description": "Evento", "amount": 5.0, "type": "despesa"
+    }).json()
+    requests.delete(f"{BASE_URL}/transactions/{created['id']}")
+    expected = [("created", created["id"]), ("deleted", created["id"])]
+    
+    for _ in range(50):
+        seen = [(e["type"], e["ids"][0]) for e in received if e.get("entity") == "transaction" and e.get("ids")]
+        if all(item in seen for item in expected):
+            break
+        time.sleep(0.1)
+    response.close()
+    
+    print(f"\n📋 Eventos recebidos: {[(e['type'], e.get('entity')) for e in received]}")
+    return all(item in seen for item in expected)
+
+def wait_import_job(job_id, attempts=50):
+    """Consulta o status da importação até ela terminar"""
+    for _ in range(attempts):
+        job = requests.get(f"{BASE_URL}/transactions/import/{job_id}").json()
+        if job["status"] in ("concluida", "erro"):
+            return job
+        time.sleep(0.1)
+    return job
+
+def test_import_transactions():
+    """Testa a importação de extratos CSV e OFX"""
+    print("\n🏦 Testando importação de extratos...")
+    
+    # Descrições únicas para que a deduplicação não dependa de execuções anteriores
+    run = datetime.now().strftime("%Y%m%d%H%M%S%f")
+    csv_statement = (
+        "Data;Histórico;Valor\n"
+        f"01/07/2025;Extrato {run} - Mercado;-1.234,56\n"
+        f"02/07/2025;Extrato {run} - Salário;5.000,00\n"
+        f"03/07/2025;Extrato {run} - Inválida;abc\n"
+    )
+    ofx_statement = (
+        "OFXHEADER:100\n<OFX><BANKTRANLIST>\n"
+        "<STMTTRN>\n<TRNTYPE>DEBIT\n<DTPOSTED>20250704120000[-3:BRT]\n"
+        f"<TRNAMT>-45.90\n<MEMO>Extrato {run} - Farmácia\n</STMTTRN>\n"
+        "</BANKTRANLIST></OFX>\n"
+    )
+    
+    # 1. POST /transactions/import?format=csv
+    response = requests.post(f"{BASE_URL}/transactions/import?format=csv", data=csv_statement.encode())
+    print_response(response, "POST /transactions/import?format=csv")
+    job = wait_import_job(response.json()["id"])
+    print(f"   Status: {job['status']}, importadas: {job['imported']}, erros: {job['error_count']}")
+    ok = response.status_code == 202 and job["imported"] == 2 and job["error_count"] == 1
+    
+    # 2. POST /transactions/import?format=ofx
+    response = requests.post(f"{BASE_URL}/transactions/import?format=ofx", data=ofx_statement.encode())
+    job = wait_import_job(response.json()["id"])
+    print(f"\n📋 POST /transactions/import?format=ofx - Status: {job['status']}, importadas: {job['imported']}")
+    ok = ok and job["imported"] == 1
+    
+    # 3. Reenviar o mesmo extrato não duplica transações
+    response = requests.post(f"{BASE_URL}/transactions/import?format=csv", data=csv_statement.encode())
+    job = wait_import_job(response.json()["id"])
+    print(f"\n📋 Reimportação do CSV - importadas: {job['imported']}, duplicadas: {job['duplicates']}")
+    ok = ok and job["imported"] == 0 and job["duplicates"] == 2
+    
+    return ok
+
 def test_goals():
     """Testa TODOS os endpoints de metas"""
     print("\n🎯 Testando TODOS os endpoints de metas...")
@@ -199,6 +680,23 @@ def test_error_cases():
     # 6. DELETE /goals/{id} - ID inexistente
     response = requests.delete(f"{BASE_URL}/goals/99999")
     print_response(response, "DELETE /goals/99999 - ID inexistente (deve retornar 404)")
+    
+    # 7. Valores monetários fora do limite (devem retornar 422, não 500)
+    for amount in (1e17, 1e30, "1e30"):
+        response = requests.post(f"{BASE_URL}/transactions/", json={
+            "description": "Fora do limite", "amount": amount, "type": "despesa"
+        })
+        print(f"\n📋 POST /transactions/ (amount={amount}) - Status: {response.status_code}")
+    response = requests.put(f"{BASE_URL}/goals/99999/progress", params={"amount": "1e30"})
+    print(f"\n📋 PUT /goals/{{id}}/progress (amount=1e30) - Status: {response.status_code}")
+    response = requests.get(f"{BASE_URL}/transactions/", params={"min_amount": "1e30"})
+    print(f"\n📋 GET /transactions/?min_amount=1e30 - Status: {response.status_code}")
+    
+    # 8. Limites de página fora do intervalo (devem retornar 422, não 500)
+    for path, params in (("/transactions/", {}), ("/transactions/", {"fields": "id"}), ("/transactions/search", {"q": "teste"})):
+        for limit in (0, -1):
+            response = requests.get(f"{BASE_URL}{path}", params={**params, "limit": limit})
+            print(f"\n📋 GET {path} (limit={limit}, {params}) - Status: {response.status_code}")
 
 def main():
     """Função principal"""
@@ -214,6 +712,54 @@ def main():
         # Testar transações (TODOS os endpoints)
         transaction_ids = test_transactions()
         
+        # Testar importação em lote
+        if not test_bulk_transactions():
+            print("❌ Importação em lote retornou resultado inesperado")
+        
+        # Testar exportação
+        if not test_export_transactions():
+            print("❌ Exportação retornou resultado inesperado")
+        
+        # Testar cache dos relatórios
+        if not test_report_cache():
+            print("❌ Cache dos relatórios retornou resultado inesperado")
+        
+        # Testar requisições condicionais
+        if not test_conditional_requests():
+            print("❌ Requisições condicionais retornaram resultado inesperado")
+        
+        # Testar respostas das escritas
+        if not test_write_responses():
+            print("❌ Resposta de escrita diferente da leitura seguinte")
+        
+        # Testar filtros de transações
+        if not test_transaction_filters():
+            print("❌ Filtros de transações retornaram resultado inesperado")
+        
+        # Testar listagem com campos selecionados
+        if not test_transaction_fields():
+            print("❌ Listagem com fields retornou resultado inesperado")
+        
+        # Testar operações em lote
+        if not test_transaction_batch():
+            print("❌ Operações em lote retornaram resultado inesperado")
+        
+        # Testar busca textual
+        if not test_transaction_search():
+            print("❌ Busca de transações retornou resultado inesperado")
+        
+        # Testar feed de alterações
+        if not test_transaction_changes():
+            print("❌ Feed de alterações retornou resultado inesperado")
+        
+        # Testar stream de eventos
+        if not test_event_stream():
+            print("❌ Stream de eventos retornou resultado inesperado")
+        
+        # Testar importação de extratos
+        if not test_import_transactions():
+            print("❌ Importação de extrato retornou resultado inesperado")
+        
         # Testar metas (TODOS os endpoints)
         goal_ids = test_goals()
         
@@ -227,11 +773,23 @@ def main():
         print("   🏠 GET / (Root)")
         print("   📊 POST /transactions/ (Criar)")
         print("   📊 GET /transactions/ (Listar)")
+        print("   📊 GET /transactions/?fields= (Listar campos selecionados)")
         print("   📊 GET /transactions/{id} (Buscar)")
         print("   📊 PUT /transactions/{id} (Atualizar)")
         print("   📊 DELETE /transactions/{id} (Deletar)")
+        print("   📊 POST /transactions/bulk (Importação em lote)")
+        print("   📊 POST /transactions/batch-get (Buscar em lote)")
+        print("   📊 PATCH /transactions/batch (Atualizar em lote)")
+        print("   📊 DELETE /transactions?ids= (Deletar em lote)")
+        print("   📊 GET /transactions/export (Exportação CSV/NDJSON)")
+        print("   📊 GET /transactions/search (Busca textual)")
+        print("   📊 GET /transactions/changes (Feed de alterações)")
+        print("   📡 GET /events (Eventos em tempo real)")
+        print("   📊 POST /transactions/import (Importação de extrato CSV/OFX)")
+        print("   📊 GET /transactions/import/{job_id} (Status da importação)")
         print("   📊 GET /transactions/summary/category (Resumo categoria)")
         print("   📊 GET /transactions/summary/balance (Resumo saldo)")
+        print("   📊 GET /transactions/summary/timeseries (Série temporal)")
         print("   🎯 POST /goals/ (Criar)")
         print("   🎯 GET /goals/ (Listar)")
         print("   🎯 GET /goals/{id} (Buscar)")